@@ -6,6 +6,10 @@ Drop-in replacement for the SQLite EventRepository.
 Same interface, PostgreSQL storage via psycopg2.
 
 Stateless: no in-memory caching. Every read hits the DB.
+
+Events are hash-chained like the SQLite store: chain_digest =
+event_log.chain_digest(previous digest, canonical event bytes), plus
+an optional post-event state_hash.
 """
 
 from __future__ import annotations
@@ -19,6 +23,7 @@ from urllib.parse import urlparse
 # Allow importing org_kernel from parent directory
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from org_kernel.event_log import GENESIS_DIGEST, chain_digest
 from org_kernel.events import (
     AddDependencyEvent,
     AddRoleEvent,
@@ -63,6 +68,8 @@ CREATE TABLE IF NOT EXISTS events (
     event_uuid   TEXT,
     timestamp    TEXT,
     payload      JSONB NOT NULL,
+    chain_digest TEXT,
+    state_hash   TEXT,
     UNIQUE(project_id, sequence)
 );
 
@@ -138,6 +145,12 @@ class SupabaseEventRepository:
                     conn.run(stmt)
             # Support live upgrade
             conn.run("ALTER TABLE project_metadata ADD COLUMN IF NOT EXISTS department_map JSONB")
+            conn.run("ALTER TABLE events ADD COLUMN IF NOT EXISTS chain_digest TEXT")
+            conn.run("ALTER TABLE events ADD COLUMN IF NOT EXISTS state_hash TEXT")
+            conn.run(
+                "CREATE INDEX IF NOT EXISTS idx_event_chain "
+                "ON events(project_id, chain_digest)"
+            )
         finally:
             conn.close()
 
@@ -295,11 +308,15 @@ class SupabaseEventRepository:
         project_id: str,
         event: BaseEvent,
         event_uuid: str = "",
+        state_hash: str = "",
     ) -> int:
         """
         Append event. Assigns next sequence atomically.
         Returns assigned sequence.
 
+        The row is chained to its predecessor (chain_digest);
+        *state_hash*, if given, records the post-event state hash.
+
         Idempotency: if event_uuid exists, returns existing sequence.
         Concurrency: retries on unique violation.
         """
@@ -315,18 +332,16 @@ class SupabaseEventRepository:
         for attempt in range(_MAX_RETRIES):
             conn = self._get_conn()
             try:
-                rows = conn.run(
-                    "SELECT COALESCE(MAX(sequence), 0) FROM events WHERE project_id = :pid",
-                    pid=project_id,
-                )
-                seq = rows[0][0] + 1
+                last, digest = self._chain_head(conn, project_id)
+                seq = last + 1
 
                 conn.run(
                     """
                     INSERT INTO events
                         (project_id, sequence, event_type, event_uuid,
-                            timestamp, payload)
-                    VALUES (:pid, :seq, :etype, :euuid, :ts, :payload)
+                            timestamp, payload, chain_digest, state_hash)
+                    VALUES (:pid, :seq, :etype, :euuid, :ts, :payload,
+                            :digest, :shash)
                     """,
                     pid=project_id,
                     seq=seq,
@@ -334,6 +349,8 @@ class SupabaseEventRepository:
                     euuid=event_uuid or None,
                     ts=event_dict["timestamp"],
                     payload=json.dumps(event_dict["payload"]),
+                    digest=chain_digest(digest, dict(event_dict, sequence=seq)),
+                    shash=state_hash or None,
                 )
                 return seq
             except pg8000.exceptions.DatabaseError as e:
@@ -360,14 +377,17 @@ class SupabaseEventRepository:
                 "DELETE FROM events WHERE project_id = :pid",
                 pid=project_id,
             )
+            digest = GENESIS_DIGEST
             for i, event in enumerate(events, 1):
                 event_dict = event.to_dict()
+                digest = chain_digest(digest, dict(event_dict, sequence=i))
                 conn.run(
                     """
                     INSERT INTO events
                         (project_id, sequence, event_type, event_uuid,
-                            timestamp, payload)
-                    VALUES (:pid, :seq, :etype, :euuid, :ts, :payload)
+                            timestamp, payload, chain_digest)
+                    VALUES (:pid, :seq, :etype, :euuid, :ts, :payload,
+                            :digest)
                     """,
                     pid=project_id,
                     seq=i,
@@ -375,6 +395,7 @@ class SupabaseEventRepository:
                     euuid=event_dict.get("event_uuid") or None,
                     ts=event_dict["timestamp"],
                     payload=json.dumps(event_dict["payload"]),
+                    digest=digest,
                 )
             return len(events)
         finally:
@@ -385,9 +406,12 @@ class SupabaseEventRepository:
     # ------------------------------------------------------------------
 
     def load_events(
-        self, project_id: str, after_sequence: int = 0,
+        self,
+        project_id: str,
+        after_sequence: int = 0,
+        up_to_sequence: Optional[int] = None,
     ) -> List[BaseEvent]:
-        """Load events ordered by sequence."""
+        """Load events ordered by sequence, in (after_sequence, up_to_sequence]."""
         conn = self._get_conn()
         try:
             rows = conn.run(
@@ -395,10 +419,12 @@ class SupabaseEventRepository:
                 SELECT event_type, timestamp, payload, sequence, event_uuid
                 FROM events
                 WHERE project_id = :pid AND sequence > :seq
+                  AND sequence <= :last
                 ORDER BY sequence
                 """,
                 pid=project_id,
                 seq=after_sequence,
+                last=2**63 - 1 if up_to_sequence is None else up_to_sequence,
             )
         finally:
             conn.close()
@@ -427,6 +453,116 @@ class SupabaseEventRepository:
         finally:
             conn.close()
 
+    # ------------------------------------------------------------------
+    # Hash chain
+    # ------------------------------------------------------------------
+
+    def chain_head(self, project_id: str) -> Tuple[int, str]:
+        """(last sequence, its chain_digest); (0, GENESIS_DIGEST) if empty."""
+        conn = self._get_conn()
+        try:
+            return self._chain_head(conn, project_id)
+        finally:
+            conn.close()
+
+    def find_chain_digest(self, project_id: str, digest: str) -> Optional[int]:
+        """Sequence whose chain_digest is *digest* (0 = genesis), or None."""
+        if digest == GENESIS_DIGEST:
+            return 0
+        conn = self._get_conn()
+        try:
+            self._chain_head(conn, project_id)
+            rows = conn.run(
+                "SELECT sequence FROM events "
+                "WHERE project_id = :pid AND chain_digest = :digest",
+                pid=project_id,
+                digest=digest,
+            )
+            return rows[0][0] if rows else None
+        finally:
+            conn.close()
+
+    def verify_chain(self, project_id: str) -> Optional[int]:
+        """
+        Recompute the hash chain (no replay).  None if intact, else the
+        first sequence whose digest differs or breaks 1..N numbering.
+        Rows written before chaining are chained (and trusted) first.
+        """
+        conn = self._get_conn()
+        try:
+            self._chain_head(conn, project_id)
+            rows = self._chain_rows(conn, project_id)
+        finally:
+            conn.close()
+        digest = GENESIS_DIGEST
+        for expected, (seq, stored, entry) in enumerate(rows, 1):
+            digest = chain_digest(digest, entry)
+            if seq != expected or stored != digest:
+                return seq
+        return None
+
+    def load_state_hash(self, project_id: str, sequence: int) -> Optional[str]:
+        """Post-event state hash recorded with *sequence*, if any."""
+        conn = self._get_conn()
+        try:
+            rows = conn.run(
+                "SELECT state_hash FROM events "
+                "WHERE project_id = :pid AND sequence = :seq",
+                pid=project_id,
+                seq=sequence,
+            )
+            return rows[0][0] if rows else None
+        finally:
+            conn.close()
+
+    def _chain_head(self, conn, project_id: str) -> Tuple[int, str]:
+        rows = conn.run(
+            "SELECT sequence, chain_digest FROM events "
+            "WHERE project_id = :pid ORDER BY sequence DESC LIMIT 1",
+            pid=project_id,
+        )
+        if not rows:
+            return 0, GENESIS_DIGEST
+        if rows[0][1] is not None:
+            return rows[0][0], rows[0][1]
+        # rows written before chaining: backfill once
+        digest = GENESIS_DIGEST
+        for seq, stored, entry in self._chain_rows(conn, project_id):
+            if stored is not None:
+                digest = stored
+                continue
+            digest = chain_digest(digest, entry)
+            conn.run(
+                "UPDATE events SET chain_digest = :digest "
+                "WHERE project_id = :pid AND sequence = :seq",
+                digest=digest,
+                pid=project_id,
+                seq=seq,
+            )
+        return rows[0][0], digest
+
+    @staticmethod
+    def _chain_rows(conn, project_id: str) -> List[tuple]:
+        """(sequence, stored chain_digest, history entry) in order."""
+        rows = conn.run(
+            """
+            SELECT sequence, chain_digest, event_type, timestamp, payload
+            FROM events
+            WHERE project_id = :pid
+            ORDER BY sequence
+            """,
+            pid=project_id,
+        )
+        return [
+            (seq, stored, {
+                "event_type": etype,
+                "payload": payload if isinstance(payload, dict) else json.loads(payload),
+                "sequence": seq,
+                "timestamp": ts or "",
+            })
+            for seq, stored, etype, ts, payload in rows
+        ]
+
     # ------------------------------------------------------------------
     # Idempotency
     # ------------------------------------------------------------------
@@ -74,8 +74,19 @@ export async function getState(projectId: string): Promise<StateResponse> {
     return request<StateResponse>(`/projects/${projectId}/state`);
 }
 
-export async function verifyDeterminism(projectId: string): Promise<{ status: string; message: string }> {
-    return request<{ status: string; message: string }>(`/projects/${projectId}/verify-determinism`);
+export interface VerifyDeterminismResponse {
+    status: string;
+    message: string;
+    sequence?: number;
+    chain_digest?: string;
+    chain_ok?: boolean;
+    metadata_hash?: string | null;
+    recorded_hash?: string | null;
+    hash_match?: boolean | null;
+}
+
+export async function verifyDeterminism(projectId: string): Promise<VerifyDeterminismResponse> {
+    return request<VerifyDeterminismResponse>(`/projects/${projectId}/verify-determinism`);
 }
 
 export async function appendEvent(
@@ -7,12 +7,12 @@ Uses IndustryTemplate data to emit realistic org events with real
 department names, role titles, and natural dependency patterns.
 
 All math is integer fixed-point. No floats. No global randomness.
-Output is validated via OrgEngine.replay before returning.
+Output is validated via OrgEngine.apply_batch before returning.
 """
 
 from __future__ import annotations
 
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
 
 from org_kernel.domain_types import SCALE
 from org_kernel.engine import OrgEngine
@@ -58,6 +58,8 @@ def compile_from_template(
     template: IndustryTemplate,
     spec: TemplateSpec,
     seed: int,
+    *,
+    engine: Optional[OrgEngine] = None,
 ) -> tuple[List[BaseEvent], dict]:
     """
     Compile an IndustryTemplate into a replayable event stream.
@@ -67,6 +69,10 @@ def compile_from_template(
     This allows the projection to use the template's intended structure
     instead of relying on graph-based clustering.
 
+    The stream is validated by applying it to *engine* (a fresh
+    OrgEngine by default); pass one in to keep the final state without
+    replaying the stream a second time.
+
     Raises GeneratorInvariantError if the generated stream fails engine replay.
     """
     rng = DeterministicRNG(seed)
@@ -120,9 +126,13 @@ def compile_from_template(
     }
 
     # ── Replay validation ─────────────────────────────────────────────
+    # The stream is built in dependency order, so one atomic batch with
+    # a single invariant pass at the end is sufficient.
     try:
-        engine = OrgEngine()
-        engine.replay(events)
+        if engine is None:
+            engine = OrgEngine()
+        engine.initialize_state()
+        engine.apply_batch(events)
     except Exception as exc:
         raise GeneratorInvariantError(exc) from exc
 
@@ -0,0 +1,339 @@
+"""
+Monte Carlo Runner — Compile and replay many generated orgs in parallel.
+
+Fans compile_from_template out over a process pool across
+seeds × industries × stages × success levels × named TemplateSpec
+variations (override dicts, as accepted by generate_org), streams one
+record per run to a JSONL file or sqlite table, and aggregates
+distribution statistics per (industry, stage, success_level, variant).
+
+    runs = run_grid(["tech_saas"], ["growth"], [10, 50, 90], seeds=range(1000))
+    summary = run_monte_carlo(runs, workers=8, sink=JsonlSink("runs.jsonl"))
+
+Run:  py -3 -m generator.monte_carlo --seeds 200 --workers 8 --out runs.jsonl
+
+Each run is independent and deterministic in (industry, stage,
+success_level, overrides, seed), so results do not depend on the
+number of workers; records are emitted in input order.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from org_kernel.engine import OrgEngine
+
+from .compiler import compile_from_template
+from .industry_templates import get_template
+from .template_spec import spec_for_success_level
+
+
+INDUSTRIES = ("tech_saas", "manufacturing", "marketplace")
+STAGES = ("seed", "growth", "structured", "mature")
+SUCCESS_LEVELS = (10, 30, 50, 70, 90)
+
+
+@dataclass(frozen=True)
+class RunSpec:
+    """One generator run: template cell, success level, variation, seed."""
+
+    industry: str
+    stage: str
+    success_level: int
+    seed: int
+    variant: str = ""
+    overrides: Mapping = field(default_factory=dict, compare=False)
+
+    @property
+    def cell(self) -> Tuple[str, str, int, str]:
+        return (self.industry, self.stage, self.success_level, self.variant)
+
+
+def run_grid(
+    industries: Iterable[str] = INDUSTRIES,
+    stages: Iterable[str] = STAGES,
+    success_levels: Iterable[int] = SUCCESS_LEVELS,
+    seeds: Iterable[int] = range(100),
+    variations: Optional[Mapping[str, Mapping]] = None,
+) -> Iterator[RunSpec]:
+    """Every combination, seeds innermost; variations default to {"": {}}."""
+    variations = variations or {"": {}}
+    seeds = list(seeds)
+    for industry in industries:
+        for stage in stages:
+            for level in success_levels:
+                for variant, overrides in variations.items():
+                    for seed in seeds:
+                        yield RunSpec(
+                            industry, stage, level, seed, variant, dict(overrides),
+                        )
+
+
+def run_one(run: RunSpec) -> dict:
+    """
+    Compile and replay one run.  Generation failures are recorded
+    (ok=False, error=...) rather than raised.
+    """
+    record = {
+        "industry": run.industry,
+        "stage": run.stage,
+        "success_level": run.success_level,
+        "variant": run.variant,
+        "seed": run.seed,
+    }
+    template = get_template(run.industry, run.stage)
+    spec = spec_for_success_level(
+        template, run.industry, run.stage, run.success_level, run.overrides,
+    )
+    engine = OrgEngine()
+    try:
+        # the validation replay leaves *engine* at the final state
+        events, _ = compile_from_template(
+            template, spec, seed=run.seed, engine=engine,
+        )
+    except Exception as exc:
+        record.update(ok=False, error=f"{type(exc).__name__}: {exc}")
+        return record
+
+    diagnostics = engine.get_diagnostics()
+    record.update(
+        ok=True,
+        error="",
+        event_count=len(events),
+        role_count=diagnostics["role_count"],
+        active_role_count=diagnostics["active_role_count"],
+        state_hash=engine.state_hash(),
+        structural_debt=diagnostics["structural_debt"],
+        structural_density=diagnostics["structural_density"],
+        isolated_roles=len(diagnostics["isolated_roles"]),
+        warnings=diagnostics["warnings"],
+    )
+    return record
+
+
+def iter_results(
+    runs: Iterable[RunSpec],
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+) -> Iterator[dict]:
+    """
+    Records for *runs*, in order.  workers=None uses every CPU;
+    workers <= 1 runs in-process.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for run in runs:
+            yield run_one(run)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(run_one, runs, chunksize=chunksize)
+
+
+def run_monte_carlo(
+    runs: Iterable[RunSpec],
+    workers: Optional[int] = None,
+    sink: Optional["ResultSink"] = None,
+    chunksize: int = 16,
+) -> Dict[Tuple[str, str, int, str], dict]:
+    """
+    Execute *runs*, write each record to *sink* as it arrives, and
+    return summarize()'s per-cell statistics.  The sink is closed.
+    """
+    stats = Aggregator()
+    try:
+        for record in iter_results(runs, workers, chunksize):
+            if sink is not None:
+                sink.write(record)
+            stats.add(record)
+    finally:
+        if sink is not None:
+            sink.close()
+    return stats.summary()
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+class Aggregator:
+    """Distribution statistics per (industry, stage, success_level, variant)."""
+
+    _METRICS = ("structural_debt", "structural_density", "role_count",
+                "active_role_count", "isolated_roles")
+
+    def __init__(self) -> None:
+        self._cells: Dict[Tuple, dict] = {}
+
+    def add(self, record: dict) -> None:
+        key = (record["industry"], record["stage"],
+               record["success_level"], record["variant"])
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = {
+                "runs": 0, "failed": 0, "warned": 0, "hashes": set(),
+                "values": {m: [] for m in self._METRICS},
+            }
+        cell["runs"] += 1
+        if not record["ok"]:
+            cell["failed"] += 1
+            return
+        if record["warnings"]:
+            cell["warned"] += 1
+        cell["hashes"].add(record["state_hash"])
+        for m in self._METRICS:
+            cell["values"][m].append(record[m])
+
+    def summary(self) -> Dict[Tuple[str, str, int, str], dict]:
+        out = {}
+        for key in sorted(self._cells):
+            cell = self._cells[key]
+            ok = cell["runs"] - cell["failed"]
+            out[key] = {
+                "runs": cell["runs"],
+                "failed": cell["failed"],
+                "warning_rate": cell["warned"] / ok if ok else 0.0,
+                "distinct_states": len(cell["hashes"]),
+                **{m: _describe(v) for m, v in cell["values"].items()},
+            }
+        return out
+
+
+def _describe(values: Sequence[int]) -> dict:
+    """min / p10 / p50 / p90 / max (nearest rank) and mean; {} if empty."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    n = len(ordered)
+
+    def pct(p: int) -> int:
+        return ordered[max(0, -(-p * n // 100) - 1)]
+
+    return {
+        "min": ordered[0],
+        "p10": pct(10),
+        "p50": pct(50),
+        "p90": pct(90),
+        "max": ordered[-1],
+        "mean": statistics.fmean(ordered),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Sinks
+# ---------------------------------------------------------------------------
+
+class ResultSink(ABC):
+    """Receives records as runs complete; subclasses implement write()."""
+
+    @abstractmethod
+    def write(self, record: dict) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlSink(ResultSink):
+    """One JSON object per line."""
+
+    def __init__(self, path: str) -> None:
+        self._fh = open(path, "w", encoding="utf-8")
+
+    def write(self, record: dict) -> None:
+        self._fh.write(json.dumps(record, sort_keys=True) + "\n")
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class SqliteSink(ResultSink):
+    """Rows in table ``runs`` (created if missing); warnings as JSON."""
+
+    _COLUMNS = (
+        "industry", "stage", "success_level", "variant", "seed", "ok", "error",
+        "event_count", "role_count", "active_role_count", "state_hash",
+        "structural_debt", "structural_density", "isolated_roles", "warnings",
+    )
+
+    def __init__(self, path: str, commit_every: int = 500) -> None:
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "industry TEXT, stage TEXT, success_level INTEGER, variant TEXT, "
+            "seed INTEGER, ok INTEGER, error TEXT, event_count INTEGER, "
+            "role_count INTEGER, active_role_count INTEGER, state_hash TEXT, "
+            "structural_debt INTEGER, structural_density INTEGER, "
+            "isolated_roles INTEGER, warnings TEXT)"
+        )
+        self._sql = (
+            f"INSERT INTO runs ({', '.join(self._COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(self._COLUMNS))})"
+        )
+        self._pending: List[tuple] = []
+        self._commit_every = commit_every
+
+    def write(self, record: dict) -> None:
+        row = dict(record, warnings=json.dumps(record.get("warnings", [])))
+        self._pending.append(tuple(row.get(c) for c in self._COLUMNS))
+        if len(self._pending) >= self._commit_every:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+        self._conn.close()
+
+    def _flush(self) -> None:
+        if self._pending:
+            with self._conn:
+                self._conn.executemany(self._sql, self._pending)
+            self._pending = []
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--industries", nargs="+", default=list(INDUSTRIES))
+    parser.add_argument("--stages", nargs="+", default=list(STAGES))
+    parser.add_argument("--success-levels", nargs="+", type=int,
+                        default=list(SUCCESS_LEVELS))
+    parser.add_argument("--seeds", type=int, default=100,
+                        help="runs per cell (seeds 0..N-1)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default=None,
+                        help="*.jsonl or *.sqlite / *.db output file")
+    args = parser.parse_args(argv)
+
+    sink: Optional[ResultSink] = None
+    if args.out:
+        is_sqlite = args.out.endswith((".sqlite", ".db"))
+        sink = SqliteSink(args.out) if is_sqlite else JsonlSink(args.out)
+
+    runs = run_grid(args.industries, args.stages, args.success_levels,
+                    range(args.seeds))
+    summary = run_monte_carlo(runs, workers=args.workers, sink=sink)
+
+    print(f"  {'industry':14s} {'stage':11s} {'sl':>3s} {'runs':>6s} "
+          f"{'fail':>5s} {'warn%':>6s} {'debt p50':>9s} {'dens p50':>9s}")
+    for (industry, stage, level, variant), s in summary.items():
+        debt = s["structural_debt"].get("p50", "-")
+        density = s["structural_density"].get("p50", "-")
+        print(f"  {industry:14s} {stage:11s} {level:3d} {s['runs']:6d} "
+              f"{s['failed']:5d} {100 * s['warning_rate']:6.1f} "
+              f"{debt!s:>9s} {density!s:>9s}")
+
+
+if __name__ == "__main__":
+    main()
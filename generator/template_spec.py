@@ -7,6 +7,7 @@ All density values are int64 fixed-point using SCALE from org_kernel.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -36,3 +37,85 @@ class TemplateSpec:
             "shock_magnitude": self.shock_magnitude,
             "differentiation_pressure": self.differentiation_pressure,
         }
+
+
+def spec_for_success_level(
+    template,
+    industry: str,
+    stage: str,
+    success_level: int,
+    overrides: Optional[dict] = None,
+) -> TemplateSpec:
+    """
+    The TemplateSpec generate_org builds for an IndustryTemplate and a
+    1–100 success level ("health proxy"):
+
+      Low  (1-33):   stressed org — low capacity, high fragility, shocks
+      Mid  (34-66):  typical org — moderate everything
+      High (67-100): well-resourced — higher density, less fragility
+
+    Role and domain counts come from the template.  *overrides* (the
+    Advanced Mode dict) replaces any field by name.
+    """
+    success = max(1, min(100, success_level))
+    ratio = success / 100.0  # 0.01 .. 1.0
+
+    # ── Density targets: realistic orgs are NOT fully connected ──
+    # Real engineering teams have ~20-40% internal connectivity.
+    # Cross-team connectivity is even sparser: ~5-15%.
+    if industry == "tech_saas":
+        # Hub-and-spoke: moderate internal, moderate cross-team
+        intra_density = int(2000 + ratio * 1500)   # 20–35%
+        inter_density = int(500 + ratio * 1000)     # 5–15%
+    elif industry == "manufacturing":
+        # Linear/rigid: higher internal (assembly lines), very low cross
+        intra_density = int(3000 + ratio * 1500)   # 30–45%
+        inter_density = int(300 + ratio * 400)      # 3–7%
+    elif industry == "marketplace":
+        # Multi-cluster: moderate internal, moderate cross (supply↔demand)
+        intra_density = int(2500 + ratio * 1000)   # 25–35%
+        inter_density = int(800 + ratio * 1200)     # 8–20%
+    else:
+        intra_density = int(2500 + ratio * 1500)
+        inter_density = int(500 + ratio * 1000)
+
+    # ── Capacity profile ──
+    if ratio < 0.33:
+        capacity_profile = "low"
+    elif ratio > 0.66:
+        capacity_profile = "high"
+    else:
+        capacity_profile = "balanced"
+
+    # ── Fragility: stressed orgs develop bottleneck hubs ──
+    fragility_mode = ratio < 0.5 or industry == "manufacturing"
+
+    # ── Shock: stressed orgs experience disruption ──
+    if ratio < 0.3:
+        shock_magnitude = 3
+    elif ratio < 0.6:
+        shock_magnitude = 1
+    else:
+        shock_magnitude = 0
+
+    # ── Differentiation pressure: mature orgs get role bloat ──
+    if stage in ("structured", "mature"):
+        diff_pressure = max(0, int(3 - ratio * 2))  # 1–3 for low success, 0 for high
+    else:
+        diff_pressure = 1 if ratio < 0.4 else 0
+
+    overrides = overrides or {}
+    role_count = sum(len(d.roles) for d in template.departments)
+    domain_count = len(template.departments)
+
+    return TemplateSpec(
+        role_count=int(overrides.get("role_count", role_count)),
+        domain_count=int(overrides.get("domain_count", domain_count)),
+        intra_density_target=int(overrides.get("intra_density_target", intra_density)),
+        inter_density_target=int(overrides.get("inter_density_target", inter_density)),
+        capacity_profile=overrides.get("capacity_profile", capacity_profile),
+        fragility_mode=bool(overrides.get("fragility_mode", fragility_mode)),
+        drift_mode=bool(overrides.get("drift_mode", False)),
+        shock_magnitude=int(overrides.get("shock_magnitude", shock_magnitude)),
+        differentiation_pressure=int(overrides.get("differentiation_pressure", diff_pressure)),
+    )
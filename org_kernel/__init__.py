@@ -5,7 +5,7 @@ All numeric values: int64 fixed-point (SCALE = 10_000).
 """
 
 from .domain_types import (
-    Role, DependencyEdge, ConstraintVector, OrgState, TransitionResult,
+    Role, DependencyEdge, EdgeStore, ConstraintVector, OrgState, TransitionResult,
     DomainConstants, SCALE, checked_add, checked_mul, validate_role_id,
 )
 from .events import (
@@ -28,11 +28,22 @@ from .snapshot import (
     InvariantViolationSnapshotError,
     encode_snapshot,
     decode_snapshot,
+    decode_snapshot_stream,
     restore_snapshot,
     export_snapshot_to_file,
     import_snapshot_from_file,
     snapshot_hash,
 )
+from .snapshot_binary import (
+    encode_snapshot_binary,
+    decode_snapshot_binary,
+    restore_snapshot_binary,
+)
+from .snapshot_ref import (
+    encode_snapshot_ref,
+    decode_snapshot_ref,
+    restore_snapshot_ref,
+)
 from .constants import (
     DIFFERENTIATION_THRESHOLD,
     DIFFERENTIATION_MIN_CAPACITY,
@@ -44,6 +55,7 @@ from .constants import (
 __all__ = [
     "Role",
     "DependencyEdge",
+    "EdgeStore",
     "ConstraintVector",
     "OrgState",
     "TransitionResult",
@@ -70,10 +82,17 @@ __all__ = [
     "InvariantViolationSnapshotError",
     "encode_snapshot",
     "decode_snapshot",
+    "decode_snapshot_stream",
     "restore_snapshot",
     "export_snapshot_to_file",
     "import_snapshot_from_file",
     "snapshot_hash",
+    "encode_snapshot_binary",
+    "decode_snapshot_binary",
+    "restore_snapshot_binary",
+    "encode_snapshot_ref",
+    "decode_snapshot_ref",
+    "restore_snapshot_ref",
     "DIFFERENTIATION_THRESHOLD",
     "DIFFERENTIATION_MIN_CAPACITY",
     "SHOCK_DEACTIVATION_THRESHOLD",
@@ -0,0 +1,140 @@
+# file: org_kernel/bench_memory.py
+"""
+Organizational Kernel — Memory Benchmark
+
+Reports retained bytes per role and per edge for a large org, for the
+slotted + interned domain types versus plain ``__dict__`` dataclasses
+holding the same JSON-decoded data (one string object per occurrence,
+as the API layer produces them).
+
+Edges are reported twice: the bare edge objects in a list, and the
+EdgeStore that OrgState actually holds (edges plus in/out adjacency).
+
+Run:  py -3 -m org_kernel.bench_memory [roles] [edges]
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from org_kernel.domain_types import DependencyEdge, EdgeStore, Role
+
+
+# ══════════════════════════════════════════════════════════════
+# Reference (pre-slots) representation
+# ══════════════════════════════════════════════════════════════
+
+@dataclass
+class _PlainRole:
+    id: str
+    name: str
+    purpose: str
+    responsibilities: List[str] = field(default_factory=list)
+    required_inputs: List[str] = field(default_factory=list)
+    produced_outputs: List[str] = field(default_factory=list)
+    scale_stage: str = "seed"
+    active: bool = True
+
+
+@dataclass
+class _PlainEdge:
+    from_role_id: str
+    to_role_id: str
+    dependency_type: str = "operational"
+    critical: bool = False
+
+
+# ══════════════════════════════════════════════════════════════
+# Fixtures
+# ══════════════════════════════════════════════════════════════
+
+def _payloads(n_roles: int, n_edges: int, seed: int = 9) -> Tuple[str, str]:
+    """JSON text for roles and edges drawn from a shared vocabulary."""
+    rng = random.Random(seed)
+    vocab = [f"responsibility_{i:03d}" for i in range(60)]
+    roles = []
+    for i in range(n_roles):
+        roles.append({
+            "id": f"role_{i:05d}",
+            "name": f"Role {i}",
+            "purpose": "Deliver outcomes",
+            "responsibilities": sorted(rng.sample(vocab, 4)),
+            "required_inputs": [f"output_{rng.randrange(n_roles):05d}" for _ in range(2)],
+            "produced_outputs": [f"output_{i:05d}"],
+        })
+    edges = []
+    for _ in range(n_edges):
+        a, b = rng.sample(range(n_roles), 2)
+        edges.append({
+            "from_role_id": f"role_{a:05d}",
+            "to_role_id": f"role_{b:05d}",
+            "dependency_type": rng.choice(["operational", "informational", "governance"]),
+            "critical": rng.random() < 0.2,
+        })
+    return json.dumps(roles), json.dumps(edges)
+
+
+def _retained(build: Callable[[], object]) -> int:
+    """Bytes still allocated after build() once its inputs are freed."""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    keep = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del keep
+    return used
+
+
+# ══════════════════════════════════════════════════════════════
+# Benchmark
+# ══════════════════════════════════════════════════════════════
+
+def run(n_roles: int = 5000, n_edges: int = 20000) -> dict:
+    roles_json, edges_json = _payloads(n_roles, n_edges)
+
+    def roles_with(cls) -> Callable[[], dict]:
+        return lambda: {d["id"]: cls(**d) for d in json.loads(roles_json)}
+
+    def edges_with(cls, container) -> Callable[[], object]:
+        return lambda: container(cls(**d) for d in json.loads(edges_json))
+
+    results = {
+        "roles": n_roles,
+        "edges": n_edges,
+        "plain_role": _retained(roles_with(_PlainRole)) / n_roles,
+        "slotted_role": _retained(roles_with(Role)) / n_roles,
+        "plain_edge": _retained(edges_with(_PlainEdge, list)) / n_edges,
+        "slotted_edge": _retained(edges_with(DependencyEdge, list)) / n_edges,
+        "edge_store_edge": _retained(edges_with(DependencyEdge, EdgeStore)) / n_edges,
+    }
+    return results
+
+
+def main() -> None:
+    n_roles = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_edges = int(sys.argv[2]) if len(sys.argv) > 2 else 4 * n_roles
+    r = run(n_roles, n_edges)
+    print(f"\n{'='*60}")
+    print(f"  Memory per entity -- {r['roles']} roles, {r['edges']} edges")
+    print(f"{'='*60}")
+    print(f"  {'':34s}{'bytes':>10s}")
+    print(f"  {'Role  plain dataclass':34s}{r['plain_role']:>10.0f}")
+    print(f"  {'Role  slotted + interned':34s}{r['slotted_role']:>10.0f}")
+    print(f"  {'Edge  plain dataclass (list)':34s}{r['plain_edge']:>10.0f}")
+    print(f"  {'Edge  slotted + interned (list)':34s}{r['slotted_edge']:>10.0f}")
+    print(f"  {'Edge  in EdgeStore (+adjacency)':34s}{r['edge_store_edge']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
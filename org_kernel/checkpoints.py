@@ -0,0 +1,138 @@
+"""
+Organizational Kernel — In-Memory Checkpoint Ring
+
+Keeps structural-sharing forks of the engine state every K applied
+events, plus the applied events themselves, so the state at any
+sequence can be rebuilt from the nearest checkpoint by replaying at
+most K events instead of the whole stream.
+
+Memory budget: each checkpoint is charged the size of the containers
+its fork owns (roles dict, edge table and adjacency maps) — Role and
+DependencyEdge objects are shared with later states and not charged.
+When the total exceeds the budget, every other checkpoint is dropped
+and the interval doubles, so coverage of the timeline stays uniform
+and replay per query stays bounded by the (new) interval.
+"""
+
+from __future__ import annotations
+
+import bisect
+import sys
+from typing import List, Tuple
+
+from .domain_types import OrgState
+from .events import BaseEvent
+
+
+DEFAULT_CHECKPOINT_BUDGET_BYTES = 64 * 1024 * 1024
+
+
+class CheckpointRing:
+    """Checkpoints at sequence 0, K, 2K, ... and the events between them."""
+
+    __slots__ = (
+        "_base_interval", "_interval", "_budget", "_seqs", "_states",
+        "_costs", "_events", "_evictions",
+    )
+
+    def __init__(
+        self,
+        interval: int,
+        budget_bytes: int = DEFAULT_CHECKPOINT_BUDGET_BYTES,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError(f"checkpoint interval must be positive, got {interval}")
+        self._base_interval = interval
+        self._budget = budget_bytes
+        self.clear()
+
+    # -- Public API ---------------------------------------------------------
+
+    @property
+    def interval(self) -> int:
+        """Current spacing between checkpoints (grows on eviction)."""
+        return self._interval
+
+    @property
+    def sequences(self) -> List[int]:
+        return list(self._seqs)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated bytes held by the retained checkpoints."""
+        return sum(self._costs)
+
+    @property
+    def last_sequence(self) -> int:
+        return len(self._events)
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def clear(self) -> None:
+        self._interval = self._base_interval
+        self._seqs: List[int] = []
+        self._states: List[OrgState] = []
+        self._costs: List[int] = []
+        self._events: List[BaseEvent] = []
+        self._evictions = 0
+
+    def reset(self, state: OrgState) -> None:
+        """Start a new timeline whose sequence-0 state is *state*."""
+        self.clear()
+        self._store(0, state)
+
+    def record(self, event: BaseEvent, state: OrgState) -> None:
+        """Record an applied *event*; *state* is the state after it."""
+        self._events.append(event)
+        if event.sequence % self._interval == 0:
+            self._store(event.sequence, state)
+
+    def truncate(self, sequence: int) -> None:
+        """Forget everything recorded after *sequence* (batch rollback)."""
+        del self._events[sequence:]
+        cut = bisect.bisect_right(self._seqs, sequence)
+        del self._seqs[cut:], self._states[cut:], self._costs[cut:]
+
+    def nearest(self, sequence: int) -> Tuple[OrgState, List[BaseEvent]]:
+        """
+        The latest checkpoint at or before *sequence* and the events
+        to replay on top of it.  The checkpoint itself is returned
+        as-is; callers must fork it before mutating.
+        """
+        if not 0 <= sequence <= len(self._events):
+            raise ValueError(
+                f"Sequence {sequence} out of range 0..{len(self._events)}"
+            )
+        i = bisect.bisect_right(self._seqs, sequence) - 1
+        return self._states[i], self._events[self._seqs[i]:sequence]
+
+    # -- Internal -----------------------------------------------------------
+
+    def _store(self, sequence: int, state: OrgState) -> None:
+        snapshot = state.fork()
+        self._seqs.append(sequence)
+        self._states.append(snapshot)
+        self._costs.append(_container_bytes(snapshot))
+        while sum(self._costs) > self._budget and len(self._seqs) > 2:
+            self._thin()
+
+    def _thin(self) -> None:
+        """Drop every other checkpoint (keeping sequence 0), double K."""
+        self._interval *= 2
+        keep = [
+            i for i, seq in enumerate(self._seqs) if seq % self._interval == 0
+        ]
+        self._evictions += len(self._seqs) - len(keep)
+        self._seqs = [self._seqs[i] for i in keep]
+        self._states = [self._states[i] for i in keep]
+        self._costs = [self._costs[i] for i in keep]
+
+
+def _container_bytes(state: OrgState) -> int:
+    size = sys.getsizeof(state.roles) + sys.getsizeof(state.dependencies)
+    history = state.event_history
+    if isinstance(history, list):
+        size += sys.getsizeof(history)
+    return size
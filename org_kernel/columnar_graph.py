@@ -0,0 +1,294 @@
+"""
+Organizational Kernel — Columnar Graph View
+
+Read-only, integer-indexed snapshot of an OrgState's dependency graph
+for structural analytics on large orgs:
+
+  - role id -> int index (sorted role ids, then any dangling endpoints)
+  - edge columns: src, dst, type code, critical flag (EdgeStore order)
+  - CSR adjacency: out_indptr / out_indices, in_indptr / in_indices
+
+Routines mirror graph.py and projection/metrics.py and return exactly
+the same int64 fixed-point values.  NumPy is used when importable;
+otherwise the same columns are plain lists and every routine falls
+back to pure Python.  The final fixed-point division always runs on
+Python ints through checked_mul, so overflow behaviour is identical.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .domain_types import OrgState, SCALE, checked_mul
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+    _HAS_NUMPY = False
+
+
+class ColumnarGraph:
+    """
+    Columnar view of one state's roles and dependencies.
+
+    Build with ColumnarGraph.from_state(state).  The view does not
+    track later mutations of the state; build a new one instead.
+    """
+
+    __slots__ = (
+        "role_ids", "index", "n_roles", "n_edges", "types",
+        "src", "dst", "type_code", "critical",
+        "out_indptr", "out_indices", "in_indptr", "in_indices",
+        "_numpy",
+    )
+
+    def __init__(
+        self,
+        role_ids: List[str],
+        n_roles: int,
+        src: Sequence[int],
+        dst: Sequence[int],
+        type_code: Sequence[int],
+        critical: Sequence[bool],
+        types: List[str],
+        use_numpy: bool,
+    ) -> None:
+        self.role_ids = role_ids
+        self.index: Dict[str, int] = {rid: i for i, rid in enumerate(role_ids)}
+        self.n_roles = n_roles
+        self.n_edges = len(src)
+        self.types = types
+        self._numpy = use_numpy
+        if use_numpy:
+            self.src = np.asarray(src, dtype=np.int64)
+            self.dst = np.asarray(dst, dtype=np.int64)
+            self.type_code = np.asarray(type_code, dtype=np.int32)
+            self.critical = np.asarray(critical, dtype=bool)
+        else:
+            self.src = list(src)
+            self.dst = list(dst)
+            self.type_code = list(type_code)
+            self.critical = list(critical)
+        self.out_indptr, self.out_indices = self._csr(self.src, self.dst)
+        self.in_indptr, self.in_indices = self._csr(self.dst, self.src)
+
+    @classmethod
+    def from_state(
+        cls, state: OrgState, use_numpy: Optional[bool] = None,
+    ) -> "ColumnarGraph":
+        """
+        Index *state*.  use_numpy=None picks NumPy when it is installed;
+        False forces the pure-Python columns.
+        """
+        if use_numpy is None:
+            use_numpy = _HAS_NUMPY
+        elif use_numpy and not _HAS_NUMPY:
+            raise ImportError("numpy is not installed")
+
+        role_ids = sorted(state.roles)
+        index = {rid: i for i, rid in enumerate(role_ids)}
+        deps = state.dependencies
+        extra = sorted(
+            {e.from_role_id for e in deps if e.from_role_id not in index}
+            | {e.to_role_id for e in deps if e.to_role_id not in index}
+        )
+        for rid in extra:
+            index[rid] = len(index)
+
+        types = sorted({e.dependency_type for e in deps})
+        type_index = {t: i for i, t in enumerate(types)}
+        src = [index[e.from_role_id] for e in deps]
+        dst = [index[e.to_role_id] for e in deps]
+        type_code = [type_index[e.dependency_type] for e in deps]
+        critical = [e.critical for e in deps]
+        return cls(
+            role_ids + extra, len(role_ids), src, dst, type_code, critical,
+            types, use_numpy,
+        )
+
+    @property
+    def uses_numpy(self) -> bool:
+        """True when the columns are NumPy arrays rather than lists."""
+        return self._numpy
+
+    # -- Degrees --------------------------------------------------------------
+
+    def out_degrees(self) -> List[int]:
+        """Out-degree per index (len(role_ids) entries)."""
+        return self._diff(self.out_indptr)
+
+    def in_degrees(self) -> List[int]:
+        """In-degree per index (len(role_ids) entries)."""
+        return self._diff(self.in_indptr)
+
+    def degrees(self) -> List[int]:
+        """Incident-edge count per index; a self-loop counts once."""
+        n = len(self.role_ids)
+        if self._numpy:
+            loops = self.src[self.src == self.dst]
+            deg = (
+                np.diff(self.out_indptr) + np.diff(self.in_indptr)
+                - np.bincount(loops, minlength=n)
+            )
+            return deg.tolist()
+        deg = [a + b for a, b in zip(self.out_degrees(), self.in_degrees())]
+        for s, d in zip(self.src, self.dst):
+            if s == d:
+                deg[s] -= 1
+        return deg
+
+    def degree(self, role_id: str) -> int:
+        i = self.index.get(role_id)
+        if i is None:
+            return 0
+        out = self.out_indices[self.out_indptr[i]:self.out_indptr[i + 1]]
+        inc = self.in_indptr[i + 1] - self.in_indptr[i]
+        loops = int((out == i).sum()) if self._numpy else out.count(i)
+        return int(len(out) + inc - loops)
+
+    # -- Density / isolation (graph.py) ---------------------------------------
+
+    def structural_density(self) -> int:
+        """Same value as graph.compute_structural_density."""
+        n = self.n_roles
+        if n < 2:
+            return 0
+        return checked_mul(self.n_edges, SCALE) // (n * (n - 1))
+
+    def role_structural_density(self, role_id: str) -> int:
+        """Same value as graph.compute_role_structural_density."""
+        if not self.n_edges:
+            return 0
+        return checked_mul(self.degree(role_id), SCALE) // self.n_edges
+
+    def role_structural_densities(self) -> Dict[str, int]:
+        """role_structural_density for every role, in one pass."""
+        if not self.n_edges:
+            return {rid: 0 for rid in self.role_ids[:self.n_roles]}
+        deg = self.degrees()
+        total = self.n_edges
+        if deg:
+            checked_mul(max(deg), SCALE)  # same OverflowError as the scalar path
+        return {
+            rid: deg[i] * SCALE // total
+            for i, rid in enumerate(self.role_ids[:self.n_roles])
+        }
+
+    def isolated_roles(self) -> List[str]:
+        """Same value as graph.find_isolated_roles."""
+        deg = self.degrees()
+        return [rid for i, rid in enumerate(self.role_ids[:self.n_roles]) if not deg[i]]
+
+    def edge_type_counts(self) -> Dict[str, int]:
+        """Number of edges per dependency_type."""
+        if self._numpy:
+            counts = np.bincount(self.type_code, minlength=len(self.types)).tolist()
+        else:
+            counts = [0] * len(self.types)
+            for code in self.type_code:
+                counts[code] += 1
+        return dict(zip(self.types, counts))
+
+    # -- Department metrics (projection/metrics.py) ---------------------------
+
+    def boundary_heat(
+        self, departments: List, role_to_dept: Dict[str, str],
+    ) -> Dict[str, int]:
+        """Same value as projection.metrics.compute_boundary_heat."""
+        names, df, dt = self._dept_columns(departments, role_to_dept)
+        n = len(names)
+        if self._numpy:
+            valid = (df >= 0) & (dt >= 0)
+            ext = valid & (df != dt)
+            total = (
+                np.bincount(df[valid], minlength=n)
+                + np.bincount(dt[valid], minlength=n)
+            ).tolist()
+            external = (
+                np.bincount(df[ext], minlength=n)
+                + np.bincount(dt[ext], minlength=n)
+            ).tolist()
+        else:
+            total = [0] * n
+            external = [0] * n
+            for a, b in zip(df, dt):
+                if a < 0 or b < 0:
+                    continue
+                total[a] += 1
+                total[b] += 1
+                if a != b:
+                    external[a] += 1
+                    external[b] += 1
+
+        result: Dict[str, int] = {}
+        for i, d in enumerate(departments):
+            if total[i] == 0:
+                result[d.id] = 0
+            else:
+                result[d.id] = checked_mul(external[i], SCALE) // total[i]
+        return result
+
+    def inter_department_edges(
+        self, role_to_dept: Dict[str, str],
+    ) -> List[Tuple[str, str]]:
+        """Same value as projection.metrics.compute_inter_department_edges."""
+        names, df, dt = self._dept_columns([], role_to_dept)
+        if self._numpy:
+            keep = (df >= 0) & (dt >= 0) & (df != dt)
+            codes = np.unique(df[keep] * len(names) + dt[keep])
+            pairs = zip(*divmod(codes, len(names))) if len(codes) else ()
+        else:
+            pairs = {
+                (a, b) for a, b in zip(df, dt)
+                if a >= 0 and b >= 0 and a != b
+            }
+        return sorted((names[int(a)], names[int(b)]) for a, b in pairs)
+
+    # -- Internal -------------------------------------------------------------
+
+    def _csr(self, keys, values):
+        """Offsets and targets grouping *values* by *keys* (stable)."""
+        n = len(self.role_ids)
+        if self._numpy:
+            order = np.argsort(keys, kind="stable")
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys, minlength=n), out=indptr[1:])
+            return indptr, values[order]
+        counts = [0] * n
+        for k in keys:
+            counts[k] += 1
+        indptr = [0] * (n + 1)
+        for i, c in enumerate(counts):
+            indptr[i + 1] = indptr[i] + c
+        cursor = indptr[:-1]
+        indices = [0] * len(keys)
+        for k, v in zip(keys, values):
+            indices[cursor[k]] = v
+            cursor[k] += 1
+        return indptr, indices
+
+    def _diff(self, indptr) -> List[int]:
+        if self._numpy:
+            return np.diff(indptr).tolist()
+        return [indptr[i + 1] - indptr[i] for i in range(len(self.role_ids))]
+
+    def _dept_columns(self, departments: List, role_to_dept: Dict[str, str]):
+        """
+        Department names (listed departments first) and each edge's
+        (from_dept, to_dept) index; -1 where the endpoint is unmapped.
+        """
+        names: List[str] = [d.id for d in departments]
+        dept_index: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        for dept in role_to_dept.values():
+            if dept not in dept_index:
+                dept_index[dept] = len(names)
+                names.append(dept)
+        of_role = [
+            dept_index.get(role_to_dept.get(rid), -1) for rid in self.role_ids
+        ]
+        if self._numpy:
+            lookup = np.asarray(of_role, dtype=np.int64)
+            return names, lookup[self.src], lookup[self.dst]
+        return names, [of_role[s] for s in self.src], [of_role[d] for d in self.dst]
@@ -0,0 +1,312 @@
+"""
+Organizational Kernel — Copy-on-Write Containers
+
+CowDict and CowSet fork in O(1): after fork() both sides read a shared,
+frozen base plus a stack of frozen change layers, and each side writes
+only into a private layer of its own.  A container that has never been
+forked is a thin wrapper over a plain dict.
+
+Reads stay cheap because the stack stays short: on fork the private
+layer is frozen and pushed, adjacent layers are merged while the newer
+one is at least half the size of the older (so there are O(log n) of
+them), and once the layers together hold more than half as many entries
+as the base they are folded into a fresh base.  A fork therefore costs
+amortised O(1) in the size of the container, and memory grows with the
+number of writes rather than with the number of forks.
+
+Iteration order is exactly a dict's: insertion order, an overwritten
+key keeps its place, a deleted and re-inserted key moves to the end.
+Iterating a forked container materialises its view, which is O(n) like
+the iteration itself.
+"""
+
+from __future__ import annotations
+
+import copy
+import sys
+from collections.abc import Mapping, MutableMapping, MutableSet
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+_MISSING = object()
+_DELETED = object()  # layer entry: the key was removed
+
+# (entries, appended): key -> value or _DELETED, plus the keys that were
+# (re)inserted rather than overwritten in this layer, in entries order
+_Layer = Tuple[Dict[Any, Any], Set[Any]]
+
+
+class CowDict(MutableMapping):
+    """
+    dict-like mapping whose fork() shares everything written before it.
+
+    Layers, once pushed by fork(), are never mutated; the base is never
+    mutated once shared.  Values themselves are shared, as with
+    dict.copy().
+    """
+
+    __slots__ = ("_base", "_layers", "_own", "_own_app", "_chain", "_shared", "_len")
+
+    def __init__(self, data: Any = ()) -> None:
+        self._base: Dict[Any, Any] = dict(data)
+        self._layers: Tuple[_Layer, ...] = ()
+        self._shared = False
+        self._len = 0  # maintained only while shared
+        self._reset_own()
+
+    # -- Mapping protocol ---------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._len if self._shared else len(self._base)
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._shared:
+            for entries in self._chain:
+                value = entries.get(key, _MISSING)
+                if value is not _MISSING:
+                    if value is _DELETED:
+                        raise KeyError(key)
+                    return value
+        return self._base[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._view())
+
+    def __reversed__(self) -> Iterator[Any]:
+        if not self._shared:
+            return reversed(self._base)
+        return self._reversed_keys()
+
+    def keys(self):
+        return self._view().keys()
+
+    def values(self):
+        return self._view().values()
+
+    def items(self):
+        return self._view().items()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CowDict):
+            return self._view() == other._view()
+        if isinstance(other, dict):
+            return self._view() == other
+        if isinstance(other, Mapping):
+            return self._view() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._view()!r})"
+
+    def __sizeof__(self) -> int:
+        # memory private to this container: the whole base until shared
+        if not self._shared:
+            return object.__sizeof__(self) + sys.getsizeof(self._base)
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._own)
+            + sys.getsizeof(self._own_app)
+        )
+
+    # -- Mutation -----------------------------------------------------------
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if not self._shared:
+            self._base[key] = value
+            return
+        own = self._own
+        if self._lookup(key) is _MISSING:
+            own.pop(key, None)  # a re-insert moves to the end
+            own[key] = value
+            self._own_app.add(key)
+            self._len += 1
+        else:
+            own[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        if not self._shared:
+            del self._base[key]
+            return
+        if self._lookup(key) is _MISSING:
+            raise KeyError(key)
+        self._own[key] = _DELETED
+        self._own_app.discard(key)
+        self._len -= 1
+
+    def clear(self) -> None:
+        self._base = {}
+        self._layers = ()
+        self._shared = False
+        self._reset_own()
+
+    # -- Copying ------------------------------------------------------------
+
+    def fork(self) -> "CowDict":
+        """O(1) amortised copy; both sides copy on write from here on."""
+        self._freeze()
+        clone = type(self).__new__(type(self))
+        clone._base = self._base
+        clone._layers = self._layers
+        clone._shared = True
+        clone._len = self._len
+        clone._reset_own()
+        return clone
+
+    copy = fork
+
+    def __copy__(self) -> "CowDict":
+        return self.fork()
+
+    def __deepcopy__(self, memo: dict) -> "CowDict":
+        return type(self)(copy.deepcopy(self._view(), memo))
+
+    def __reduce__(self):
+        return (type(self), (dict(self._view()),))
+
+    # -- Internal -------------------------------------------------------------
+
+    def _reset_own(self) -> None:
+        self._own: Dict[Any, Any] = {}
+        self._own_app: Set[Any] = set()
+        self._chain = (self._own,) + tuple(
+            entries for entries, _ in reversed(self._layers)
+        )
+
+    def _lookup(self, key: Any) -> Any:
+        """Current value of *key*, or _MISSING."""
+        if self._shared:
+            for entries in self._chain:
+                value = entries.get(key, _MISSING)
+                if value is not _MISSING:
+                    return _MISSING if value is _DELETED else value
+        return self._base.get(key, _MISSING)
+
+    def _freeze(self) -> None:
+        """Push the private layer so it can be shared."""
+        if not self._shared:
+            self._shared = True
+            self._len = len(self._base)
+            return
+        if not self._own:
+            return
+        layers: List[_Layer] = list(self._layers)
+        layers.append((self._own, self._own_app))
+        while len(layers) > 1 and 2 * len(layers[-1][0]) >= len(layers[-2][0]):
+            newer = layers.pop()
+            layers[-1] = _compose(layers[-1], newer)
+        if sum(len(entries) for entries, _ in layers) > len(self._base) // 2 + 16:
+            base = dict(self._base)
+            for layer in layers:
+                _apply(base, layer)
+            self._base = base
+            layers = []
+        self._layers = tuple(layers)
+        self._reset_own()
+
+    def _view(self) -> Dict[Any, Any]:
+        """A dict equal to this mapping (the base itself if unchanged)."""
+        if not self._layers and not self._own:
+            return self._base
+        view = dict(self._base)
+        for layer in self._layers:
+            _apply(view, layer)
+        _apply(view, (self._own, self._own_app))
+        return view
+
+    def _reversed_keys(self) -> Iterator[Any]:
+        # a key sits where its newest (re)insert put it, or in the base
+        seen: Set[Any] = set()
+        for entries, appended in ((self._own, self._own_app),) + tuple(reversed(self._layers)):
+            for key in reversed(entries):
+                if key in appended and key not in seen:
+                    seen.add(key)
+                    if key in self:
+                        yield key
+        for key in reversed(self._base):
+            if key not in seen and key in self:
+                yield key
+
+
+class CowSet(MutableSet):
+    """set-like container with the same O(1) fork() as CowDict."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        self._items = CowDict(dict.fromkeys(items, True))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._items
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def add(self, item: Any) -> None:
+        if item not in self._items:
+            self._items[item] = True
+
+    def discard(self, item: Any) -> None:
+        if item in self._items:
+            del self._items[item]
+
+    def __repr__(self) -> str:
+        return f"CowSet({set(self._items)!r})"
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._items)
+
+    def fork(self) -> "CowSet":
+        """O(1) amortised copy; both sides copy on write from here on."""
+        clone = CowSet.__new__(CowSet)
+        clone._items = self._items.fork()
+        return clone
+
+    copy = fork
+
+    def __copy__(self) -> "CowSet":
+        return self.fork()
+
+    def __deepcopy__(self, memo: dict) -> "CowSet":
+        return CowSet(copy.deepcopy(list(self._items), memo))
+
+    def __reduce__(self):
+        return (CowSet, (list(self._items),))
+
+
+def _apply(view: Dict[Any, Any], layer: _Layer) -> None:
+    entries, appended = layer
+    for key, value in entries.items():
+        if value is _DELETED:
+            view.pop(key, None)
+        elif key in appended:
+            view.pop(key, None)
+            view[key] = value
+        else:
+            view[key] = value
+
+
+def _compose(older: _Layer, newer: _Layer) -> _Layer:
+    """One layer equivalent to applying *older* then *newer*."""
+    entries = dict(older[0])
+    appended = set(older[1])
+    newer_appended = newer[1]
+    for key, value in newer[0].items():
+        if value is _DELETED:
+            entries[key] = _DELETED
+            appended.discard(key)
+        elif key in newer_appended:
+            entries.pop(key, None)
+            entries[key] = value
+            appended.add(key)
+        else:
+            entries[key] = value
+    return entries, appended
@@ -0,0 +1,264 @@
+"""
+Organizational Kernel — Event Deltas
+
+The set of entities an event touched, used by incremental indexes
+(invariants, diagnostics) so they can update in O(delta) instead of
+rescanning the whole state.
+
+Edges are compared as multisets of (from, to, type, critical) keys;
+edges present both before and after cancel out.
+
+InverseDelta is the other direction: what a transition overwrote
+(prior roles, edges by storage id, scalars, history position), so the
+engine can step back without replaying from the start.
+
+StateDelta is the structured, serializable change set attached to every
+TransitionResult (roles added / removed / modified, edges added /
+removed / rewired, debt and constraint changes).  It is derived from
+the InverseDelta and the post-transition state in O(delta), and its
+to_event_delta() feeds the engine's incremental indexes.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, fields
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+from .domain_types import (
+    ConstraintVector, DependencyEdge, DomainConstants, OrgState, Role,
+)
+from .events import BaseEvent
+
+EdgeKey = Tuple[str, str, str, bool]
+
+
+@dataclass(frozen=True)
+class EventDelta:
+    """Role ids touched by an event plus the net edge changes."""
+
+    role_ids: Tuple[str, ...] = ()
+    edges_removed: Tuple[EdgeKey, ...] = ()
+    edges_added: Tuple[EdgeKey, ...] = ()
+
+    def reversed(self) -> "EventDelta":
+        """The delta that undoes this one (edge sides swapped)."""
+        return EventDelta(
+            role_ids=self.role_ids,
+            edges_removed=self.edges_added,
+            edges_added=self.edges_removed,
+        )
+
+
+def edge_key(edge: DependencyEdge) -> EdgeKey:
+    return (edge.from_role_id, edge.to_role_id, edge.dependency_type, edge.critical)
+
+
+def compute_event_delta(
+    prev: OrgState, new: OrgState, event: BaseEvent,
+) -> EventDelta:
+    """
+    Derive the delta of *event* from the states before and after it.
+
+    *prev* must be the untouched pre-transition state (copy-on-write
+    transitions guarantee this).
+    """
+    etype = event.event_type
+    p = event.payload
+
+    if etype == "add_role":
+        role_ids: Tuple[str, ...] = (p["id"],)
+    elif etype == "remove_role":
+        role_ids = (p["role_id"],)
+    elif etype == "differentiate_role":
+        role_ids = (p["role_id"],) + tuple(
+            nr["id"] for nr in p.get("new_roles", [])
+        )
+    elif etype == "compress_roles":
+        role_ids = (p["source_role_id"], p["target_role_id"])
+    elif etype == "inject_shock":
+        role_ids = (p["target_role_id"],)
+    else:
+        role_ids = ()
+    role_ids = tuple(sorted(set(role_ids)))
+
+    if etype == "add_dependency":
+        appended = len(new.dependencies) - len(prev.dependencies)
+        added = tuple(
+            edge_key(e) for e in islice(reversed(new.dependencies), appended)
+        )[::-1]
+        return EventDelta(role_ids=role_ids, edges_added=added)
+
+    if etype in ("remove_role", "compress_roles"):
+        before = Counter(map(edge_key, prev.dependencies.incident(*role_ids)))
+        after = Counter(map(edge_key, new.dependencies.incident(*role_ids)))
+        return EventDelta(
+            role_ids=role_ids,
+            edges_removed=tuple(sorted((before - after).elements())),
+            edges_added=tuple(sorted((after - before).elements())),
+        )
+
+    return EventDelta(role_ids=role_ids)
+
+
+@dataclass(frozen=True)
+class InverseDelta:
+    """
+    Everything a transition overwrote, captured before it ran.
+
+    roles            prior value of every role id it touched
+                     (None = the id did not exist)
+    edges_restored   prior edges by EdgeStore id (removed or rewired)
+    edges_dropped    EdgeStore ids of edges it appended
+    structural_debt / constraint_vector / constants
+                     prior values, or None if untouched
+    history_count / history_digest
+                     event_history length (and LoggedHistory digest)
+                     before the event was recorded
+    """
+
+    roles: Tuple[Tuple[str, Optional[Role]], ...] = ()
+    edges_restored: Tuple[Tuple[int, DependencyEdge], ...] = ()
+    edges_dropped: Tuple[int, ...] = ()
+    structural_debt: Optional[int] = None
+    constraint_vector: Optional[ConstraintVector] = None
+    constants: Optional[DomainConstants] = None
+    history_count: int = 0
+    history_digest: Optional[str] = None
+
+
+def inverse_event_delta(current: OrgState, inverse: InverseDelta) -> EventDelta:
+    """
+    The EventDelta of undoing *inverse* on *current* (the state the
+    event produced), for incremental indexes that follow the undo.
+    """
+    deps = current.dependencies
+    removed = [edge_key(deps.get(eid)) for eid in inverse.edges_dropped]
+    for eid, _ in inverse.edges_restored:
+        edge = deps.get(eid)
+        if edge is not None:
+            removed.append(edge_key(edge))
+    return EventDelta(
+        role_ids=tuple(sorted({rid for rid, _ in inverse.roles})),
+        edges_removed=tuple(removed),
+        edges_added=tuple(edge_key(e) for _, e in inverse.edges_restored),
+    )
+
+
+@dataclass(frozen=True)
+class StateDelta:
+    """
+    What one transition changed, in deterministic order.
+
+    Role ids are sorted and unique; edges are listed in storage order as
+    (from, to, type, critical) keys; edges_rewired pairs each edge's
+    key before and after (compress_roles).  An edge dropped by a rewire
+    because it became a self-loop is listed in edges_removed.
+    constraint_deltas holds (field, change) for changed constraint
+    fields only; constants_changed names changed DomainConstants fields.
+    """
+
+    roles_added: Tuple[str, ...] = ()
+    roles_removed: Tuple[str, ...] = ()
+    roles_modified: Tuple[str, ...] = ()
+    edges_added: Tuple[EdgeKey, ...] = ()
+    edges_removed: Tuple[EdgeKey, ...] = ()
+    edges_rewired: Tuple[Tuple[EdgeKey, EdgeKey], ...] = ()
+    structural_debt_delta: int = 0
+    constraint_deltas: Tuple[Tuple[str, int], ...] = ()
+    constants_changed: Tuple[str, ...] = ()
+
+    def to_event_delta(self) -> EventDelta:
+        """The (role ids, edge keys) view used by incremental indexes."""
+        return EventDelta(
+            role_ids=tuple(sorted(set(
+                self.roles_added + self.roles_removed + self.roles_modified
+            ))),
+            edges_removed=self.edges_removed + tuple(b for b, _ in self.edges_rewired),
+            edges_added=self.edges_added + tuple(a for _, a in self.edges_rewired),
+        )
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form (plain dicts, lists, ints, strings)."""
+        return {
+            "roles_added": list(self.roles_added),
+            "roles_removed": list(self.roles_removed),
+            "roles_modified": list(self.roles_modified),
+            "edges_added": [_edge_dict(k) for k in self.edges_added],
+            "edges_removed": [_edge_dict(k) for k in self.edges_removed],
+            "edges_rewired": [
+                {"before": _edge_dict(b), "after": _edge_dict(a)}
+                for b, a in self.edges_rewired
+            ],
+            "structural_debt_delta": self.structural_debt_delta,
+            "constraint_deltas": dict(self.constraint_deltas),
+            "constants_changed": list(self.constants_changed),
+        }
+
+
+def state_delta(inverse: InverseDelta, state: OrgState) -> StateDelta:
+    """
+    StateDelta of the transition that recorded *inverse* and produced
+    *state* — O(delta).
+    """
+    added: List[str] = []
+    removed: List[str] = []
+    modified: List[str] = []
+    for rid, prior in inverse.roles:
+        after = state.roles.get(rid)
+        if prior is None:
+            if after is not None:
+                added.append(rid)
+        elif after is None:
+            removed.append(rid)
+        elif after is not prior:
+            modified.append(rid)
+
+    deps = state.dependencies
+    edges_removed: List[EdgeKey] = []
+    edges_rewired: List[Tuple[EdgeKey, EdgeKey]] = []
+    for eid, before in inverse.edges_restored:
+        after_edge = deps.get(eid)
+        if after_edge is None:
+            edges_removed.append(edge_key(before))
+        elif after_edge is not before:
+            edges_rewired.append((edge_key(before), edge_key(after_edge)))
+
+    debt = 0
+    if inverse.structural_debt is not None:
+        debt = state.structural_debt - inverse.structural_debt
+    return StateDelta(
+        roles_added=tuple(sorted(set(added))),
+        roles_removed=tuple(sorted(set(removed))),
+        roles_modified=tuple(sorted(set(modified))),
+        edges_added=tuple(edge_key(deps.get(eid)) for eid in inverse.edges_dropped),
+        edges_removed=tuple(edges_removed),
+        edges_rewired=tuple(edges_rewired),
+        structural_debt_delta=debt,
+        constraint_deltas=_changed(inverse.constraint_vector, state.constraint_vector),
+        constants_changed=tuple(
+            name for name, _ in _changed(inverse.constants, state.constants)
+        ),
+    )
+
+
+def _changed(before, after) -> Tuple[Tuple[str, int], ...]:
+    """(field, after - before) for each differing int field; () if no *before*."""
+    if before is None:
+        return ()
+    diffs = []
+    for f in fields(before):
+        a, b = getattr(after, f.name), getattr(before, f.name)
+        if a != b:
+            diffs.append((f.name, a - b))
+    return tuple(diffs)
+
+
+def _edge_dict(key: EdgeKey) -> Dict[str, object]:
+    return {
+        "from_role_id": key[0],
+        "to_role_id": key[1],
+        "dependency_type": key[2],
+        "critical": key[3],
+    }
@@ -3,10 +3,19 @@ Organizational Kernel — Diagnostics v1.1
 
 Compute a diagnostic snapshot of the current organizational state.
 All density values: int64 fixed-point.
+
+DiagnosticsIndex keeps the counters and role sets behind the snapshot
+(governance edges, active / inactive roles, isolated roles) up to date
+from each event's delta, so OrgEngine.get_diagnostics() is O(1) plus
+the size of its output.
 """
 
 from __future__ import annotations
 
+from typing import List, Optional, Set, Tuple
+
+from .cow import CowSet
+from .delta import EventDelta
 from .domain_types import OrgState, SCALE
 from .graph import compute_structural_density, find_isolated_roles
 
@@ -21,7 +30,27 @@ def compute_diagnostics(state: OrgState) -> dict:
     governance_edges = sum(
         1 for d in state.dependencies if d.dependency_type == "governance"
     )
+    inactive = sorted(r.id for r in state.roles.values() if not r.active)
+    return _assemble(
+        state,
+        active_count=len(state.roles) - len(inactive),
+        density=density,
+        isolated=isolated,
+        inactive=inactive,
+        governance_edges=governance_edges,
+    )
 
+
+def _assemble(
+    state: OrgState,
+    *,
+    active_count: int,
+    density: int,
+    isolated: List[str],
+    inactive: List[str],
+    governance_edges: int,
+) -> dict:
+    """Build the diagnostics dict (warnings included) from its parts."""
     warnings: list[str] = []
 
     if density > 7000:  # 0.7 * SCALE
@@ -38,7 +67,6 @@ def compute_diagnostics(state: OrgState) -> dict:
             f"{len(isolated)} isolated role(s): {', '.join(isolated)}"
         )
 
-    inactive = sorted(r.id for r in state.roles.values() if not r.active)
     if inactive:
         warnings.append(
             f"{len(inactive)} inactive role(s): {', '.join(inactive)}"
@@ -46,10 +74,114 @@ def compute_diagnostics(state: OrgState) -> dict:
 
     return {
         "role_count": len(state.roles),
-        "active_role_count": sum(1 for r in state.roles.values() if r.active),
+        "active_role_count": active_count,
         "structural_density": density,
         "structural_debt": state.structural_debt,
         "isolated_roles": isolated,
         "governance_edges": governance_edges,
         "warnings": warnings,
     }
+
+
+class DiagnosticsIndex:
+    """
+    Running diagnostics counters for one engine.
+
+    Like IncrementalInvariantChecker, the index remembers which state
+    object (and role / dependency counts) it describes and rebuilds
+    from scratch when handed anything else.
+    """
+
+    def __init__(self) -> None:
+        self.invalidate()
+
+    # -- Public API ---------------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Forget the indexed state; the next use rebuilds."""
+        self._indexed: Optional[OrgState] = None
+        self._indexed_sizes: Tuple[int, int] = (0, 0)
+        self._governance: int = 0
+        self._inactive: CowSet = CowSet()
+        self._isolated: CowSet = CowSet()
+
+    def fork(self, source: OrgState, target: OrgState) -> "DiagnosticsIndex":
+        """
+        Independent index for *target*, an equal fork of *source*
+        (engine forks).  Starts invalidated if we do not describe *source*.
+        """
+        clone = DiagnosticsIndex()
+        if not self._describes(source):
+            return clone
+        clone._indexed = target
+        clone._indexed_sizes = self._indexed_sizes
+        clone._governance = self._governance
+        clone._inactive = self._inactive.fork()
+        clone._isolated = self._isolated.fork()
+        return clone
+
+    def rebuild(self, state: OrgState) -> None:
+        """Index *state* from scratch — O(state)."""
+        self._governance = sum(
+            1 for d in state.dependencies if d.dependency_type == "governance"
+        )
+        self._inactive = CowSet(rid for rid, r in state.roles.items() if not r.active)
+        self._isolated = CowSet(find_isolated_roles(state))
+        self._mark_indexed(state)
+
+    def update(self, prev: OrgState, new: OrgState, delta: EventDelta) -> None:
+        """Advance the index from *prev* to *new* (the result of *delta*)."""
+        if not self._describes(prev):
+            self.rebuild(new)
+            return
+
+        touched: Set[str] = set(delta.role_ids)
+        for key in delta.edges_removed:
+            if key[2] == "governance":
+                self._governance -= 1
+            touched.update(key[:2])
+        for key in delta.edges_added:
+            if key[2] == "governance":
+                self._governance += 1
+            touched.update(key[:2])
+
+        deps = new.dependencies
+        for rid in touched:
+            role = new.roles.get(rid)
+            if role is None:
+                self._inactive.discard(rid)
+                self._isolated.discard(rid)
+                continue
+            if role.active:
+                self._inactive.discard(rid)
+            else:
+                self._inactive.add(rid)
+            if deps.out_degree(rid) or deps.in_degree(rid):
+                self._isolated.discard(rid)
+            else:
+                self._isolated.add(rid)
+        self._mark_indexed(new)
+
+    def diagnostics(self, state: OrgState) -> dict:
+        """Same dict as compute_diagnostics(state)."""
+        if not self._describes(state):
+            self.rebuild(state)
+        return _assemble(
+            state,
+            active_count=len(state.roles) - len(self._inactive),
+            density=compute_structural_density(state),
+            isolated=sorted(self._isolated),
+            inactive=sorted(self._inactive),
+            governance_edges=self._governance,
+        )
+
+    # -- Internal -----------------------------------------------------------
+
+    def _describes(self, state: OrgState) -> bool:
+        return self._indexed is state and self._indexed_sizes == (
+            len(state.roles), len(state.dependencies),
+        )
+
+    def _mark_indexed(self, state: OrgState) -> None:
+        self._indexed = state
+        self._indexed_sizes = (len(state.roles), len(state.dependencies))
@@ -1,7 +1,12 @@
 """
 Organizational Kernel — Core Domain Types v1.1
 
-Pure data. No behaviour, no transition logic.
+Domain data plus the containers that keep it cheap to copy and query.
+EdgeStore holds the dependency edges in order and maintains adjacency
+and degree indexes on every mutation; OrgState coerces any assigned
+dependencies into one, and OrgState.fork() shares unchanged entities
+copy-on-write.  Entities are slotted and their identifiers interned
+(see "Compact Representation").  No transition logic (see transitions.py).
 All numeric values: int64 fixed-point (SCALE = 10_000).
 No float. No implicit casting.
 
@@ -24,9 +29,17 @@ Structural Debt:
 from __future__ import annotations
 
 import copy
+import dataclasses
 import re
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .cow import CowDict
+from .event_log import EventLog, SharedHistory
+
+if TYPE_CHECKING:
+    from .delta import InverseDelta, StateDelta
 
 
 # ── Fixed-Point Scale ──────────────────────────────────────────
@@ -65,11 +78,67 @@ def checked_mul(a: int, b: int) -> int:
     return result
 
 
+# ── Compact Representation ────────────────────────────────────
+
+def slotted(cls):
+    """
+    Rebuild a dataclass with ``__slots__`` (no per-instance __dict__).
+
+    Equivalent to ``@dataclass(slots=True)``, which needs Python 3.10;
+    the deployment runtime is 3.9.  Only fields not already slotted in
+    a base class get a slot, so event subclasses that merely override a
+    base field's default stay slot-free.  Not for frozen dataclasses
+    (unpickling would hit their __setattr__).
+    """
+    inherited = set()
+    for base in cls.__mro__[1:]:
+        inherited.update(getattr(base, "__slots__", ()))
+    names = tuple(
+        f.name for f in dataclasses.fields(cls) if f.name not in inherited
+    )
+    cls_dict = dict(cls.__dict__)
+    for f in dataclasses.fields(cls):
+        cls_dict.pop(f.name, None)  # defaults live in the generated __init__
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    cls_dict["__slots__"] = names
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+def intern_str(value):
+    """sys.intern for exact str values; anything else is returned as-is."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def intern_tokens(tokens):
+    """Interned copy of a token list (responsibilities, inputs, outputs)."""
+    if type(tokens) is not list:
+        return tokens
+    return [intern_str(t) for t in tokens]
+
+
+def intern_value(value):
+    """Recursively intern every str in a JSON-like payload (new containers)."""
+    if type(value) is dict:
+        return {intern_str(k): intern_value(v) for k, v in value.items()}
+    if type(value) is list:
+        return [intern_value(v) for v in value]
+    return intern_str(value)
+
+
 # ── Core Domain Types ─────────────────────────────────────────
 
+@slotted
 @dataclass
 class Role:
-    """A single organizational role — the causal unit of structure."""
+    """
+    A single organizational role — the causal unit of structure.
+
+    Slotted; the id and every responsibility / input / output token
+    are interned, so tokens shared across roles are stored once.
+    """
 
     id: str
     name: str
@@ -80,17 +149,257 @@ class Role:
     scale_stage: str = "seed"  # seed | growth | structured | mature
     active: bool = True
 
+    def __post_init__(self) -> None:
+        self.id = intern_str(self.id)
+        self.responsibilities = intern_tokens(self.responsibilities)
+        self.required_inputs = intern_tokens(self.required_inputs)
+        self.produced_outputs = intern_tokens(self.produced_outputs)
+        self.scale_stage = intern_str(self.scale_stage)
+
 
+@slotted
 @dataclass
 class DependencyEdge:
-    """Directed dependency between two roles."""
+    """Directed dependency between two roles (slotted, interned ids)."""
 
     from_role_id: str
     to_role_id: str
     dependency_type: str = "operational"  # operational | informational | governance
     critical: bool = False
 
+    def __post_init__(self) -> None:
+        self.from_role_id = intern_str(self.from_role_id)
+        self.to_role_id = intern_str(self.to_role_id)
+        self.dependency_type = intern_str(self.dependency_type)
+
+
+class EdgeStore:
+    """
+    Insertion-ordered dependency storage with in/out adjacency.
+
+    Behaves like the ``List[DependencyEdge]`` it replaces (iteration,
+    len, indexing, append, equality with lists) while keying edges by a
+    monotonically increasing id, so removing or rewiring edges keeps
+    every surviving edge in its original position without rebuilding
+    the list.  Per-role adjacency makes degree and neighbour queries
+    O(degree).
+
+    fork() is O(1): the edge and adjacency tables are CowDicts, and a
+    per-role adjacency list is copied only when that role's adjacency
+    is first modified.
+    """
+
+    __slots__ = ("_edges", "_out", "_in", "_owned", "_next_id", "_revision")
+
+    def __init__(self, edges: Iterable[DependencyEdge] = ()) -> None:
+        self._edges: CowDict = CowDict()  # id -> DependencyEdge
+        self._out: CowDict = CowDict()    # role id -> [edge id]
+        self._in: CowDict = CowDict()
+        self._owned: Set[Tuple[bool, str]] = set()  # adjacency lists we may mutate
+        self._next_id = 0
+        self._revision = object()
+        for edge in edges:
+            self.append(edge)
+
+    # -- List protocol ------------------------------------------------------
+
+    def __iter__(self) -> Iterator[DependencyEdge]:
+        return iter(self._edges.values())
+
+    def __reversed__(self) -> Iterator[DependencyEdge]:
+        edges = self._edges
+        return (edges[eid] for eid in reversed(edges))
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    def __getitem__(self, index):
+        if index == -1 and self._edges:
+            return self._edges[next(reversed(self._edges))]
+        if index == 0 and self._edges:
+            return next(iter(self._edges.values()))
+        return list(self._edges.values())[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (EdgeStore, list, tuple)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EdgeStore({list(self._edges.values())!r})"
+
+    def __sizeof__(self) -> int:
+        # shallow, like list.__sizeof__: the containers, not the edges
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._edges)
+            + sys.getsizeof(self._out)
+            + sys.getsizeof(self._in)
+        )
 
+    @property
+    def revision(self) -> object:
+        """
+        Opaque token that changes on every mutation and is shared by
+        forks until either side mutates (for caching derived data).
+        """
+        return self._revision
+
+    def append(self, edge: DependencyEdge) -> int:
+        """Append *edge*; returns its storage id."""
+        self._revision = object()
+        eid = self._next_id
+        self._next_id += 1
+        self._edges[eid] = edge
+        self._adj(self._out, edge.from_role_id).append(eid)
+        self._adj(self._in, edge.to_role_id).append(eid)
+        return eid
+
+    def extend(self, edges: Iterable[DependencyEdge]) -> None:
+        for edge in edges:
+            self.append(edge)
+
+    # -- Graph queries (O(degree)) -----------------------------------------
+
+    def outgoing(self, role_id: str) -> List[DependencyEdge]:
+        return [self._edges[i] for i in self._out.get(role_id, ())]
+
+    def incoming(self, role_id: str) -> List[DependencyEdge]:
+        return [self._edges[i] for i in self._in.get(role_id, ())]
+
+    def incident(self, *role_ids: str) -> List[DependencyEdge]:
+        """Edges touching any of *role_ids*, in storage order, each once."""
+        return [self._edges[i] for i in self._incident_ids(*role_ids)]
+
+    def incident_items(self, *role_ids: str) -> List[Tuple[int, DependencyEdge]]:
+        """incident() paired with each edge's storage id."""
+        return [(i, self._edges[i]) for i in self._incident_ids(*role_ids)]
+
+    def get(self, eid: int) -> Optional[DependencyEdge]:
+        """The edge stored under *eid*, or None."""
+        return self._edges.get(eid)
+
+    def out_degree(self, role_id: str) -> int:
+        return len(self._out.get(role_id, ()))
+
+    def in_degree(self, role_id: str) -> int:
+        return len(self._in.get(role_id, ()))
+
+    def degree(self, role_id: str) -> int:
+        """Number of edges with *role_id* as either endpoint."""
+        out_ids = self._out.get(role_id, ())
+        in_ids = self._in.get(role_id, ())
+        if not out_ids or not in_ids:
+            return len(out_ids) + len(in_ids)
+        loops = len(set(out_ids).intersection(in_ids))  # self-loop edges
+        return len(out_ids) + len(in_ids) - loops
+
+    # -- Keyed mutation ------------------------------------------------------
+
+    def remove_incident(self, role_id: str) -> List[DependencyEdge]:
+        """Remove every edge touching *role_id*; return them in order."""
+        self._revision = object()
+        removed = []
+        for eid in self._incident_ids(role_id):
+            removed.append(self._discard(eid))
+        return removed
+
+    def rewire(self, src_id: str, tgt_id: str) -> None:
+        """
+        Point every endpoint *src_id* at *tgt_id* in place (positions
+        unchanged) and drop edges that become self-loops.
+        """
+        self._revision = object()
+        for eid in self._incident_ids(src_id):
+            edge = self._discard(eid, keep_slot=True)
+            edge = dataclasses.replace(
+                edge,
+                from_role_id=tgt_id if edge.from_role_id == src_id else edge.from_role_id,
+                to_role_id=tgt_id if edge.to_role_id == src_id else edge.to_role_id,
+            )
+            if edge.from_role_id == edge.to_role_id:
+                del self._edges[eid]
+                continue
+            self._edges[eid] = edge
+            self._adj(self._out, edge.from_role_id).append(eid)
+            self._adj(self._in, edge.to_role_id).append(eid)
+
+    def discard_ids(self, eids: Iterable[int]) -> None:
+        """Remove the edges stored under *eids*."""
+        self._revision = object()
+        for eid in eids:
+            self._discard(eid)
+
+    def restore(self, items: Iterable[Tuple[int, DependencyEdge]]) -> None:
+        """
+        Put edges back under their original storage ids (the undo of
+        remove_incident / rewire).  An id still present is overwritten
+        in place; a missing one is re-inserted at its original position.
+        """
+        self._revision = object()
+        top = next(reversed(self._edges), -1)
+        reorder = False
+        for eid, edge in items:
+            if eid in self._edges:
+                self._discard(eid, keep_slot=True)
+            elif eid < top:
+                reorder = True
+            else:
+                top = eid
+            self._edges[eid] = edge
+            self._adj(self._out, edge.from_role_id).append(eid)
+            self._adj(self._in, edge.to_role_id).append(eid)
+        if reorder:
+            # ids grow with insertion, so id order is storage order
+            self._edges = CowDict(sorted(self._edges.items()))
+
+    def fork(self) -> "EdgeStore":
+        """O(1) structural-sharing copy; both sides copy on write."""
+        clone = EdgeStore.__new__(EdgeStore)
+        clone._edges = self._edges.fork()
+        clone._out = self._out.fork()
+        clone._in = self._in.fork()
+        clone._owned = set()
+        clone._next_id = self._next_id
+        clone._revision = self._revision
+        # the original must no longer write into lists it now shares
+        self._owned = set()
+        return clone
+
+    # -- Internal -------------------------------------------------------------
+
+    def _incident_ids(self, *role_ids: str) -> List[int]:
+        ids: Set[int] = set()
+        for rid in role_ids:
+            ids.update(self._out.get(rid, ()))
+            ids.update(self._in.get(rid, ()))
+        return sorted(ids)
+
+    def _adj(self, side: Dict[str, List[int]], role_id: str) -> List[int]:
+        key = (side is self._out, role_id)
+        ids = side.get(role_id)
+        if ids is None:
+            ids = side[role_id] = []
+            self._owned.add(key)
+        elif key not in self._owned:
+            ids = side[role_id] = list(ids)
+            self._owned.add(key)
+        return ids
+
+    def _discard(self, eid: int, keep_slot: bool = False) -> DependencyEdge:
+        edge = self._edges[eid] if keep_slot else self._edges.pop(eid)
+        for side, rid in ((self._out, edge.from_role_id), (self._in, edge.to_role_id)):
+            ids = self._adj(side, rid)
+            ids.remove(eid)
+            if not ids:
+                del side[rid]
+                self._owned.discard((side is self._out, rid))
+        return edge
+
+
+@slotted
 @dataclass
 class ConstraintVector:
     """Resource constraints — int64 fixed-point (real * SCALE)."""
@@ -149,6 +458,21 @@ class TransitionResult:
     target_density: int = 0       # fixed-point scaled
     shock_target: str = ""
     magnitude: int = 0
+    # which roles / edges / scalars changed (see delta.StateDelta)
+    delta: Optional[StateDelta] = field(default=None, repr=False)
+    # what the transition overwrote (see delta.InverseDelta); not part
+    # of the outcome itself, so excluded from equality and repr
+    inverse: Optional[InverseDelta] = field(default=None, repr=False, compare=False)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable outcome, structured delta included."""
+        data = {
+            f.name: getattr(self, f.name)
+            for f in dataclasses.fields(self)
+            if f.compare and f.name != "delta"
+        }
+        data["delta"] = self.delta.to_dict() if self.delta is not None else None
+        return data
 
 
 @dataclass
@@ -161,17 +485,42 @@ class OrgState:
     """
 
     roles: Dict[str, Role] = field(default_factory=dict)
-    dependencies: List[DependencyEdge] = field(default_factory=list)
+    dependencies: EdgeStore = field(default_factory=EdgeStore)
     constraint_vector: ConstraintVector = field(default_factory=ConstraintVector)
     constants: DomainConstants = field(default_factory=DomainConstants)
     scale_stage: str = "seed"
     structural_debt: int = 0
-    event_history: List[dict] = field(default_factory=list)
+    event_history: List[dict] = field(default_factory=list)  # or a SharedHistory
+
+    def __setattr__(self, name: str, value) -> None:
+        # dependencies is always an EdgeStore, however it is assigned
+        if name == "dependencies" and not isinstance(value, EdgeStore):
+            value = EdgeStore(value)
+        object.__setattr__(self, name, value)
 
     def copy(self) -> "OrgState":
-        """Deep-copy the entire state for immutable transitions."""
+        """Deep-copy the entire state (fully independent clone)."""
         return copy.deepcopy(self)
 
+    def fork(self) -> "OrgState":
+        """
+        Structural-sharing copy for copy-on-write transitions.
+
+        O(1): roles, dependencies and history are copy-on-write views
+        over the original's, and Role and DependencyEdge objects are
+        shared with it. Callers must treat shared entities as immutable
+        and replace (never mutate) any entity they change.
+        """
+        return OrgState(
+            roles=_fork_roles(self.roles),
+            dependencies=self.dependencies.fork(),
+            constraint_vector=dataclasses.replace(self.constraint_vector),
+            constants=self.constants,
+            scale_stage=self.scale_stage,
+            structural_debt=self.structural_debt,
+            event_history=_fork_history(self.event_history),
+        )
+
     def to_dict(self) -> dict:
         """Serialise state to a plain dict (for diagnostics / logging)."""
         return {
@@ -210,3 +559,20 @@ class OrgState:
             "structural_debt": self.structural_debt,
             "event_count": len(self.event_history),
         }
+
+
+def _fork_roles(roles):
+    """CowDicts fork in O(1); any other mapping is copied into one once."""
+    if isinstance(roles, CowDict):
+        return roles.fork()
+    return CowDict(roles)
+
+
+def _fork_history(history):
+    """
+    Shared histories fork in O(1); a plain list is wrapped once, after
+    which every later fork shares its log.
+    """
+    if isinstance(history, SharedHistory):
+        return history.fork()
+    return SharedHistory(EventLog(history))
@@ -5,18 +5,46 @@ Top-level orchestrator. Delegates mutation to transitions.py,
 validates via invariants.py, reports via diagnostics.py.
 
 v1.1: strict sequence enforcement, constants-first validation.
+Trusted replay: in-place application of already-validated streams with
+checkpointed invariant validation and strict fallback.
+Incremental invariants: per-event validation from maintained indexes,
+with the full checker kept as a debug cross-check.
+History modes: inline dict-per-event lists, or a shared append-only log.
+Diagnostics: running counters updated per transition, with the full
+computation kept as a debug cross-check.
+Checkpoints: optional in-memory ring of states every K events, so
+state_at(seq) replays at most K events.
+Undo: optional log of per-event inverse deltas, so step_back() and
+rewind_to(seq) restore earlier states in O(delta) without replay.
+Forks: fork() branches the engine with structural sharing for what-if
+exploration (see scenarios.py).
+Restore: restore_state() continues from a restored snapshot instead of
+replaying the events before it.
 """
 
 from __future__ import annotations
 
-from typing import List, Tuple
+from collections import deque
+from typing import Deque, List, Tuple
 
 from .domain_types import OrgState, TransitionResult
 from .events import BaseEvent
 from .state import create_initial_state
 from .transitions import apply_event as _transition_apply
-from .invariants import validate_invariants
-from .diagnostics import compute_diagnostics
+from .transitions import apply_event_in_place as _transition_apply_in_place
+from .transitions import revert_in_place as _transition_revert_in_place
+from .invariants import InvariantViolationError, validate_invariants
+from .incremental_invariants import IncrementalInvariantChecker
+from .checkpoints import DEFAULT_CHECKPOINT_BUDGET_BYTES, CheckpointRing
+from .delta import EventDelta, InverseDelta, inverse_event_delta
+from .diagnostics import DiagnosticsIndex, compute_diagnostics
+from .event_log import EventLog, LoggedHistory
+from .hashing import CanonicalHashCache
+
+
+INVARIANT_MODES = ("incremental", "full", "cross_check")
+HISTORY_MODES = ("inline", "log")
+DIAGNOSTICS_MODES = ("incremental", "full", "cross_check")
 
 
 class OrgEngine:
@@ -27,12 +55,73 @@ class OrgEngine:
       - First event MUST be initialize_constants (sequence=1)
       - Sequence numbers strictly increasing, no gaps, no duplicates
       - Hard fail on any violation
+
+    invariant_mode selects per-event validation:
+      - "incremental"  maintained indexes, O(delta) per event (default)
+      - "full"         rescan the whole state with validate_invariants
+      - "cross_check"  run both and fail loudly if they disagree (debug)
+
+    history_mode selects where applied events are recorded:
+      - "inline"  state.event_history holds the event dicts directly; forks
+                  share them copy-on-write via a SharedHistory (default)
+      - "log"     one append-only EventLog shared by every state version;
+                  each state holds a LoggedHistory (count + rolling digest)
+
+    diagnostics_mode selects how get_diagnostics() is produced:
+      - "incremental"  running counters updated per transition (default)
+      - "full"         compute_diagnostics rescans the whole state
+      - "cross_check"  compute both and fail loudly if they differ (debug)
+
+    checkpoint_every=K > 0 keeps a fork of the state every K events
+    (within checkpoint_budget_bytes; see checkpoints.CheckpointRing) so
+    state_at(seq) can answer historical queries cheaply.
+
+    undo_depth=N > 0 keeps the inverse deltas of the last N events so
+    step_back() / rewind_to(seq) can undo them without replay.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        invariant_mode: str = "incremental",
+        history_mode: str = "inline",
+        diagnostics_mode: str = "incremental",
+        checkpoint_every: int = 0,
+        checkpoint_budget_bytes: int = DEFAULT_CHECKPOINT_BUDGET_BYTES,
+        undo_depth: int = 0,
+    ) -> None:
+        if invariant_mode not in INVARIANT_MODES:
+            raise ValueError(
+                f"Unknown invariant_mode {invariant_mode!r}; "
+                f"expected one of {INVARIANT_MODES}"
+            )
+        if history_mode not in HISTORY_MODES:
+            raise ValueError(
+                f"Unknown history_mode {history_mode!r}; "
+                f"expected one of {HISTORY_MODES}"
+            )
+        if diagnostics_mode not in DIAGNOSTICS_MODES:
+            raise ValueError(
+                f"Unknown diagnostics_mode {diagnostics_mode!r}; "
+                f"expected one of {DIAGNOSTICS_MODES}"
+            )
         self._state: OrgState | None = None
         self._last_sequence: int = 0
         self._constants_initialized: bool = False
+        self._invariant_mode = invariant_mode
+        self._invariants = IncrementalInvariantChecker()
+        self._history_mode = history_mode
+        self._event_log: EventLog | None = None
+        self._hash_cache = CanonicalHashCache()
+        self._diagnostics_mode = diagnostics_mode
+        self._diagnostics = DiagnosticsIndex()
+        self._checkpoints: CheckpointRing | None = (
+            CheckpointRing(checkpoint_every, checkpoint_budget_bytes)
+            if checkpoint_every > 0 else None
+        )
+        self._undo_depth = undo_depth
+        self._undo: Deque[Tuple[BaseEvent, InverseDelta]] = deque(
+            maxlen=max(undo_depth, 0),
+        )
 
     # -- State access -------------------------------------------------------
 
@@ -42,13 +131,34 @@ class OrgEngine:
             raise RuntimeError("Engine not initialised — call initialize_state() first")
         return self._state
 
+    @property
+    def event_log(self) -> EventLog | None:
+        """The shared history log (history_mode="log" only)."""
+        return self._event_log
+
+    @property
+    def last_sequence(self) -> int:
+        """Sequence number of the last applied event (0 = none)."""
+        return self._last_sequence
+
+    @property
+    def checkpoints(self) -> CheckpointRing | None:
+        """The checkpoint ring (checkpoint_every > 0 only)."""
+        return self._checkpoints
+
     # -- Public API ---------------------------------------------------------
 
     def initialize_state(self, **kwargs) -> OrgState:
         """Create a fresh initial state and store it."""
         self._state = create_initial_state(**kwargs)
+        if self._history_mode == "log":
+            self._event_log = EventLog()
+            self._state.event_history = LoggedHistory(self._event_log)
         self._last_sequence = 0
         self._constants_initialized = False
+        if self._checkpoints is not None:
+            self._checkpoints.reset(self._state)
+        self._undo.clear()
         return self._state
 
     def apply_event(
@@ -60,34 +170,18 @@ class OrgEngine:
           2. Validate constants-first rule
           3. Delegate to transitions.apply_event
           4. Validate invariants on new state
-          5. Store and return
+          5. Update running diagnostics, store and return
         """
-        # -- Sequence enforcement --
-        expected = self._last_sequence + 1
-        if event.sequence != expected:
-            raise ValueError(
-                f"Sequence violation: expected {expected}, "
-                f"got {event.sequence}"
-            )
-
-        # -- Constants-first enforcement --
-        if not self._constants_initialized:
-            if event.event_type != "initialize_constants":
-                raise ValueError(
-                    "First event MUST be initialize_constants, "
-                    f"got {event.event_type!r}"
-                )
-            self._constants_initialized = True
-        else:
-            if event.event_type == "initialize_constants":
-                raise ValueError(
-                    "initialize_constants can only be the first event"
-                )
+        self._check_sequence(event)
 
         new_state, result = _transition_apply(self.state, event)
-        validate_invariants(new_state)
+        delta = result.delta.to_event_delta()
+        self._validate(self.state, new_state, event, delta)
+        self._diagnostics.update(self.state, new_state, delta)
         self._state = new_state
         self._last_sequence = event.sequence
+        self._record(event, new_state)
+        self._undo.append((event, result.inverse))
         return new_state, result
 
     def apply_sequence(self, events: List[BaseEvent]) -> OrgState:
@@ -99,16 +193,331 @@ class OrgEngine:
             self.apply_event(event)
         return self.state
 
-    def replay(self, events: List[BaseEvent]) -> OrgState:
+    def apply_batch(
+        self,
+        events: List[BaseEvent],
+        *,
+        validate_each: bool = False,
+    ) -> Tuple[OrgState, List[TransitionResult]]:
+        """
+        Apply *events* atomically: either all of them are applied or
+        the engine is left exactly as it was.
+
+        Sequence and constants-first rules are enforced per event.
+        By default the events are applied in place to one working copy
+        and invariants are validated once, at the end — for streams
+        whose intermediate states are valid by construction (e.g. the
+        generator's own output).  validate_each=True validates after
+        every event, so the error names the offending event and the
+        semantics match calling apply_event in a loop.
+
+        Returns (final_state, per-event TransitionResults).
+        """
+        saved = (self._last_sequence, self._constants_initialized)
+        state = self.state
+        results: List[TransitionResult] = []
+        try:
+            if validate_each:
+                for event in events:
+                    self._check_sequence(event)
+                    new_state, result = _transition_apply(state, event)
+                    delta = result.delta.to_event_delta()
+                    self._validate(state, new_state, event, delta)
+                    self._diagnostics.update(state, new_state, delta)
+                    state = new_state
+                    self._last_sequence = event.sequence
+                    self._record(event, state)
+                    results.append(result)
+            else:
+                state = state.fork()
+                self._diagnostics.invalidate()
+                for event in events:
+                    self._check_sequence(event)
+                    results.append(_transition_apply_in_place(state, event))
+                    self._last_sequence = event.sequence
+                    self._record(event, state)
+                validate_invariants(state)
+        except Exception:
+            if self._checkpoints is not None:
+                self._checkpoints.truncate(saved[0])
+            self._last_sequence, self._constants_initialized = saved
+            raise
+
+        self._state = state
+        self._undo.extend(zip(events, (r.inverse for r in results)))
+        return state, results
+
+    def replay(
+        self,
+        events: List[BaseEvent],
+        *,
+        trusted: bool = False,
+        checkpoint_interval: int = 0,
+    ) -> OrgState:
         """
         Event-sourced reconstruction: reset to a fresh initial state,
         then replay every event from scratch.
+
+        trusted=True is for streams that were already validated when
+        they were persisted. Events are applied in place to a single
+        working state; invariants run every *checkpoint_interval*
+        events (0 = end only) and once at the end. Sequence and
+        constants-first rules are still enforced. On any failure the
+        stream is replayed strictly, which raises the exact error for
+        the offending sequence.
         """
+        if trusted:
+            try:
+                return self._replay_trusted(events, checkpoint_interval)
+            except Exception:
+                pass  # fall through to strict replay for exact diagnostics
+
         self.initialize_state()
         for event in events:
             self.apply_event(event)
         return self.state
 
+    def restore_state(self, state: OrgState, sequence: int) -> OrgState:
+        """
+        Continue from *state*, the state after event *sequence* (e.g. a
+        restored snapshot), instead of replaying the events up to it.
+        The state is adopted as-is, so it must already be validated
+        (restore_snapshot / restore_snapshot_ref do that).
+
+        Undo starts empty.  Not available with checkpoints, which need
+        the whole timeline from sequence 0.
+        """
+        if self._checkpoints is not None:
+            raise RuntimeError(
+                "restore_state() is unavailable with checkpoints — "
+                "they need the full timeline; use replay()"
+            )
+        history = state.event_history
+        if self._history_mode == "log":
+            if not isinstance(history, LoggedHistory):
+                history = state.event_history = LoggedHistory(EventLog(history))
+            self._event_log = history.log
+        self._state = state
+        self._last_sequence = sequence
+        self._constants_initialized = sequence > 0
+        self._invariants.invalidate()
+        self._diagnostics.invalidate()
+        self._hash_cache = CanonicalHashCache()
+        self._undo.clear()
+        return state
+
+    def state_at(self, sequence: int) -> OrgState:
+        """
+        The state after event *sequence* (0 = initial state), rebuilt
+        from the nearest checkpoint by replaying at most K events.
+        Returns a private copy; the engine's own state is untouched.
+        """
+        if self._checkpoints is None:
+            raise RuntimeError(
+                "Checkpoints are disabled — construct "
+                "OrgEngine(checkpoint_every=K) to use state_at()"
+            )
+        if sequence == self._last_sequence:
+            return self.state.fork()
+        base, events = self._checkpoints.nearest(sequence)
+        state = base.fork()
+        for event in events:
+            _transition_apply_in_place(state, event)
+        return state
+
+    def fork(self) -> "OrgEngine":
+        """
+        Independent engine at the same state and sequence, sharing
+        every Role / DependencyEdge (and, in log mode, the event log)
+        with this one.  Only containers and index tables are copied, so
+        many branches can coexist without deep copies.
+
+        The fork keeps this engine's modes and undo_depth, with an
+        empty undo log (it cannot step back past the fork point).
+        Checkpoints are not carried over.
+        """
+        clone = OrgEngine.__new__(OrgEngine)
+        clone._state = self.state.fork()
+        clone._last_sequence = self._last_sequence
+        clone._constants_initialized = self._constants_initialized
+        clone._invariant_mode = self._invariant_mode
+        clone._invariants = self._invariants.fork(self._state, clone._state)
+        clone._history_mode = self._history_mode
+        clone._event_log = self._event_log
+        clone._hash_cache = self._hash_cache.copy()
+        clone._diagnostics_mode = self._diagnostics_mode
+        clone._diagnostics = self._diagnostics.fork(self._state, clone._state)
+        clone._checkpoints = None
+        clone._undo_depth = self._undo_depth
+        clone._undo = deque(maxlen=self._undo.maxlen)
+        return clone
+
+    def step_back(self) -> OrgState:
+        """
+        Undo the last applied event in O(delta): the engine returns to
+        exactly the state (and sequence) it had before that event.
+        """
+        if not self._undo:
+            raise self._undo_unavailable(1)
+        event, inverse = self._undo[-1]
+        prev = self.state
+        state = prev.fork()
+        _transition_revert_in_place(state, inverse)
+        delta = inverse_event_delta(prev, inverse)
+        if self._invariant_mode != "full":
+            self._invariants.check(prev, state, event, delta)
+        self._diagnostics.update(prev, state, delta)
+        self._undo.pop()
+        self._set_position(state, self._last_sequence - 1)
+        return state
+
+    def rewind_to(self, sequence: int) -> OrgState:
+        """
+        Undo events until the engine is at *sequence* (0 = initial
+        state).  Needs the last (current - sequence) inverse deltas,
+        i.e. undo_depth at least that large.
+        """
+        if not 0 <= sequence <= self._last_sequence:
+            raise ValueError(
+                f"Cannot rewind to {sequence}: current sequence is "
+                f"{self._last_sequence}"
+            )
+        steps = self._last_sequence - sequence
+        if steps > len(self._undo):
+            raise self._undo_unavailable(steps)
+        if steps == 1:
+            return self.step_back()
+        if steps:
+            state = self.state.fork()
+            for _ in range(steps):
+                _transition_revert_in_place(state, self._undo.pop()[1])
+            self._invariants.invalidate()
+            self._diagnostics.invalidate()
+            self._set_position(state, sequence)
+        return self.state
+
+    def state_hash(self) -> str:
+        """
+        canonical_hash of the current state, assembled from cached
+        per-role / per-edge fragments (only changed entities re-encode).
+        """
+        return self._hash_cache.hash(self.state)
+
     def get_diagnostics(self) -> dict:
         """Return diagnostic snapshot of the current state."""
-        return compute_diagnostics(self.state)
+        if self._diagnostics_mode == "full":
+            return compute_diagnostics(self.state)
+        diagnostics = self._diagnostics.diagnostics(self.state)
+        if self._diagnostics_mode == "cross_check":
+            full = compute_diagnostics(self.state)
+            if full != diagnostics:
+                raise RuntimeError(
+                    f"Diagnostics cross-check mismatch: full={full} "
+                    f"incremental={diagnostics}"
+                )
+        return diagnostics
+
+    # -- Internal -----------------------------------------------------------
+
+    def _record(self, event: BaseEvent, state: OrgState) -> None:
+        if self._checkpoints is not None:
+            self._checkpoints.record(event, state)
+
+    def _set_position(self, state: OrgState, sequence: int) -> None:
+        """Make *state* current at *sequence* after undoing events."""
+        self._state = state
+        self._last_sequence = sequence
+        self._constants_initialized = sequence > 0
+        if self._checkpoints is not None:
+            self._checkpoints.truncate(sequence)
+
+    def _undo_unavailable(self, steps: int) -> RuntimeError:
+        if self._undo_depth <= 0:
+            return RuntimeError(
+                "Undo is disabled — construct OrgEngine(undo_depth=N) "
+                "to use step_back() / rewind_to()"
+            )
+        return RuntimeError(
+            f"Cannot undo {steps} event(s): only {len(self._undo)} "
+            f"inverse delta(s) retained (undo_depth={self._undo_depth})"
+        )
+
+    def _check_sequence(self, event: BaseEvent) -> None:
+        """Enforce strict sequencing and the constants-first rule."""
+        # -- Sequence enforcement --
+        expected = self._last_sequence + 1
+        if event.sequence != expected:
+            raise ValueError(
+                f"Sequence violation: expected {expected}, "
+                f"got {event.sequence}"
+            )
+
+        # -- Constants-first enforcement --
+        if not self._constants_initialized:
+            if event.event_type != "initialize_constants":
+                raise ValueError(
+                    "First event MUST be initialize_constants, "
+                    f"got {event.event_type!r}"
+                )
+            self._constants_initialized = True
+        else:
+            if event.event_type == "initialize_constants":
+                raise ValueError(
+                    "initialize_constants can only be the first event"
+                )
+
+    def _validate(
+        self,
+        prev: OrgState,
+        new: OrgState,
+        event: BaseEvent,
+        delta: EventDelta,
+    ) -> None:
+        """Run the invariant checks selected by invariant_mode."""
+        if self._invariant_mode == "full":
+            validate_invariants(new)
+            return
+        if self._invariant_mode == "incremental":
+            self._invariants.check(prev, new, event, delta)
+            return
+
+        # cross_check: both checkers must agree on pass/fail, rule and detail
+        outcomes = []
+        for check in (
+            lambda: validate_invariants(new),
+            lambda: self._invariants.check(prev, new, event, delta),
+        ):
+            try:
+                check()
+                outcomes.append(None)
+            except InvariantViolationError as exc:
+                outcomes.append(exc)
+        full, incremental = outcomes
+        if (
+            (full is None) != (incremental is None)
+            or (full is not None and str(full) != str(incremental))
+        ):
+            raise RuntimeError(
+                f"Invariant cross-check mismatch on {event.event_type} "
+                f"seq={event.sequence}: full={full!s} incremental={incremental!s}"
+            )
+        if full is not None:
+            raise full
+
+    def _replay_trusted(
+        self, events: List[BaseEvent], checkpoint_interval: int,
+    ) -> OrgState:
+        """Single working state, invariants only at checkpoints and end."""
+        state = self.initialize_state()
+        self._invariants.invalidate()  # state is mutated in place below
+        self._diagnostics.invalidate()
+        for i, event in enumerate(events, 1):
+            self._check_sequence(event)
+            result = _transition_apply_in_place(state, event)
+            self._last_sequence = event.sequence
+            self._record(event, state)
+            self._undo.append((event, result.inverse))
+            if checkpoint_interval > 0 and i % checkpoint_interval == 0:
+                validate_invariants(state)
+        validate_invariants(state)
+        return state
@@ -0,0 +1,219 @@
+"""
+Organizational Kernel — Append-Only Event Log
+
+Keeps applied-event history out of the hot OrgState.  Entries live in
+an append-only EventLog; each state carries a SharedHistory view
+holding only (log, count), or in log mode a LoggedHistory that also
+keeps a rolling digest.  In log mode the engine owns one EventLog
+shared by every state version.
+
+Forking a state is O(1) for its history, and retained state versions
+no longer hold O(N) dicts each.  A history that diverges from the
+shared log (a branch appending a different event) continues on a new
+log layered over the shared prefix, also in O(1).  Both views are
+list-like (len, iter, indexing, append, equality) so
+len(state.event_history) and to_dict()["event_count"] keep working.
+
+Rolling digest:
+    digest_0 = GENESIS_DIGEST
+    digest_n = SHA-256(digest_{n-1} || canonical_event_bytes(event_n))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Iterator, List
+
+GENESIS_DIGEST: str = "0" * 64
+
+
+def canonical_event_bytes(entry: dict) -> bytes:
+    """
+    Canonical bytes of one history entry (BaseEvent.to_dict() shape).
+    Only event_type, sequence, timestamp and payload take part.
+    """
+    obj = {
+        "event_type": entry["event_type"],
+        "payload": entry["payload"],
+        "sequence": entry["sequence"],
+        "timestamp": entry["timestamp"],
+    }
+    return json.dumps(
+        obj, ensure_ascii=True, separators=(",", ":"), sort_keys=True,
+    ).encode("utf-8")
+
+
+def chain_digest(prev_digest: str, entry: dict) -> str:
+    """Next rolling digest after appending *entry*."""
+    return hashlib.sha256(
+        prev_digest.encode("ascii") + canonical_event_bytes(entry)
+    ).hexdigest()
+
+
+class EventLog:
+    """
+    Shared append-only list of history entries.
+
+    A log may sit on top of the first *base* entries of a *parent* log
+    (the parent is append-only, so that prefix never changes).
+    """
+
+    __slots__ = ("_entries", "_parent", "_base")
+
+    def __init__(
+        self,
+        entries: List[dict] | None = None,
+        parent: "EventLog | None" = None,
+        base: int = 0,
+    ) -> None:
+        self._entries: List[dict] = list(entries) if entries else []
+        self._parent = parent
+        self._base = base if parent is not None else 0
+
+    def __len__(self) -> int:
+        return self._base + len(self._entries)
+
+    def append(self, entry: dict) -> None:
+        self._entries.append(entry)
+
+    def entry(self, index: int) -> dict:
+        if index < self._base:
+            return self._parent.entry(index)
+        return self._entries[index - self._base]
+
+    def entries(self, start: int, stop: int) -> List[dict]:
+        base = self._base
+        if start >= base:
+            return self._entries[start - base:stop - base]
+        head = self._parent.entries(start, min(stop, base))
+        if stop <= base:
+            return head
+        return head + self._entries[:stop - base]
+
+
+class SharedHistory:
+    """
+    A state's view of an EventLog: its first *count* entries.
+
+    Forks share the log, so copying a history is O(1).  Appending when
+    the log already extends past *count* (another state version appended
+    first) reuses the existing entry if it is equal; otherwise this
+    history diverges onto a new log layered over its prefix, so the
+    shared log stays append-only.
+    """
+
+    __slots__ = ("_log", "_count")
+
+    def __init__(self, log: EventLog | None = None, count: int | None = None) -> None:
+        self._log = log if log is not None else EventLog()
+        self._count = len(self._log) if count is None else count
+
+    @property
+    def log(self) -> EventLog:
+        return self._log
+
+    # -- List protocol ------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._log.entries(0, self._count))
+
+    def __getitem__(self, index):
+        if isinstance(index, int):
+            position = index + self._count if index < 0 else index
+            if not 0 <= position < self._count:
+                raise IndexError("history index out of range")
+            return self._log.entry(position)
+        return self._log.entries(0, self._count)[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (SharedHistory, list)):
+            return len(other) == self._count and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SharedHistory(count={self._count})"
+
+    def append(self, entry: dict) -> None:
+        log = self._log
+        if len(log) == self._count:
+            log.append(entry)
+        elif log.entry(self._count) != entry:
+            self._log = EventLog(parent=log, base=self._count)
+            self._log.append(entry)
+        self._count += 1
+
+    def truncate(self, count: int) -> None:
+        """Drop entries past *count*; the shared log is never shortened."""
+        if not 0 <= count <= self._count:
+            raise ValueError(f"Cannot truncate history of {self._count} to {count}")
+        self._count = count
+
+    # -- Copying ------------------------------------------------------------
+
+    def fork(self) -> "SharedHistory":
+        """O(1) copy sharing the same log."""
+        return SharedHistory(self._log, self._count)
+
+    def __copy__(self) -> "SharedHistory":
+        return self.fork()
+
+    def __deepcopy__(self, memo: dict) -> "SharedHistory":
+        # entries are never mutated once logged, so sharing is safe
+        return self.fork()
+
+
+class LoggedHistory(SharedHistory):
+    """
+    A SharedHistory that also carries the rolling digest of its entries,
+    so two histories compare in O(1).
+    """
+
+    __slots__ = ("_digest",)
+
+    def __init__(
+        self,
+        log: EventLog | None = None,
+        count: int | None = None,
+        digest: str = GENESIS_DIGEST,
+    ) -> None:
+        super().__init__(log, count)
+        self._digest = digest
+        if count is None and self._count:
+            for entry in self._log.entries(0, self._count):
+                self._digest = chain_digest(self._digest, entry)
+
+    @property
+    def digest(self) -> str:
+        """Rolling digest over every entry in this history."""
+        return self._digest
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LoggedHistory):
+            return self._count == other._count and self._digest == other._digest
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"LoggedHistory(count={self._count}, digest={self._digest[:12]}…)"
+
+    def append(self, entry: dict) -> None:
+        super().append(entry)
+        self._digest = chain_digest(self._digest, entry)
+
+    def truncate(self, count: int, digest: str) -> None:
+        """
+        Drop entries past *count*; *digest* must be the rolling digest
+        of the first *count* entries (recorded when they were current).
+        The shared log itself is never shortened.
+        """
+        super().truncate(count)
+        self._digest = digest
+
+    # -- Copying ------------------------------------------------------------
+
+    def fork(self) -> "LoggedHistory":
+        """O(1) copy sharing the same log."""
+        return LoggedHistory(self._log, self._count, self._digest)
@@ -2,7 +2,7 @@
 Organizational Kernel — Event Definitions v1.1
 
 Events are **pure data**. They carry intent and payload only.
-They contain ZERO transition logic.
+They contain ZERO transition logic.  Slotted, with interned payload strings.
 
 v1.1: sequence + logical_time fields. InitializeConstantsEvent added.
 """
@@ -12,7 +12,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+from .domain_types import intern_str, intern_value, slotted
 
+
+@slotted
 @dataclass
 class BaseEvent:
     """Base for all organizational events — pure data container."""
@@ -24,6 +27,11 @@ class BaseEvent:
     event_uuid: str = ""
     payload: Dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        # role ids / tokens in payloads are shared with roles and edges
+        self.event_type = intern_str(self.event_type)
+        self.payload = intern_value(self.payload)
+
     def to_dict(self) -> dict:
         d = {
             "event_type": self.event_type,
@@ -37,6 +45,7 @@ class BaseEvent:
         return d
 
 
+@slotted
 @dataclass
 class InitializeConstantsEvent(BaseEvent):
     """Inject domain constants. MUST be the first event in any stream."""
@@ -47,6 +56,7 @@ class InitializeConstantsEvent(BaseEvent):
     #   shock_debt_base_multiplier, suppressed_differentiation_debt_increment
 
 
+@slotted
 @dataclass
 class AddRoleEvent(BaseEvent):
     """Request to add a new role to the organization."""
@@ -56,6 +66,7 @@ class AddRoleEvent(BaseEvent):
     #               produced_outputs, scale_stage
 
 
+@slotted
 @dataclass
 class RemoveRoleEvent(BaseEvent):
     """Request to remove an existing role."""
@@ -64,6 +75,7 @@ class RemoveRoleEvent(BaseEvent):
     # payload keys: role_id
 
 
+@slotted
 @dataclass
 class DifferentiateRoleEvent(BaseEvent):
     """
@@ -74,6 +86,7 @@ class DifferentiateRoleEvent(BaseEvent):
     # payload keys: role_id, new_roles (list of dicts with role data)
 
 
+@slotted
 @dataclass
 class CompressRolesEvent(BaseEvent):
     """
@@ -84,6 +97,7 @@ class CompressRolesEvent(BaseEvent):
     # payload keys: source_role_id, target_role_id, compressed_name, compressed_purpose
 
 
+@slotted
 @dataclass
 class ApplyConstraintChangeEvent(BaseEvent):
     """Request to adjust constraint vector values (int64 fixed-point deltas)."""
@@ -92,6 +106,7 @@ class ApplyConstraintChangeEvent(BaseEvent):
     # payload keys: capital_delta, talent_delta, time_delta, political_cost_delta
 
 
+@slotted
 @dataclass
 class InjectShockEvent(BaseEvent):
     """Request to inject an external shock targeting a role."""
@@ -100,6 +115,7 @@ class InjectShockEvent(BaseEvent):
     # payload keys: target_role_id, magnitude
 
 
+@slotted
 @dataclass
 class AddDependencyEvent(BaseEvent):
     """Request to add a directed dependency edge between two roles."""
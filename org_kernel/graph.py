@@ -9,7 +9,8 @@ from __future__ import annotations
 
 from typing import Dict, List, Set, Tuple
 
-from .domain_types import DependencyEdge, OrgState, SCALE, checked_mul
+from .cow import CowDict
+from .domain_types import DependencyEdge, EdgeStore, OrgState, SCALE, checked_mul
 
 
 # ---------------------------------------------------------------------------
@@ -54,11 +55,7 @@ def compute_role_structural_density(
     """
     if not state.dependencies:
         return 0
-    count = sum(
-        1
-        for d in state.dependencies
-        if d.from_role_id == role_id or d.to_role_id == role_id
-    )
+    count = state.dependencies.degree(role_id)
     total = len(state.dependencies)
     if total == 0:
         return 0
@@ -71,11 +68,8 @@ def compute_role_structural_density(
 
 def find_isolated_roles(state: OrgState) -> List[str]:
     """Return role IDs that have zero incoming AND zero outgoing edges."""
-    connected: Set[str] = set()
-    for edge in state.dependencies:
-        connected.add(edge.from_role_id)
-        connected.add(edge.to_role_id)
-    return sorted(rid for rid in state.roles if rid not in connected)
+    deps = state.dependencies
+    return sorted(rid for rid in state.roles if not deps.degree(rid))
 
 
 # ---------------------------------------------------------------------------
@@ -83,10 +77,14 @@ def find_isolated_roles(state: OrgState) -> List[str]:
 # ---------------------------------------------------------------------------
 
 def count_incoming(role_id: str, dependencies: List[DependencyEdge]) -> int:
+    if isinstance(dependencies, EdgeStore):
+        return dependencies.in_degree(role_id)
     return sum(1 for d in dependencies if d.to_role_id == role_id)
 
 
 def count_outgoing(role_id: str, dependencies: List[DependencyEdge]) -> int:
+    if isinstance(dependencies, EdgeStore):
+        return dependencies.out_degree(role_id)
     return sum(1 for d in dependencies if d.from_role_id == role_id)
 
 
@@ -106,6 +104,8 @@ def detect_critical_cycles(state: OrgState) -> List[List[str]]:
     for edge in state.dependencies:
         if edge.critical:
             critical_adj.setdefault(edge.from_role_id, []).append(edge.to_role_id)
+    for nbrs in critical_adj.values():
+        nbrs.sort()
 
     WHITE, GREY, BLACK = 0, 1, 2
     colour: Dict[str, int] = {rid: WHITE for rid in sorted(state.roles)}
@@ -119,7 +119,7 @@ def detect_critical_cycles(state: OrgState) -> List[List[str]]:
 
         while stack:
             node, idx = stack[-1]
-            neighbours = sorted(critical_adj.get(node, []))
+            neighbours = critical_adj.get(node, ())
             if idx < len(neighbours):
                 stack[-1] = (node, idx + 1)
                 nbr = neighbours[idx]
@@ -143,3 +143,80 @@ def detect_critical_cycles(state: OrgState) -> List[List[str]]:
             _dfs(rid)
 
     return cycles
+
+
+class CriticalGraphIndex:
+    """
+    Incrementally maintained critical subgraph: from_role -> {to_role: n}
+    where n counts parallel critical edges.
+
+    Adding a critical edge u -> v closes a cycle iff u == v or v already
+    reaches u, so the cycle check after an edge insertion is a single
+    reachability query instead of a whole-graph DFS.  Cycle *text* still
+    comes from detect_critical_cycles for a deterministic message.
+
+    copy() is O(1): the successor table is a CowDict, and a role's
+    successor counts are copied when that role's edges first change.
+    """
+
+    def __init__(self) -> None:
+        self._succ: CowDict = CowDict()  # from_role -> {to_role: n}
+        self._owned: Set[str] = set()    # successor dicts we may mutate
+
+    @classmethod
+    def from_dependencies(
+        cls, dependencies: List[DependencyEdge],
+    ) -> "CriticalGraphIndex":
+        index = cls()
+        for edge in dependencies:
+            if edge.critical:
+                index.add_edge(edge.from_role_id, edge.to_role_id)
+        return index
+
+    def copy(self) -> "CriticalGraphIndex":
+        clone = CriticalGraphIndex()
+        clone._succ = self._succ.fork()
+        # the original must no longer write into dicts it now shares
+        self._owned = set()
+        return clone
+
+    def add_edge(self, from_id: str, to_id: str) -> None:
+        nbrs = self._successors(from_id)
+        nbrs[to_id] = nbrs.get(to_id, 0) + 1
+
+    def remove_edge(self, from_id: str, to_id: str) -> None:
+        nbrs = self._successors(from_id)
+        n = nbrs[to_id] - 1
+        if n:
+            nbrs[to_id] = n
+        else:
+            del nbrs[to_id]
+            if not nbrs:
+                del self._succ[from_id]
+                self._owned.discard(from_id)
+
+    def reaches(self, src: str, dst: str) -> bool:
+        """True if a path of critical edges leads from *src* to *dst*."""
+        if src == dst:
+            return True
+        seen: Set[str] = {src}
+        stack: List[str] = [src]
+        while stack:
+            for nbr in self._succ.get(stack.pop(), ()):
+                if nbr == dst:
+                    return True
+                if nbr not in seen:
+                    seen.add(nbr)
+                    stack.append(nbr)
+        return False
+
+    def closes_cycle(self, from_id: str, to_id: str) -> bool:
+        """Would (or does) the critical edge from_id -> to_id lie on a cycle?"""
+        return self.reaches(to_id, from_id)
+
+    def _successors(self, from_id: str) -> Dict[str, int]:
+        nbrs = self._succ.get(from_id)
+        if nbrs is None or from_id not in self._owned:
+            nbrs = self._succ[from_id] = dict(nbrs or ())
+            self._owned.add(from_id)
+        return nbrs
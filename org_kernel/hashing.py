@@ -16,9 +16,9 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Tuple
 
-from .domain_types import OrgState
+from .domain_types import DependencyEdge, OrgState, Role
 
 
 def canonical_serialize(state: OrgState) -> bytes:
@@ -37,42 +37,144 @@ def canonical_hash(state: OrgState) -> str:
 
 def _build_canonical_dict(state: OrgState) -> Dict[str, Any]:
     """Build the canonical dict in strict field order."""
-    roles_list: List[Dict[str, Any]] = []
-    for rid in sorted(state.roles.keys()):
-        r = state.roles[rid]
-        roles_list.append({
-            "id": r.id,
-            "name": r.name,
-            "purpose": r.purpose,
-            "responsibilities": sorted(r.responsibilities),
-            "required_inputs": sorted(r.required_inputs),
-            "produced_outputs": sorted(r.produced_outputs),
-            "scale_stage": r.scale_stage,
-            "active": r.active,
-        })
-
-    deps_list: List[Dict[str, Any]] = []
-    for d in sorted(
-        state.dependencies,
-        key=lambda d: (d.from_role_id, d.to_role_id, d.dependency_type),
-    ):
-        deps_list.append({
-            "from_role_id": d.from_role_id,
-            "to_role_id": d.to_role_id,
-            "dependency_type": d.dependency_type,
-            "critical": d.critical,
-        })
+    roles_list: List[Dict[str, Any]] = [
+        _role_dict(state.roles[rid]) for rid in sorted(state.roles.keys())
+    ]
+    deps_list: List[Dict[str, Any]] = [
+        _dep_dict(d) for d in _sorted_deps(state.dependencies)
+    ]
 
     return {
         "kernel_version": 1,
         "roles": roles_list,
         "dependencies": deps_list,
-        "constraint_vector": {
-            "capital": state.constraint_vector.capital,
-            "talent": state.constraint_vector.talent,
-            "time": state.constraint_vector.time,
-            "political_cost": state.constraint_vector.political_cost,
-        },
+        "constraint_vector": _constraint_dict(state),
         "structural_debt": state.structural_debt,
         "scale_stage": state.scale_stage,
     }
+
+
+def _role_dict(r: Role) -> Dict[str, Any]:
+    return {
+        "id": r.id,
+        "name": r.name,
+        "purpose": r.purpose,
+        "responsibilities": sorted(r.responsibilities),
+        "required_inputs": sorted(r.required_inputs),
+        "produced_outputs": sorted(r.produced_outputs),
+        "scale_stage": r.scale_stage,
+        "active": r.active,
+    }
+
+
+def _dep_dict(d: DependencyEdge) -> Dict[str, Any]:
+    return {
+        "from_role_id": d.from_role_id,
+        "to_role_id": d.to_role_id,
+        "dependency_type": d.dependency_type,
+        "critical": d.critical,
+    }
+
+
+def _sorted_deps(dependencies: Iterable[DependencyEdge]) -> List[DependencyEdge]:
+    return sorted(
+        dependencies,
+        key=lambda d: (d.from_role_id, d.to_role_id, d.dependency_type),
+    )
+
+
+def _constraint_dict(state: OrgState) -> Dict[str, Any]:
+    return {
+        "capital": state.constraint_vector.capital,
+        "talent": state.constraint_vector.talent,
+        "time": state.constraint_vector.time,
+        "political_cost": state.constraint_vector.political_cost,
+    }
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=True, separators=(",", ":"), sort_keys=False).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Cached serialization
+# ---------------------------------------------------------------------------
+
+class CanonicalHashCache:
+    """
+    Assembles canonical_serialize output from cached per-role and
+    per-edge byte fragments.  Output is byte-identical to
+    canonical_serialize.
+
+    Fragments are keyed by entity identity, which relies on the
+    copy-on-write contract: transitions replace a Role/DependencyEdge
+    when it changes instead of mutating it.  The sorted dependency
+    section is additionally cached per EdgeStore.revision, so events
+    that do not touch edges skip edge work entirely.  Entries for
+    entities no longer in the state are dropped on the next call.
+    """
+
+    def __init__(self) -> None:
+        self._roles: Dict[int, Tuple[Role, bytes]] = {}
+        self._edges: Dict[int, Tuple[DependencyEdge, bytes]] = {}
+        self._deps_revision: object = None
+        self._deps_bytes: bytes = b""
+
+    def copy(self) -> "CanonicalHashCache":
+        """
+        Independent cache starting from the same fragments — O(1):
+        serialize() replaces the fragment tables instead of mutating
+        them, so both caches can share them.
+        """
+        clone = CanonicalHashCache()
+        clone._roles = self._roles
+        clone._edges = self._edges
+        clone._deps_revision = self._deps_revision
+        clone._deps_bytes = self._deps_bytes
+        return clone
+
+    def serialize(self, state: OrgState) -> bytes:
+        roles = state.roles
+        self._roles, role_parts = _fragments(
+            self._roles, (roles[rid] for rid in sorted(roles)), _role_dict,
+        )
+
+        deps = state.dependencies
+        revision = getattr(deps, "revision", None)
+        if revision is None or revision is not self._deps_revision:
+            self._edges, dep_parts = _fragments(
+                self._edges, _sorted_deps(deps), _dep_dict,
+            )
+            self._deps_bytes = b",".join(dep_parts)
+            self._deps_revision = revision
+
+        return b"".join((
+            b'{"kernel_version":1,"roles":[',
+            b",".join(role_parts),
+            b'],"dependencies":[',
+            self._deps_bytes,
+            b'],"constraint_vector":',
+            _dumps(_constraint_dict(state)),
+            b',"structural_debt":',
+            _dumps(state.structural_debt),
+            b',"scale_stage":',
+            _dumps(state.scale_stage),
+            b"}",
+        ))
+
+    def hash(self, state: OrgState) -> str:
+        """Same value as canonical_hash(state)."""
+        return hashlib.sha256(self.serialize(state)).hexdigest()
+
+
+def _fragments(cache: Dict[int, tuple], entities: Iterable, to_dict) -> tuple:
+    """Look up (or encode) each entity's bytes; return (new cache, parts)."""
+    fresh: Dict[int, tuple] = {}
+    parts: List[bytes] = []
+    for entity in entities:
+        hit = cache.get(id(entity))
+        if hit is None or hit[0] is not entity:
+            hit = (entity, _dumps(to_dict(entity)))
+        fresh[id(entity)] = hit
+        parts.append(hit[1])
+    return fresh, parts
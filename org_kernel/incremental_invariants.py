@@ -0,0 +1,259 @@
+"""
+Organizational Kernel — Incremental Invariant Checks
+
+Maintains the indexes the invariant checks need and updates them from
+each event's delta, so per-event validation is O(delta) instead of
+O(state):
+
+  - consumer / producer counts per token       (INV-2)
+  - roles with empty responsibilities          (INV-5)
+  - active-role counter                        (INV-4)
+  - dependency endpoint refcounts              (INV-1)
+  - role ids failing ROLE_ID_PATTERN           (INV-7)
+  - critical subgraph (graph.CriticalGraphIndex) (INV-6)
+
+INV-3 holds by construction (roles is a dict).  INV-6 is only checked
+when the delta adds a critical edge u -> v (removing roles or edges
+cannot close a cycle), as a single "does v reach u" query.
+
+When an index reports a violation, the full checker in invariants.py
+is run on the new state so the raised InvariantViolationError carries
+exactly the rule and detail the full checker would produce.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .cow import CowDict
+from .delta import EventDelta, compute_event_delta
+from .domain_types import OrgState, Role, ROLE_ID_PATTERN
+from .graph import CriticalGraphIndex, detect_critical_cycles
+from .events import BaseEvent
+from .invariants import validate_invariants
+
+
+class IncrementalInvariantChecker:
+    """
+    Index-backed invariant validation for one engine.
+
+    The checker remembers which state object its indexes describe (and
+    its role / dependency counts, to catch direct mutation of
+    engine.state outside of events).  If check() is handed a different
+    *prev* state, or invalidate() was called after an in-place
+    mutation, it rebuilds from scratch first.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._indexed: Optional[OrgState] = None
+        self._indexed_sizes: Tuple[int, int] = (0, 0)
+        self._cycles_checked: bool = False
+        self._consumers: CowDict = CowDict()      # token -> count
+        self._producers: CowDict = CowDict()      # token -> count
+        self._endpoint_refs: CowDict = CowDict()  # role id -> refcount
+        self._critical = CriticalGraphIndex()
+        self._empty: Set[str] = set()
+        self._bad_ids: Set[str] = set()
+        self._orphaned: Set[str] = set()
+        self._dangling: Set[str] = set()
+        self._role_count: int = 0
+        self._active_count: int = 0
+
+    # -- Public API ---------------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Forget the indexed state; the next check() rebuilds."""
+        self._indexed = None
+
+    def fork(self, source: OrgState, target: OrgState) -> "IncrementalInvariantChecker":
+        """
+        Independent checker for *target*, an equal fork of *source*
+        (engine forks).  If these indexes do not describe *source*, the
+        clone starts invalidated.
+        """
+        clone = IncrementalInvariantChecker()
+        if self._indexed is not source or self._indexed_sizes != _sizes(source):
+            return clone
+        clone._indexed = target
+        clone._indexed_sizes = self._indexed_sizes
+        clone._cycles_checked = self._cycles_checked
+        clone._consumers = self._consumers.fork()
+        clone._producers = self._producers.fork()
+        clone._endpoint_refs = self._endpoint_refs.fork()
+        clone._critical = self._critical.copy()
+        # violation sets: empty whenever the indexed state is valid
+        clone._empty = set(self._empty)
+        clone._bad_ids = set(self._bad_ids)
+        clone._orphaned = set(self._orphaned)
+        clone._dangling = set(self._dangling)
+        clone._role_count = self._role_count
+        clone._active_count = self._active_count
+        return clone
+
+    def rebuild(self, state: OrgState) -> None:
+        """Index *state* from scratch — O(state)."""
+        self._reset()
+        for role in state.roles.values():
+            self._add_role(role)
+        for dep in state.dependencies:
+            self._add_ref(dep.from_role_id)
+            self._add_ref(dep.to_role_id)
+        self._critical = CriticalGraphIndex.from_dependencies(state.dependencies)
+        for token in set(self._producers) | set(self._consumers):
+            self._refresh_token(token)
+        for rid in self._endpoint_refs:
+            self._refresh_endpoint(rid, state)
+        self._mark_indexed(state)
+        self._cycles_checked = False  # state was not validated through us
+
+    def check(
+        self,
+        prev: OrgState,
+        new: OrgState,
+        event: BaseEvent,
+        delta: Optional[EventDelta] = None,
+    ) -> None:
+        """
+        Validate *new*, the result of applying *event* to *prev*.
+        *delta* may be passed when the caller has already computed it.
+
+        On success the indexes describe *new*; on failure they are
+        rolled back to *prev* and InvariantViolationError is raised.
+        """
+        if self._indexed is not prev or self._indexed_sizes != _sizes(prev):
+            self.rebuild(prev)
+
+        if delta is None:
+            delta = compute_event_delta(prev, new, event)
+        self._apply(prev, new, delta)
+
+        try:
+            if self._has_violation() or self._closes_cycle(new, delta):
+                validate_invariants(new)
+                raise RuntimeError(
+                    "Incremental invariant index reported a violation "
+                    "the full checker did not find"
+                )
+        except Exception:
+            self._apply(new, prev, delta.reversed())
+            raise
+
+        self._mark_indexed(new)
+        self._cycles_checked = True
+
+    # -- Index maintenance --------------------------------------------------
+
+    def _mark_indexed(self, state: OrgState) -> None:
+        self._indexed = state
+        self._indexed_sizes = _sizes(state)
+
+    def _closes_cycle(self, new: OrgState, delta: EventDelta) -> bool:
+        if not self._cycles_checked:
+            # indexes were rebuilt from a state we never validated
+            return bool(detect_critical_cycles(new))
+        return any(
+            self._critical.closes_cycle(key[0], key[1])
+            for key in delta.edges_added
+            if key[3]
+        )
+
+    def _has_violation(self) -> bool:
+        return bool(
+            self._bad_ids
+            or self._dangling
+            or self._orphaned
+            or (self._role_count and not self._active_count)
+            or self._empty
+        )
+
+    def _apply(self, before: OrgState, after: OrgState, delta: EventDelta) -> None:
+        tokens: Set[str] = set()
+        endpoints: Set[str] = set(delta.role_ids)
+
+        for rid in delta.role_ids:
+            old = before.roles.get(rid)
+            new = after.roles.get(rid)
+            if old is new:
+                continue
+            if old is not None:
+                self._remove_role(old)
+                tokens.update(old.required_inputs, old.produced_outputs)
+            if new is not None:
+                self._add_role(new)
+                tokens.update(new.required_inputs, new.produced_outputs)
+
+        for key in delta.edges_removed:
+            self._remove_ref(key[0])
+            self._remove_ref(key[1])
+            if key[3]:
+                self._critical.remove_edge(key[0], key[1])
+            endpoints.update(key[:2])
+        for key in delta.edges_added:
+            self._add_ref(key[0])
+            self._add_ref(key[1])
+            if key[3]:
+                self._critical.add_edge(key[0], key[1])
+            endpoints.update(key[:2])
+
+        for token in tokens:
+            self._refresh_token(token)
+        for rid in endpoints:
+            self._refresh_endpoint(rid, after)
+
+    def _add_role(self, role: Role) -> None:
+        self._role_count += 1
+        if role.active:
+            self._active_count += 1
+        if not role.responsibilities:
+            self._empty.add(role.id)
+        if not ROLE_ID_PATTERN.match(role.id):
+            self._bad_ids.add(role.id)
+        _bump(self._consumers, role.required_inputs, 1)
+        _bump(self._producers, role.produced_outputs, 1)
+
+    def _remove_role(self, role: Role) -> None:
+        self._role_count -= 1
+        if role.active:
+            self._active_count -= 1
+        self._empty.discard(role.id)
+        self._bad_ids.discard(role.id)
+        _bump(self._consumers, role.required_inputs, -1)
+        _bump(self._producers, role.produced_outputs, -1)
+
+    def _add_ref(self, rid: str) -> None:
+        self._endpoint_refs[rid] = self._endpoint_refs.get(rid, 0) + 1
+
+    def _remove_ref(self, rid: str) -> None:
+        n = self._endpoint_refs[rid] - 1
+        if n:
+            self._endpoint_refs[rid] = n
+        else:
+            del self._endpoint_refs[rid]
+
+    def _refresh_token(self, token: str) -> None:
+        if self._producers.get(token) and not self._consumers.get(token):
+            self._orphaned.add(token)
+        else:
+            self._orphaned.discard(token)
+
+    def _refresh_endpoint(self, rid: str, state: OrgState) -> None:
+        if rid in self._endpoint_refs and rid not in state.roles:
+            self._dangling.add(rid)
+        else:
+            self._dangling.discard(rid)
+
+
+def _sizes(state: OrgState) -> Tuple[int, int]:
+    return (len(state.roles), len(state.dependencies))
+
+
+def _bump(counts: Dict[str, int], tokens: Iterable[str], step: int) -> None:
+    for token in tokens:
+        n = counts.get(token, 0) + step
+        if n:
+            counts[token] = n
+        else:
+            del counts[token]
@@ -0,0 +1,146 @@
+"""
+Organizational Kernel — What-If Scenario Trees
+
+Applies alternative event suffixes to a shared prefix.  The prefix is
+applied once; every branch runs on OrgEngine.fork() of its parent, so
+branches share all unchanged roles, edges and history, and the work
+per branch is proportional to its own suffix.
+
+    tree = ScenarioTree.from_prefix(events)
+    tree.branch("shock_ops", [InjectShockEvent(payload={...})])
+    tree.branch("merge", [CompressRolesEvent(payload={...})])
+    tree.branch("merge_then_shock", [...], parent="merge")
+    outcomes = tree.run()   # {name: BranchOutcome}
+
+Suffix events are renumbered to follow their parent's last sequence
+(the caller's event objects are not modified).  A rejected suffix is
+reported in BranchOutcome.error rather than raised, and its children
+are reported as not run.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .engine import OrgEngine
+from .events import BaseEvent
+
+
+ROOT = ""  # name of the prefix node
+
+
+@dataclass(frozen=True)
+class BranchOutcome:
+    """Result of one branch: its final state summary, or why it failed."""
+
+    name: str
+    parent: str
+    sequence: int
+    state_hash: str = ""
+    structural_debt: int = 0
+    diagnostics: Optional[dict] = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+class ScenarioTree:
+    """
+    A prefix engine plus named branches, each an event suffix applied
+    to the prefix or to another branch.
+    """
+
+    def __init__(self, engine: OrgEngine) -> None:
+        self._root = engine
+        self._branches: Dict[str, Tuple[str, List[BaseEvent]]] = {}
+
+    @classmethod
+    def from_prefix(cls, events: List[BaseEvent], **engine_kwargs) -> "ScenarioTree":
+        """Apply *events* once (atomically) to a fresh engine."""
+        engine = OrgEngine(**engine_kwargs)
+        engine.initialize_state()
+        engine.apply_batch(events, validate_each=True)
+        return cls(engine)
+
+    @property
+    def root(self) -> OrgEngine:
+        return self._root
+
+    def branch(
+        self,
+        name: str,
+        events: List[BaseEvent],
+        parent: str = ROOT,
+    ) -> str:
+        """Register branch *name*: *events* applied after *parent*."""
+        if not name:
+            raise ValueError("Branch name must be non-empty")
+        if name in self._branches:
+            raise ValueError(f"Duplicate branch {name!r}")
+        if parent != ROOT and parent not in self._branches:
+            raise KeyError(f"Unknown parent branch {parent!r}")
+        self._branches[name] = (parent, list(events))
+        return name
+
+    def run(self) -> Dict[str, BranchOutcome]:
+        """
+        Run every branch (parents before children, in registration
+        order) and return outcomes by name.  Engines of leaf branches
+        are released as soon as their outcome is recorded.
+        """
+        children: Dict[str, int] = {}
+        for parent, _ in self._branches.values():
+            children[parent] = children.get(parent, 0) + 1
+
+        engines: Dict[str, OrgEngine] = {ROOT: self._root}
+        outcomes: Dict[str, BranchOutcome] = {}
+        for name, (parent, events) in self._branches.items():
+            base = engines.get(parent)
+            if base is None:
+                outcomes[name] = BranchOutcome(
+                    name=name, parent=parent, sequence=0,
+                    error=f"parent branch {parent!r} failed",
+                )
+            else:
+                engine = base.fork()
+                outcome = _run_branch(name, parent, engine, events)
+                outcomes[name] = outcome
+                if outcome.ok and children.get(name):
+                    engines[name] = engine
+            # release the parent once its last child has run
+            children[parent] -= 1
+            if parent != ROOT and not children[parent]:
+                engines.pop(parent, None)
+        return outcomes
+
+
+def _run_branch(
+    name: str, parent: str, engine: OrgEngine, events: List[BaseEvent],
+) -> BranchOutcome:
+    first = engine.last_sequence + 1
+    suffix = [
+        dataclasses.replace(event, sequence=first + i)
+        for i, event in enumerate(events)
+    ]
+    try:
+        state, _ = engine.apply_batch(suffix, validate_each=True)
+    except Exception as exc:
+        return BranchOutcome(
+            name=name, parent=parent, sequence=first - 1,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return BranchOutcome(
+        name=name,
+        parent=parent,
+        sequence=first - 1 + len(suffix),
+        state_hash=engine.state_hash(),
+        structural_debt=state.structural_debt,
+        diagnostics=engine.get_diagnostics(),
+    )
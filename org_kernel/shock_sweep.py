@@ -0,0 +1,238 @@
+"""
+Organizational Kernel — Shock Sensitivity Sweep
+
+Evaluates a hypothetical inject_shock of one magnitude against every
+active role (or a given subset) without touching kernel state, and
+ranks the roles by the debt the kernel would add.
+
+For target t with local density d(t) = degree(t) * SCALE // |E|:
+
+    primary(t)   = max(m * (shock_debt_base_multiplier + d(t)), 1)
+    secondary(t) = sum over distinct existing neighbours j of
+                   max(m * d(j), 1)
+
+which is exactly _apply_inject_shock.  The sweep builds one
+ColumnarGraph and evaluates every target at once: weights per role,
+then a grouped sum over the (target, neighbour) pairs of the CSR
+adjacency.  NumPy int64 is used when it is installed and the magnitude
+bound proves no intermediate can exceed int64; otherwise the same
+formulation runs on Python ints through checked_add / checked_mul, so
+an overflow raises OverflowError just as the kernel would.
+
+    impacts = sweep_inject_shock(state, magnitude=5)
+    impacts[0].role_id, impacts[0].total_debt
+
+workers > 1 spreads the grouped sum over a process pool for large orgs
+(at least PARALLEL_MIN_ROLES targets); results are identical.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .columnar_graph import ColumnarGraph
+from .domain_types import OrgState, SCALE, checked_add, checked_mul
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+
+PARALLEL_MIN_ROLES = 2000
+
+_INT64_MAX: int = 2**63 - 1
+
+
+@dataclass(frozen=True)
+class ShockImpact:
+    """What inject_shock(role_id, magnitude) would do to the state."""
+
+    role_id: str
+    primary_debt: int
+    secondary_debt: int
+    target_density: int
+    connected_roles: int      # roles receiving secondary debt
+    deactivated: bool         # magnitude > shock_deactivation_threshold
+    critical_edges: int       # critical edges incident to the role
+    resulting_debt: int       # state.structural_debt after the shock
+
+    @property
+    def total_debt(self) -> int:
+        return self.primary_debt + self.secondary_debt
+
+    @property
+    def deactivation_risk(self) -> int:
+        """Critical edges that would lose an active endpoint (0 if kept)."""
+        return self.critical_edges if self.deactivated else 0
+
+    def to_dict(self) -> dict:
+        d = dataclasses.asdict(self)
+        d["total_debt"] = self.total_debt
+        return d
+
+
+def sweep_inject_shock(
+    state: OrgState,
+    magnitude: int,
+    role_ids: Optional[Iterable[str]] = None,
+    *,
+    workers: int = 0,
+    use_numpy: Optional[bool] = None,
+    graph: Optional[ColumnarGraph] = None,
+) -> List[ShockImpact]:
+    """
+    Impact of inject_shock(magnitude) on each role in *role_ids*
+    (default: every active role), ranked by total debt, then
+    deactivation risk, then role id.  *state* is only read.
+
+    Pass *graph* to reuse a ColumnarGraph already built for *state*.
+    """
+    if graph is None:
+        graph = ColumnarGraph.from_state(state, use_numpy=use_numpy)
+    if role_ids is None:
+        targets = [rid for rid in graph.role_ids[:graph.n_roles]
+                   if state.roles[rid].active]
+    else:
+        targets = sorted(set(role_ids))
+        for rid in targets:
+            if rid not in state.roles:
+                raise KeyError(f"Role {rid!r} does not exist")
+
+    c = state.constants
+    n_roles = graph.n_roles
+    degrees = graph.degrees()
+    n_edges = graph.n_edges
+    if n_edges:
+        checked_mul(max(degrees), SCALE)  # same OverflowError as graph.py
+        density = [deg * SCALE // n_edges for deg in degrees[:n_roles]]
+    else:
+        density = [0] * n_roles
+    weights = [max(checked_mul(magnitude, d), 1) for d in density]
+
+    bound = (
+        abs(magnitude) * (abs(c.shock_debt_base_multiplier) + SCALE)
+        * (n_roles + 1) + abs(state.structural_debt)
+    )
+    vectorized = graph.uses_numpy and bound <= _INT64_MAX
+
+    index = [graph.index[rid] for rid in targets]
+    chunks = _chunks(index, workers)
+    args = [
+        _chunk_args(graph, part, weights, vectorized) for part in chunks
+    ]
+    if len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_secondary_chunk, args))
+    else:
+        parts = [_secondary_chunk(a) for a in args]
+    secondary = [s for part in parts for s in part[0]]
+    connected = [k for part in parts for k in part[1]]
+
+    critical = _critical_counts(graph)
+    deactivated = magnitude > c.shock_deactivation_threshold
+    impacts: List[ShockImpact] = []
+    for k, (rid, i) in enumerate(zip(targets, index)):
+        primary = max(
+            checked_mul(
+                magnitude,
+                checked_add(c.shock_debt_base_multiplier, density[i]),
+            ),
+            1,
+        )
+        after = checked_add(
+            checked_add(state.structural_debt, primary), secondary[k],
+        )
+        impacts.append(ShockImpact(
+            role_id=rid,
+            primary_debt=primary,
+            secondary_debt=secondary[k],
+            target_density=density[i],
+            connected_roles=connected[k],
+            deactivated=deactivated,
+            critical_edges=critical[i],
+            resulting_debt=after,
+        ))
+    impacts.sort(key=lambda x: (-x.total_debt, -x.deactivation_risk, x.role_id))
+    return impacts
+
+
+# ---------------------------------------------------------------------------
+# Internal
+# ---------------------------------------------------------------------------
+
+def _chunks(index: List[int], workers: int) -> List[List[int]]:
+    if workers <= 1 or len(index) < PARALLEL_MIN_ROLES:
+        return [index]
+    size = -(-len(index) // workers)
+    return [index[i:i + size] for i in range(0, len(index), size)]
+
+
+def _chunk_args(
+    graph: ColumnarGraph, targets: List[int], weights: List[int],
+    vectorized: bool,
+) -> Tuple:
+    """Neighbour lists of *targets* only, so each worker gets O(chunk)."""
+    out_p, out_i = graph.out_indptr, graph.out_indices
+    in_p, in_i = graph.in_indptr, graph.in_indices
+    if vectorized:
+        t = np.asarray(targets, dtype=np.int64)
+        owner, nbr = [], []
+        for ptr, idx in ((out_p, out_i), (in_p, in_i)):
+            counts = ptr[t + 1] - ptr[t]
+            starts = np.repeat(ptr[t] - np.cumsum(counts) + counts, counts)
+            owner.append(np.repeat(np.arange(len(t)), counts))
+            nbr.append(idx[starts + np.arange(int(counts.sum()))])
+        return (
+            True, len(targets), np.concatenate(owner), np.concatenate(nbr),
+            graph.n_roles, np.asarray(weights, dtype=np.int64),
+        )
+    neighbours = [
+        list(out_i[out_p[i]:out_p[i + 1]]) + list(in_i[in_p[i]:in_p[i + 1]])
+        for i in targets
+    ]
+    return (False, len(targets), neighbours, None, graph.n_roles, weights)
+
+
+def _secondary_chunk(args: Tuple) -> Tuple[List[int], List[int]]:
+    """(secondary debt, connected role count) per target of one chunk."""
+    vectorized, n, owner, nbr, n_roles, weights = args
+    if vectorized:
+        keep = nbr < n_roles
+        pairs = np.unique(owner[keep] * n_roles + nbr[keep])
+        owner, nbr = np.divmod(pairs, n_roles)
+        secondary = np.zeros(n, dtype=np.int64)
+        np.add.at(secondary, owner, weights[nbr])
+        return secondary.tolist(), np.bincount(owner, minlength=n).tolist()
+    secondary, connected = [], []
+    for row in owner:
+        total = 0
+        hit = {j for j in row if j < n_roles}
+        for j in hit:
+            total = checked_add(total, weights[j])
+        secondary.append(total)
+        connected.append(len(hit))
+    return secondary, connected
+
+
+def _critical_counts(graph: ColumnarGraph) -> Sequence[int]:
+    """Critical edges incident to each index (a self-loop counts once)."""
+    n = len(graph.role_ids)
+    if graph.uses_numpy:
+        crit = graph.critical
+        src, dst = graph.src[crit], graph.dst[crit]
+        counts = (
+            np.bincount(src, minlength=n) + np.bincount(dst, minlength=n)
+            - np.bincount(src[src == dst], minlength=n)
+        )
+        return counts.tolist()
+    counts = [0] * n
+    for s, d, crit in zip(graph.src, graph.dst, graph.critical):
+        if crit:
+            counts[s] += 1
+            if d != s:
+                counts[d] += 1
+    return counts
@@ -17,9 +17,12 @@ Rules:
 from __future__ import annotations
 
 import hashlib
+import codecs
 import json
+import mmap
 import pathlib
-from typing import Any, Dict, List
+import re
+from typing import Any, Dict, List, Union
 
 from .domain_types import (
     ConstraintVector,
@@ -85,7 +88,9 @@ def encode_snapshot(state: OrgState) -> str:
         raise SerializationError(f"Failed to encode snapshot: {exc}") from exc
 
 
-def _build_snapshot_dict(state: OrgState) -> Dict[str, Any]:
+def _build_snapshot_dict(
+    state: OrgState, include_history: bool = True,
+) -> Dict[str, Any]:
     """Build the canonical dict for snapshot serialization."""
     roles_dict: Dict[str, Any] = {}
     for rid in sorted(state.roles.keys()):
@@ -115,7 +120,7 @@ def _build_snapshot_dict(state: OrgState) -> Dict[str, Any]:
             "to_role_id": d.to_role_id,
         })
 
-    return {
+    obj = {
         "constants": {
             "compression_max_combined_responsibilities":
                 state.constants.compression_max_combined_responsibilities,
@@ -137,11 +142,13 @@ def _build_snapshot_dict(state: OrgState) -> Dict[str, Any]:
             "time": state.constraint_vector.time,
         },
         "dependencies": deps_list,
-        "event_history": list(state.event_history),
         "roles": roles_dict,
         "scale_stage": state.scale_stage,
         "structural_debt": state.structural_debt,
     }
+    if include_history:
+        obj["event_history"] = list(state.event_history)
+    return obj
 
 
 # ══════════════════════════════════════════════════════════════
@@ -197,7 +204,11 @@ def decode_snapshot(json_str: str) -> OrgState:
 
     # Reject floats anywhere in the parsed tree
     _assert_no_floats(raw, "$")
+    return _state_from_dict(raw)
 
+
+def _state_from_dict(raw: dict) -> OrgState:
+    """decode_snapshot's field validation and construction."""
     # Validate top-level fields
     _check_fields(raw, _SNAPSHOT_FIELDS, "snapshot")
 
@@ -326,6 +337,335 @@ def decode_snapshot(json_str: str) -> OrgState:
     )
 
 
+# ══════════════════════════════════════════════════════════════
+# Streaming Decoder
+# ══════════════════════════════════════════════════════════════
+#
+# decode_snapshot parses the whole document into a dict tree, walks
+# it again for floats and only then builds Roles and edges.  The
+# streaming decoder scans the top-level object itself and decodes one
+# role / dependency / history entry at a time, building domain objects
+# as it goes, so no second tree exists; floats are rejected by the
+# parser hooks the moment they are read.  Validation is the same as
+# decode_snapshot's.  A buffer is decoded from UTF-8 a chunk at a time
+# into a sliding text window, so the whole file never exists as one
+# str.  When the document is malformed or fails validation the input
+# is handed to decode_snapshot, so errors carry exactly the reference
+# message (e.g. the full path of an offending float).
+
+class _FloatFound(Exception):
+    """Internal: the parser met a float / NaN / Infinity literal."""
+
+
+def _reject_float(_literal: str) -> Any:
+    raise _FloatFound
+
+
+_STRICT_JSON = json.JSONDecoder(
+    parse_float=_reject_float, parse_constant=_reject_float,
+)
+_WS = re.compile(r"[ \t\n\r]*")
+_CHUNK = 1 << 20  # bytes decoded per refill / chars per history batch
+
+
+def decode_snapshot_stream(source: Union[str, bytes, bytearray, memoryview, mmap.mmap]) -> OrgState:
+    """
+    Single-pass strict deserialization of canonical JSON to OrgState.
+
+    *source* is the JSON text or a UTF-8 buffer (bytes, memoryview,
+    mmap).  Same acceptance rules and the same DeserializationError
+    messages as decode_snapshot.
+    """
+    view = None if isinstance(source, str) else memoryview(source)
+    try:
+        return _StreamDecoder(source if view is None else view).decode()
+    except (ValueError, _FloatFound, DeserializationError):
+        # Rare path (bad JSON, bad UTF-8, a float, a failed check): let
+        # the reference decoder produce its exact error (or accept, e.g.
+        # an invalid role entry shadowed by a later duplicate key, which
+        # json.loads keeps as the last value).
+        pass
+    finally:
+        if view is not None:
+            view.release()
+    try:
+        text = source if isinstance(source, str) else str(source, "utf-8")
+    except UnicodeDecodeError as exc:
+        raise DeserializationError(f"Invalid UTF-8 in snapshot: {exc}") from exc
+    return decode_snapshot(text)
+
+
+class _StreamDecoder:
+    """
+    Recursive-descent scanner over *source*: a str, or a memoryview of
+    UTF-8 bytes that is decoded into ``text`` a chunk at a time.  ``text``
+    only holds the unconsumed tail of what has been decoded so far.
+    """
+
+    __slots__ = ("text", "pos", "_view", "_offset", "_utf8")
+
+    def __init__(self, source: Union[str, memoryview]) -> None:
+        if isinstance(source, str):
+            self.text = source
+            self._view = None
+        else:
+            self.text = ""
+            self._view = source
+            self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.pos = 0
+        self._offset = 0
+
+    def decode(self) -> OrgState:
+        fields: Dict[str, Any] = {}
+        self.expect("{")
+        if not self.peek("}"):
+            while True:
+                key = self.key()
+                if key == "roles" and self.at("{"):
+                    fields[key] = self.roles()
+                elif key == "dependencies" and self.at("["):
+                    fields[key] = self.array(self.dependency)
+                elif key == "event_history" and self.at("["):
+                    fields[key] = self.history()
+                else:
+                    fields[key] = self.value()
+                if not self.peek(","):
+                    break
+            self.expect("}")
+        self.skip()
+        if self.pos != len(self.text):
+            raise ValueError("Extra data")
+
+        _check_fields(fields, _SNAPSHOT_FIELDS, "snapshot")
+        roles = fields["roles"]
+        if not isinstance(roles, _Built):
+            raise DeserializationError("'roles' must be a JSON object")
+        dependencies = fields["dependencies"]
+        if not isinstance(dependencies, _Built):
+            raise DeserializationError("'dependencies' must be a JSON array")
+        event_history = fields["event_history"]
+        if not isinstance(event_history, _Built):
+            raise DeserializationError("'event_history' must be a JSON array")
+
+        raw_cv = fields["constraint_vector"]
+        if not isinstance(raw_cv, dict):
+            raise DeserializationError(
+                "'constraint_vector' must be a JSON object"
+            )
+        _check_fields(raw_cv, _CONSTRAINT_FIELDS, "constraint_vector")
+        _validate_int64(
+            raw_cv, ["capital", "political_cost", "talent", "time"],
+        )
+        raw_const = fields["constants"]
+        if not isinstance(raw_const, dict):
+            raise DeserializationError("'constants' must be a JSON object")
+        _check_fields(raw_const, _CONSTANTS_FIELDS, "constants")
+        _validate_int64(raw_const, list(_CONSTANTS_FIELDS))
+
+        scale_stage = fields["scale_stage"]
+        if not isinstance(scale_stage, str):
+            raise DeserializationError(
+                f"'scale_stage' must be string, got {type(scale_stage).__name__}"
+            )
+        structural_debt = fields["structural_debt"]
+        if not isinstance(structural_debt, int):
+            raise DeserializationError(
+                f"'structural_debt' must be int, got {type(structural_debt).__name__}"
+            )
+        _assert_int64_range(structural_debt, "structural_debt")
+
+        return OrgState(
+            roles=dict(roles.items),
+            dependencies=dependencies.items,
+            constraint_vector=ConstraintVector(
+                capital=raw_cv["capital"],
+                talent=raw_cv["talent"],
+                time=raw_cv["time"],
+                political_cost=raw_cv["political_cost"],
+            ),
+            constants=DomainConstants(**{k: raw_const[k] for k in _CONSTANTS_FIELDS}),
+            scale_stage=scale_stage,
+            structural_debt=structural_debt,
+            event_history=event_history.items,
+        )
+
+    # -- Sections -----------------------------------------------------------
+
+    def roles(self) -> "_Built":
+        roles: Dict[str, Role] = {}
+        self.expect("{")
+        if not self.peek("}"):
+            while True:
+                rid = self.key()
+                roles[rid] = _decode_role(rid, self.value())
+                if not self.peek(","):
+                    break
+            self.expect("}")
+        return _Built(roles)
+
+    @staticmethod
+    def dependency(ddata: Any, i: int) -> DependencyEdge:
+        if not isinstance(ddata, dict):
+            raise DeserializationError(f"Dependency [{i}] must be a JSON object")
+        _check_fields(ddata, _DEP_FIELDS, f"dependency [{i}]")
+        return DependencyEdge(
+            from_role_id=ddata["from_role_id"],
+            to_role_id=ddata["to_role_id"],
+            dependency_type=ddata["dependency_type"],
+            critical=ddata["critical"],
+        )
+
+    def history(self) -> "_Built":
+        """
+        event_history entries, parsed a batch at a time: one C-level
+        parse per batch shares key strings across its entries.
+        """
+        items: List[Any] = []
+        self.expect("[")
+        if not self.peek("]"):
+            while True:
+                batch = self.batch()
+                if batch is None:
+                    items.append(self.value())
+                else:
+                    items.extend(batch)
+                if not self.peek(","):
+                    break
+            self.expect("]")
+        return _Built(items)
+
+    def batch(self) -> Any:
+        """
+        The whole array elements ahead of pos (up to _CHUNK chars) as a
+        list, or None.  Candidate ends are "},{" separators; a candidate
+        inside a string or a nested value leaves the brackets unbalanced,
+        so only a true element boundary parses.
+        """
+        text, start = self.text, self.pos
+        cut = text.rfind("},{", start, start + _CHUNK)
+        while cut != -1:
+            wrapped = "[" + text[start:cut + 1] + "]"
+            try:
+                batch, end = _STRICT_JSON.raw_decode(wrapped)
+            except json.JSONDecodeError:
+                end = -1
+            if end == len(wrapped):
+                self.pos = cut + 1
+                return batch
+            cut = text.rfind("},{", start, cut + 2)
+        return None
+
+    def array(self, build) -> "_Built":
+        items: List[Any] = []
+        self.expect("[")
+        if not self.peek("]"):
+            while True:
+                items.append(build(self.value(), len(items)))
+                if not self.peek(","):
+                    break
+            self.expect("]")
+        return _Built(items)
+
+    # -- Tokens -------------------------------------------------------------
+
+    def fill(self) -> bool:
+        """Decode the next chunk of the buffer into text; False at EOF."""
+        view = self._view
+        if view is None or self._offset > len(view):
+            return False
+        start = self._offset
+        self._offset += _CHUNK
+        with view[start:self._offset] as chunk:
+            decoded = self._utf8.decode(chunk, final=self._offset >= len(view))
+        if self._offset >= len(view):
+            self._offset = len(view) + 1  # final chunk done
+        self.text = self.text[self.pos:] + decoded
+        self.pos = 0
+        return True
+
+    def skip(self) -> None:
+        while True:
+            self.pos = _WS.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or not self.fill():
+                return
+
+    def at(self, char: str) -> bool:
+        self.skip()
+        return self.text.startswith(char, self.pos)
+
+    def peek(self, char: str) -> bool:
+        """Consume *char* if it is next."""
+        if self.at(char):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, char: str) -> None:
+        if not self.peek(char):
+            raise ValueError(f"Expected {char!r} at {self.pos}")
+
+    def key(self) -> str:
+        self.expect('"')
+        while True:
+            try:
+                key, self.pos = json.decoder.scanstring(self.text, self.pos)
+                break
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+        self.expect(":")
+        return key
+
+    def value(self) -> Any:
+        self.skip()
+        while True:
+            try:
+                value, end = _STRICT_JSON.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # a number ending the window may continue in the next chunk
+            if end < len(self.text) or not self.fill():
+                self.pos = end
+                return value
+
+
+class _Built:
+    """Marks a section the stream decoder has already converted."""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: Any) -> None:
+        self.items = items
+
+
+def _decode_role(rid: str, rdata: Any) -> Role:
+    """One roles entry, with decode_snapshot's checks."""
+    if not isinstance(rdata, dict):
+        raise DeserializationError(f"Role '{rid}' must be a JSON object")
+    _check_fields(rdata, _ROLE_FIELDS, f"role '{rid}'")
+    role_id = rdata["id"]
+    if not isinstance(role_id, str):
+        raise DeserializationError(
+            f"Role id must be string, got {type(role_id).__name__}"
+        )
+    if role_id != rid:
+        raise DeserializationError(
+            f"Role key '{rid}' does not match role.id '{role_id}'"
+        )
+    return Role(
+        id=rdata["id"],
+        name=rdata["name"],
+        purpose=rdata["purpose"],
+        responsibilities=list(rdata["responsibilities"]),
+        required_inputs=list(rdata["required_inputs"]),
+        produced_outputs=list(rdata["produced_outputs"]),
+        scale_stage=rdata["scale_stage"],
+        active=rdata["active"],
+    )
+
+
 # ══════════════════════════════════════════════════════════════
 # Restore (decode + validate)
 # ══════════════════════════════════════════════════════════════
@@ -363,15 +703,39 @@ def import_snapshot_from_file(path: pathlib.Path) -> OrgState:
     """
     Import a snapshot from a file and validate invariants.
 
+    The file is memory-mapped and decoded in a single pass
+    (decode_snapshot_stream); binary snapshots (snapshot_binary.py)
+    are recognised by their magic bytes.
     Fails if malformed. No fallback. No silent repair.
     """
+    state = decode_snapshot_file(path)
     try:
-        text = path.read_text(encoding="utf-8")
+        validate_invariants(state)
+    except InvariantViolationError as exc:
+        raise InvariantViolationSnapshotError(exc) from exc
+    return state
+
+
+def decode_snapshot_file(path: pathlib.Path) -> OrgState:
+    """Memory-map *path* and decode it (JSON or binary); no invariant check."""
+    try:
+        with open(path, "rb") as fh:
+            try:
+                buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file: nothing to map
+                buffer = fh.read()
     except (OSError, IOError) as exc:
         raise DeserializationError(
             f"Failed to read snapshot file {path}: {exc}"
         ) from exc
-    return restore_snapshot(text)
+    try:
+        if buffer[:4] == b"OKSB":
+            from .snapshot_binary import decode_snapshot_binary
+            return decode_snapshot_binary(buffer)
+        return decode_snapshot_stream(buffer)
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
 
 
 # ══════════════════════════════════════════════════════════════
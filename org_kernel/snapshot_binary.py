@@ -0,0 +1,560 @@
+# file: org_kernel/snapshot_binary.py
+"""
+Organizational Kernel — Binary Snapshot Codec v1
+
+Compact binary counterpart of the canonical JSON snapshot
+(snapshot.py).  Same content, same ordering rules, same strictness:
+
+  header   b"OKSB" | version u8 | flags u8 (0)
+  strings  count, utf-8 byte length, utf-8 blob, per-string char lengths
+  scalars  structural_debt, scale_stage
+  vectors  constraint_vector (capital, talent, time, political_cost)
+           constants (6 fields, JSON key order)
+  roles    count, then per role (sorted by id):
+           id, name, purpose, scale_stage, active, and the three sorted
+           lists (responsibilities, required_inputs, produced_outputs)
+  deps     count, then per edge (JSON sort order):
+           from_role_id, to_role_id, dependency_type, critical
+  history  count, then one tagged value per event dict
+  trailer  CRC-32 of everything before it, u32 big-endian
+
+Every string is a varint index into the table; every integer is a
+zigzag varint.  Tagged values (event_history only) cover exactly what
+canonical JSON carries minus floats: null, false, true, int, string,
+list and object (keys sorted; each distinct key set is written once
+and referenced afterwards).  Floats are rejected on encode
+(SerializationError); int64 range, bool bytes, string indexes,
+duplicate role ids, truncation, trailing bytes and the checksum are
+checked on decode (DeserializationError).
+
+decode_snapshot_binary(encode_snapshot_binary(s)) has the same
+snapshot_hash as decode_snapshot(encode_snapshot(s)); the converters
+below check that before returning.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from itertools import accumulate, islice
+from typing import Any, Dict, List, Optional, Tuple
+
+from .domain_types import (
+    ConstraintVector,
+    DependencyEdge,
+    DomainConstants,
+    OrgState,
+    Role,
+)
+from .invariants import InvariantViolationError, validate_invariants
+from .snapshot import (
+    DeserializationError,
+    InvariantViolationSnapshotError,
+    SerializationError,
+    SnapshotError,
+    decode_snapshot,
+    encode_snapshot,
+    snapshot_hash,
+)
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+    _HAS_NUMPY = False
+
+
+MAGIC = b"OKSB"
+VERSION = 1
+
+_HEADER = MAGIC + bytes((VERSION, 0))
+
+_INT64_MIN: int = -(2**63)
+_INT64_MAX: int = 2**63 - 1
+
+# Tagged value codes (event_history).  Objects are written as a key
+# "shape": _T_SHAPE defines a new sorted key tuple inline (count, keys,
+# then values); _T_DICT refers to an earlier shape by index.
+_T_NULL, _T_FALSE, _T_TRUE, _T_INT, _T_STR, _T_LIST, _T_DICT, _T_SHAPE = range(8)
+
+_CONSTANT_ORDER = (
+    "compression_max_combined_responsibilities",
+    "differentiation_min_capacity",
+    "differentiation_threshold",
+    "shock_deactivation_threshold",
+    "shock_debt_base_multiplier",
+    "suppressed_differentiation_debt_increment",
+)
+
+
+def is_binary_snapshot(data: bytes) -> bool:
+    """True if *data* starts with the binary snapshot magic."""
+    return data[:4] == MAGIC
+
+
+# ══════════════════════════════════════════════════════════════
+# Encoder
+# ══════════════════════════════════════════════════════════════
+
+def encode_snapshot_binary(state: OrgState) -> bytes:
+    """
+    Serialize an OrgState into the binary snapshot format.
+
+    Byte-for-byte identical output for identical states.
+    No mutation. No side effects. No validation.
+    """
+    try:
+        return _encode(state)
+    except SerializationError:
+        raise
+    except Exception as exc:
+        raise SerializationError(f"Failed to encode snapshot: {exc}") from exc
+
+
+def _encode(state: OrgState) -> bytes:
+    # Everything after the string blob is a flat stream of unsigned
+    # varints: collect the values, then serialise them in one go.
+    table: Dict[str, int] = {}
+    shapes: Dict[Tuple[str, ...], int] = {}
+    out: List[int] = []
+    emit = out.append
+
+    def text(s: str) -> None:
+        if type(s) is not str:
+            raise SerializationError(
+                f"Expected string, got {type(s).__name__}: {s!r}"
+            )
+        index = table.get(s)
+        if index is None:
+            index = table[s] = len(table)
+        emit(index)
+
+    def sint(n: int) -> None:
+        if type(n) is not int:
+            raise SerializationError(
+                f"Expected int, got {type(n).__name__}: {n!r}"
+            )
+        emit(n << 1 if n >= 0 else (-n << 1) - 1)
+
+    def value(obj: Any) -> None:
+        if obj is None:
+            emit(_T_NULL)
+        elif obj is True:
+            emit(_T_TRUE)
+        elif obj is False:
+            emit(_T_FALSE)
+        elif isinstance(obj, str):
+            emit(_T_STR)
+            text(str(obj))
+        elif isinstance(obj, int):
+            emit(_T_INT)
+            sint(int(obj))
+        elif isinstance(obj, dict):
+            keys = tuple(sorted(obj))
+            shape = shapes.get(keys)
+            if shape is None:
+                shapes[keys] = len(shapes)
+                emit(_T_SHAPE)
+                emit(len(keys))
+                for key in keys:
+                    if not isinstance(key, str):
+                        raise SerializationError(f"Non-string key: {key!r}")
+                    text(key)
+            else:
+                emit(_T_DICT)
+                emit(shape)
+            for key in keys:
+                value(obj[key])
+        elif isinstance(obj, (list, tuple)):
+            emit(_T_LIST)
+            emit(len(obj))
+            for item in obj:
+                value(item)
+        elif isinstance(obj, float):
+            raise _FloatFound
+        else:
+            raise SerializationError(
+                f"Unsupported type in event_history: {type(obj).__name__}"
+            )
+
+    sint(state.structural_debt)
+    text(state.scale_stage)
+    cv = state.constraint_vector
+    for n in (cv.capital, cv.talent, cv.time, cv.political_cost):
+        sint(n)
+    for name in _CONSTANT_ORDER:
+        sint(getattr(state.constants, name))
+
+    emit(len(state.roles))
+    for rid in sorted(state.roles):
+        r = state.roles[rid]
+        text(r.id)
+        text(r.name)
+        text(r.purpose)
+        text(r.scale_stage)
+        emit(1 if r.active else 0)
+        for items in (r.responsibilities, r.required_inputs, r.produced_outputs):
+            emit(len(items))
+            for s in sorted(items):
+                text(s)
+
+    deps = sorted(
+        state.dependencies,
+        key=lambda d: (
+            d.from_role_id, d.to_role_id, d.dependency_type, d.critical,
+        ),
+    )
+    emit(len(deps))
+    for d in deps:
+        text(d.from_role_id)
+        text(d.to_role_id)
+        text(d.dependency_type)
+        emit(1 if d.critical else 0)
+
+    history = list(state.event_history)
+    emit(len(history))
+    for i, entry in enumerate(history):
+        try:
+            value(entry)
+        except _FloatFound:
+            raise SerializationError(
+                f"Float detected at {_float_path(entry, f'$.event_history[{i}]')}"
+                " — floats are prohibited"
+            ) from None
+
+    strings = list(table)
+    blob = "".join(strings).encode("utf-8")
+    data = bytearray(_HEADER)
+    data += _uvarint(len(strings))
+    data += _uvarint(len(blob))
+    data += blob
+    data += _uvarints_bytes([len(s) for s in strings])
+    data += _uvarints_bytes(out)
+    data += zlib.crc32(data).to_bytes(4, "big")
+    return bytes(data)
+
+
+class _FloatFound(Exception):
+    """Internal: a float was met; the path is recovered afterwards."""
+
+
+def _float_path(obj: Any, path: str) -> str:
+    """Path of the first float inside *obj* (same notation as snapshot.py)."""
+    if isinstance(obj, float):
+        return f"{path}: {obj!r}"
+    items = (
+        obj.items() if isinstance(obj, dict)
+        else enumerate(obj) if isinstance(obj, (list, tuple))
+        else ()
+    )
+    for key, item in items:
+        sub = f"{path}.{key}" if isinstance(obj, dict) else f"{path}[{key}]"
+        found = _float_path(item, sub)
+        if found:
+            return found
+    return ""
+
+
+_BYTE = [bytes((i,)) for i in range(0x80)]
+
+
+def _uvarint(n: int) -> bytes:
+    if n < 0x80:
+        return _BYTE[n]
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _uvarints_bytes(values: List[int]) -> bytes:
+    if not values or max(values) < 0x80:
+        return bytes(values)
+    return b"".join([_uvarint(n) for n in values])
+
+
+# ══════════════════════════════════════════════════════════════
+# Decoder
+# ══════════════════════════════════════════════════════════════
+
+_VARINT = re.compile(rb"[\x80-\xff]*[\x00-\x7f]")
+
+
+def decode_snapshot_binary(data: bytes) -> OrgState:
+    """
+    Strict deserialization of a binary snapshot to OrgState.
+
+    Fails on: bad magic/version/checksum, truncation, trailing bytes,
+    int64 overflow, invalid bools or string indexes, duplicate roles.
+    No defaults. No coercion. No mutation.
+    """
+    data = bytes(data)
+    if len(data) < len(_HEADER) + 4 or data[:4] != MAGIC:
+        raise DeserializationError("Not a binary snapshot (bad magic)")
+    if data[4] != VERSION:
+        raise DeserializationError(
+            f"Unsupported binary snapshot version: {data[4]}"
+        )
+    if data[5] != 0:
+        raise DeserializationError(f"Unknown binary snapshot flags: {data[5]}")
+    end = len(data) - 4
+    if zlib.crc32(data[:end]) != int.from_bytes(data[end:], "big"):
+        raise DeserializationError("Binary snapshot checksum mismatch")
+    try:
+        return _decode(data, len(_HEADER), end)
+    except (StopIteration, IndexError) as exc:
+        raise DeserializationError("Truncated binary snapshot") from exc
+
+
+def _decode(data: bytes, pos: int, end: int) -> OrgState:
+    count, pos = _read_uvarint(data, pos, end)
+    size, pos = _read_uvarint(data, pos, end)
+    if pos + size > end:
+        raise DeserializationError("Truncated binary snapshot")
+    try:
+        text = data[pos:pos + size].decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise DeserializationError(f"Invalid UTF-8 in string table: {exc}") from exc
+
+    it = iter(_uvarints(data, pos + size, end))
+    nxt = it.__next__
+    offsets = [0, *accumulate(islice(it, count))]
+    if len(offsets) != count + 1 or offsets[-1] != len(text):
+        raise DeserializationError("Corrupt string table")
+    strings = [text[offsets[i]:offsets[i + 1]] for i in range(count)]
+
+    def s() -> str:
+        index = nxt()
+        if index >= count:
+            raise DeserializationError(f"String index out of range: {index}")
+        return strings[index]
+
+    def sint() -> int:
+        z = nxt()
+        return -((z + 1) >> 1) if z & 1 else z >> 1
+
+    def int64(name: str) -> int:
+        n = sint()
+        if n < _INT64_MIN or n > _INT64_MAX:
+            raise DeserializationError(
+                f"Value out of int64 range for '{name}': {n}"
+            )
+        return n
+
+    def flag(name: str) -> bool:
+        b = nxt()
+        if b > 1:
+            raise DeserializationError(f"Field '{name}' must be bool, got {b}")
+        return b == 1
+
+    shapes: List[Tuple[str, ...]] = []
+
+    def values(n: int) -> List[Any]:
+        # strings and ints (the bulk of event_history) are decoded inline
+        out = []
+        append = out.append
+        for _ in range(n):
+            tag = nxt()
+            if tag == _T_STR:
+                index = nxt()
+                if index >= count:
+                    raise DeserializationError(
+                        f"String index out of range: {index}"
+                    )
+                append(strings[index])
+            elif tag == _T_INT:
+                z = nxt()
+                append(-((z + 1) >> 1) if z & 1 else z >> 1)
+            else:
+                append(container(tag))
+        return out
+
+    def container(tag: int) -> Any:
+        if tag == _T_DICT:
+            index = nxt()
+            if index >= len(shapes):
+                raise DeserializationError(f"Shape index out of range: {index}")
+            keys = shapes[index]
+            return dict(zip(keys, values(len(keys))))
+        if tag == _T_SHAPE:
+            keys = tuple([s() for _ in range(nxt())])
+            shapes.append(keys)
+            return dict(zip(keys, values(len(keys))))
+        if tag == _T_LIST:
+            return values(nxt())
+        if tag == _T_NULL:
+            return None
+        if tag == _T_TRUE:
+            return True
+        if tag == _T_FALSE:
+            return False
+        raise DeserializationError(f"Unknown value tag: {tag}")
+
+    structural_debt = int64("structural_debt")
+    scale_stage = s()
+    capital, talent, time, political_cost = (
+        int64(name) for name in ("capital", "talent", "time", "political_cost")
+    )
+    constraint_vector = ConstraintVector(
+        capital=capital, talent=talent, time=time, political_cost=political_cost,
+    )
+    constants = DomainConstants(**{name: int64(name) for name in _CONSTANT_ORDER})
+
+    roles: Dict[str, Role] = {}
+    for _ in range(nxt()):
+        rid = s()
+        if rid in roles:
+            raise DeserializationError(f"Duplicate role ID: '{rid}'")
+        name, purpose, stage = s(), s(), s()
+        active = flag("active")
+        responsibilities = [s() for _ in range(nxt())]
+        required_inputs = [s() for _ in range(nxt())]
+        produced_outputs = [s() for _ in range(nxt())]
+        roles[rid] = Role(
+            id=rid,
+            name=name,
+            purpose=purpose,
+            responsibilities=responsibilities,
+            required_inputs=required_inputs,
+            produced_outputs=produced_outputs,
+            scale_stage=stage,
+            active=active,
+        )
+
+    dependencies: List[DependencyEdge] = []
+    for _ in range(nxt()):
+        from_id, to_id, dtype = s(), s(), s()
+        dependencies.append(DependencyEdge(
+            from_role_id=from_id,
+            to_role_id=to_id,
+            dependency_type=dtype,
+            critical=flag("critical"),
+        ))
+
+    event_history = values(nxt())
+    leftover = sum(1 for _ in it)
+    if leftover:
+        raise DeserializationError(
+            f"Trailing values in binary snapshot: {leftover}"
+        )
+    return OrgState(
+        roles=roles,
+        dependencies=dependencies,
+        constraint_vector=constraint_vector,
+        constants=constants,
+        scale_stage=scale_stage,
+        structural_debt=structural_debt,
+        event_history=event_history,
+    )
+
+
+def _read_uvarint(data: bytes, pos: int, end: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        if pos >= end:
+            raise DeserializationError("Truncated binary snapshot")
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _uvarints(data: bytes, start: int, end: int) -> List[int]:
+    """Every varint in data[start:end] (most are one or two bytes)."""
+    chunk = data[start:end]
+    if not chunk:
+        return []
+    if chunk[-1] >= 0x80:
+        raise DeserializationError("Truncated binary snapshot")
+    if max(chunk) < 0x80:
+        return list(chunk)
+    if _HAS_NUMPY:
+        values = _uvarints_numpy(chunk)
+        if values is not None:
+            return values
+    return [
+        t[0] if len(t) == 1
+        else (t[0] & 0x7F) | (t[1] << 7) if len(t) == 2
+        else _varint_value(t)
+        for t in _VARINT.findall(chunk)
+    ]
+
+
+def _uvarints_numpy(chunk: bytes) -> Optional[List[int]]:
+    """Vectorised LEB128 decode; None if a value needs more than 63 bits."""
+    raw = np.frombuffer(chunk, dtype=np.uint8)
+    ends = np.flatnonzero(raw < 0x80)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    if lengths.max() > 9:
+        return None
+    shift = 7 * (np.arange(len(raw)) - np.repeat(starts, lengths))
+    parts = (raw & 0x7F).astype(np.uint64) << shift.astype(np.uint64)
+    return np.add.reduceat(parts, starts).tolist()
+
+
+def _varint_value(token: bytes) -> int:
+    result = 0
+    for b in reversed(token):
+        result = (result << 7) | (b & 0x7F)
+    return result
+
+
+# ══════════════════════════════════════════════════════════════
+# Restore (decode + validate)
+# ══════════════════════════════════════════════════════════════
+
+def restore_snapshot_binary(data: bytes) -> OrgState:
+    """
+    Decode a binary snapshot and immediately validate invariants.
+
+    Hard fail on first invariant violation.
+    """
+    state = decode_snapshot_binary(data)
+    try:
+        validate_invariants(state)
+    except InvariantViolationError as exc:
+        raise InvariantViolationSnapshotError(exc) from exc
+    return state
+
+
+# ══════════════════════════════════════════════════════════════
+# Converters (hash-checked)
+# ══════════════════════════════════════════════════════════════
+
+def snapshot_json_to_binary(json_str: str) -> bytes:
+    """
+    Convert a canonical JSON snapshot to binary, proving the result
+    decodes to a state with the same snapshot_hash.
+    """
+    state = decode_snapshot(json_str)
+    data = encode_snapshot_binary(state)
+    _check_same_hash(state, decode_snapshot_binary(data))
+    return data
+
+
+def snapshot_binary_to_json(data: bytes) -> str:
+    """
+    Convert a binary snapshot to canonical JSON, proving the result
+    decodes to a state with the same snapshot_hash.
+    """
+    state = decode_snapshot_binary(data)
+    json_str = encode_snapshot(state)
+    _check_same_hash(state, decode_snapshot(json_str))
+    return json_str
+
+
+def _check_same_hash(a: OrgState, b: OrgState) -> Tuple[str, str]:
+    ha, hb = snapshot_hash(a), snapshot_hash(b)
+    if ha != hb:
+        raise SnapshotError(
+            f"Snapshot conversion changed the state hash: {ha} != {hb}"
+        )
+    return ha, hb
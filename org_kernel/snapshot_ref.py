@@ -0,0 +1,247 @@
+# file: org_kernel/snapshot_ref.py
+"""
+Organizational Kernel — History-Free Snapshots
+
+Canonical JSON snapshots (snapshot.py) embed the full event_history,
+so a snapshot at sequence N is O(N) bytes.  A reference snapshot has
+the same fields and encoding except that event_history is replaced by
+
+    "event_history_ref": {"count": N, "digest": "<64 hex>",
+                          "first_sequence": s, "last_sequence": e}
+
+where digest is the event_log rolling chain digest over the N entries
+(GENESIS_DIGEST when N == 0) and [s, e] is the sequence range they
+cover (0, 0 when empty).  Its size depends on the org, not the stream.
+
+Decoding gives a state whose event_history is a LoggedHistory of the
+right length and digest; the entries themselves are fetched through
+*loader(first_sequence, last_sequence)* only when a caller reads them,
+and are checked against count and digest before use.  Appending,
+forking and undo work without fetching anything.
+
+    text = encode_snapshot_ref(state)
+    state = decode_snapshot_ref(text, loader=partial(repo.load_history, pid))
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+from .domain_types import OrgState
+from .event_log import GENESIS_DIGEST, EventLog, LoggedHistory, chain_digest
+from .invariants import InvariantViolationError, validate_invariants
+from .snapshot import (
+    DeserializationError,
+    InvariantViolationSnapshotError,
+    SerializationError,
+    _assert_no_floats,
+    _build_snapshot_dict,
+    _check_fields,
+    _state_from_dict,
+    _validate_int64,
+)
+
+
+HistoryLoader = Callable[[int, int], Iterable[dict]]
+
+_REF_FIELDS = frozenset({"count", "digest", "first_sequence", "last_sequence"})
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass(frozen=True)
+class HistoryRef:
+    """Count, sequence range and chain digest of an event history."""
+
+    count: int
+    first_sequence: int
+    last_sequence: int
+    digest: str
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "digest": self.digest,
+            "first_sequence": self.first_sequence,
+            "last_sequence": self.last_sequence,
+        }
+
+
+def history_ref(history: Any) -> HistoryRef:
+    """
+    Reference for *history* (a list or LoggedHistory).  O(1) for a
+    LoggedHistory, which already carries its digest.
+    """
+    count = len(history)
+    if isinstance(history, LoggedHistory):
+        digest = history.digest
+        first = history.log.entry(0) if count else None
+        last = history.log.entry(count - 1) if count else None
+    else:
+        digest = GENESIS_DIGEST
+        for entry in history:
+            digest = chain_digest(digest, entry)
+        first = history[0] if count else None
+        last = history[-1] if count else None
+    return HistoryRef(
+        count=count,
+        first_sequence=first["sequence"] if first is not None else 0,
+        last_sequence=last["sequence"] if last is not None else 0,
+        digest=digest,
+    )
+
+
+# ══════════════════════════════════════════════════════════════
+# Encoder
+# ══════════════════════════════════════════════════════════════
+
+def encode_snapshot_ref(state: OrgState, ref: Optional[HistoryRef] = None) -> str:
+    """
+    Canonical JSON of *state* with event_history_ref in place of
+    event_history.  Byte-identical for identical states.
+
+    Pass *ref* when the history's reference is already known (e.g. the
+    event store's chain head) to skip hashing an inline history.
+    """
+    try:
+        obj = _build_snapshot_dict(state, include_history=False)
+        if ref is None:
+            ref = history_ref(state.event_history)
+        obj["event_history_ref"] = ref.to_dict()
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            sort_keys=True,
+        )
+    except Exception as exc:
+        raise SerializationError(f"Failed to encode snapshot: {exc}") from exc
+
+
+# ══════════════════════════════════════════════════════════════
+# Decoder
+# ══════════════════════════════════════════════════════════════
+
+def decode_snapshot_ref(
+    json_str: str, loader: Optional[HistoryLoader] = None,
+) -> OrgState:
+    """
+    Strict deserialization of a reference snapshot.  Same rules as
+    decode_snapshot; event_history is rehydrated through *loader* on
+    first read (without a loader, reading it raises
+    DeserializationError; its length is always available).
+    """
+    try:
+        raw = json.loads(json_str)
+    except json.JSONDecodeError as exc:
+        raise DeserializationError(f"Invalid JSON: {exc}") from exc
+    if not isinstance(raw, dict):
+        raise DeserializationError(
+            f"Top-level JSON must be object, got {type(raw).__name__}"
+        )
+    _assert_no_floats(raw, "$")
+
+    if "event_history" in raw:
+        raise DeserializationError(
+            "Unknown fields in snapshot: ['event_history'] "
+            "(embedded-history snapshot — use decode_snapshot)"
+        )
+    if "event_history_ref" not in raw:
+        raise DeserializationError(
+            "Missing fields in snapshot: ['event_history_ref']"
+        )
+    ref = _ref_from_dict(raw.pop("event_history_ref"))
+    raw["event_history"] = []
+    state = _state_from_dict(raw)
+    state.event_history = LoggedHistory(
+        EventLog(parent=_StoredLog(ref, loader), base=ref.count),
+        ref.count,
+        ref.digest,
+    )
+    return state
+
+
+def restore_snapshot_ref(
+    json_str: str, loader: Optional[HistoryLoader] = None,
+) -> OrgState:
+    """decode_snapshot_ref, then validate invariants (history not read)."""
+    state = decode_snapshot_ref(json_str, loader)
+    try:
+        validate_invariants(state)
+    except InvariantViolationError as exc:
+        raise InvariantViolationSnapshotError(exc) from exc
+    return state
+
+
+def _ref_from_dict(raw: Any) -> HistoryRef:
+    if not isinstance(raw, dict):
+        raise DeserializationError("'event_history_ref' must be a JSON object")
+    _check_fields(raw, _REF_FIELDS, "event_history_ref")
+    _validate_int64(raw, ["count", "first_sequence", "last_sequence"])
+    digest = raw["digest"]
+    if not isinstance(digest, str) or not _DIGEST.fullmatch(digest):
+        raise DeserializationError(
+            "'event_history_ref.digest' must be 64 lowercase hex digits"
+        )
+    if raw["count"] < 0:
+        raise DeserializationError(
+            f"'event_history_ref.count' must be >= 0, got {raw['count']}"
+        )
+    return HistoryRef(
+        count=raw["count"],
+        first_sequence=raw["first_sequence"],
+        last_sequence=raw["last_sequence"],
+        digest=digest,
+    )
+
+
+class _StoredLog(EventLog):
+    """
+    Read-only EventLog of the referenced entries, fetched on first
+    access and verified against the reference.
+    """
+
+    __slots__ = ("_ref", "_loader", "_loaded")
+
+    def __init__(self, ref: HistoryRef, loader: Optional[HistoryLoader]) -> None:
+        super().__init__()
+        self._ref = ref
+        self._loader = loader
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return self._ref.count
+
+    def append(self, entry: dict) -> None:
+        raise TypeError("Referenced event history is read-only")
+
+    def entry(self, index: int) -> dict:
+        return self._load()[index]
+
+    def entries(self, start: int, stop: int) -> List[dict]:
+        return self._load()[start:stop]
+
+    def _load(self) -> List[dict]:
+        if self._loaded:
+            return self._entries
+        ref = self._ref
+        if self._loader is None:
+            raise DeserializationError(
+                f"event_history ({ref.count} events) is not embedded in "
+                f"this snapshot and no history loader was given"
+            )
+        entries = list(self._loader(ref.first_sequence, ref.last_sequence))
+        digest = GENESIS_DIGEST
+        for entry in entries:
+            digest = chain_digest(digest, entry)
+        if len(entries) != ref.count or digest != ref.digest:
+            raise DeserializationError(
+                f"Rehydrated event_history does not match event_history_ref: "
+                f"expected {ref.count} events with digest {ref.digest[:12]}…, "
+                f"got {len(entries)} with digest {digest[:12]}…"
+            )
+        self._entries = entries
+        self._loaded = True
+        return entries
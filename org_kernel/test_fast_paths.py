@@ -0,0 +1,1053 @@
+# file: org_kernel/test_fast_paths.py
+"""
+Organizational Kernel — Fast-Path Equivalence Tests
+
+Every optimised code path must be observationally identical to the
+reference path (deep copy, full invariant scan, full replay).
+
+  1: Copy-on-write transitions never mutate the original state
+  2: Trusted replay matches strict replay (hash + strict fallback)
+  3: Incremental invariants raise exactly what the full checker raises
+  4: Critical-subgraph index agrees with the whole-graph cycle DFS
+  5: EdgeStore matches plain-list edge handling (order, degrees, forks)
+  6: Log-mode history matches inline history (hash, snapshot, digest)
+  7: apply_batch matches sequential apply and rolls back atomically
+  8: Cached canonical serialization is byte-identical
+  9: Columnar graph analytics match graph.py / projection.metrics
+ 10: Running diagnostics match compute_diagnostics after every event
+ 11: state_at() from checkpoints matches the state recorded at apply time
+ 12: step_back / rewind_to restore every earlier state exactly
+ 13: StateDelta on every TransitionResult describes exactly what changed
+     (TransitionResult.to_dict is JSON-ready and matches the dataclass)
+ 14: Engine forks / scenario trees match independent sequential runs
+ 15: Copy-on-write containers match dict / set; fork cost is flat in org size
+ 16: Shock sweep reproduces inject_shock's debt for every role
+
+Run:  py -3 -m org_kernel.test_fast_paths
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+from dataclasses import replace as dataclasses_replace
+import random
+from collections import Counter
+import sys
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from org_kernel.columnar_graph import ColumnarGraph, _HAS_NUMPY
+from org_kernel.cow import CowDict, CowSet
+from org_kernel.diagnostics import compute_diagnostics
+from org_kernel.domain_types import DependencyEdge, EdgeStore, TransitionResult
+from org_kernel.engine import OrgEngine
+from org_kernel.event_log import GENESIS_DIGEST, chain_digest
+from org_kernel.events import (
+    AddDependencyEvent,
+    BaseEvent,
+    AddRoleEvent,
+    ApplyConstraintChangeEvent,
+    CompressRolesEvent,
+    DifferentiateRoleEvent,
+    InitializeConstantsEvent,
+    InjectShockEvent,
+    RemoveRoleEvent,
+)
+from org_kernel.graph import (
+    CriticalGraphIndex,
+    compute_role_structural_density,
+    compute_structural_density,
+    detect_critical_cycles,
+    find_isolated_roles,
+)
+from org_kernel.hashing import CanonicalHashCache, canonical_hash, canonical_serialize
+from org_kernel.invariants import InvariantViolationError
+from org_kernel.scenarios import ScenarioTree
+from org_kernel import shock_sweep
+from org_kernel.shock_sweep import sweep_inject_shock
+from org_kernel.projection.metrics import (
+    compute_boundary_heat,
+    compute_inter_department_edges,
+)
+from org_kernel.snapshot import encode_snapshot
+from org_kernel.transitions import apply_event, apply_event_in_place
+
+
+# ══════════════════════════════════════════════════════════════
+# Test Fixtures
+# ══════════════════════════════════════════════════════════════
+
+def _build_stream() -> list:
+    """A valid stream exercising every event type."""
+    events = []
+
+    def add(cls, **payload) -> None:
+        seq = len(events) + 1
+        events.append(cls(timestamp=f"t{seq}", sequence=seq, payload=payload))
+
+    add(InitializeConstantsEvent, compression_max_combined_responsibilities=8)
+    add(ApplyConstraintChangeEvent, capital_delta=20000, talent_delta=20000,
+        time_delta=20000, political_cost_delta=20000)
+    for i in range(8):
+        add(AddRoleEvent, id=f"r{i}", name=f"Role {i}", purpose="p",
+            responsibilities=[f"a{i}", f"b{i}"] + (["c", "d"] if i == 7 else []),
+            required_inputs=[f"out_{i}"], produced_outputs=[f"out_{i}"])
+    for a, b, dtype, critical in [
+        ("r0", "r1", "operational", True),
+        ("r1", "r2", "governance", True),
+        ("r0", "r2", "informational", False),
+        ("r2", "r3", "operational", False),
+        ("r2", "r3", "operational", True),
+        ("r3", "r4", "governance", False),
+        ("r4", "r5", "operational", True),
+        ("r5", "r6", "operational", False),
+        ("r6", "r0", "informational", False),
+    ]:
+        add(AddDependencyEvent, from_role_id=a, to_role_id=b,
+            dependency_type=dtype, critical=critical)
+    add(InjectShockEvent, target_role_id="r2", magnitude=4)
+    add(InjectShockEvent, target_role_id="r6", magnitude=9)
+    add(CompressRolesEvent, source_role_id="r4", target_role_id="r3",
+        compressed_name="Merged")
+    add(DifferentiateRoleEvent, role_id="r7", new_roles=[
+        {"id": "r7a", "name": "Seven A", "responsibilities": ["a7", "c"]},
+        {"id": "r7b", "name": "Seven B", "responsibilities": ["b7", "d"]},
+    ])
+    add(ApplyConstraintChangeEvent, capital_delta=-5000)
+    add(RemoveRoleEvent, role_id="r5")
+    add(InjectShockEvent, target_role_id="r3", magnitude=2)
+    return events
+
+
+def _header(title: str) -> None:
+    print(f"\n{'='*60}")
+    print(f"  {title}")
+    print(f"{'='*60}")
+
+
+# ══════════════════════════════════════════════════════════════
+# Tests
+# ══════════════════════════════════════════════════════════════
+
+def test_01_cow_transitions_never_mutate_original() -> bool:
+    """Every transition leaves its input state byte-identical."""
+    _header("Test 01 -- Copy-on-write transitions")
+    engine = OrgEngine()
+    engine.initialize_state()
+    events = _build_stream()
+    for event in events:
+        before = engine.state
+        before_dict = before.to_dict()
+        before_hash = canonical_hash(before)
+        deep = before.copy()
+
+        new_state, _ = apply_event(before, event)
+        engine.apply_event(event)
+
+        assert before.to_dict() == before_dict, f"{event.event_type} mutated state"
+        assert canonical_hash(before) == before_hash
+        assert canonical_hash(apply_event(deep, event)[0]) == canonical_hash(new_state)
+
+    # history is shared, not copied; a stale version diverges on append
+    old = engine.state
+    nxt, _ = apply_event(old, events[0])
+    assert nxt.event_history.log is old.event_history.log
+    assert len(old.event_history) == len(events)
+    assert nxt.event_history[-1] == events[0].to_dict()
+    other, _ = apply_event(old, events[1])
+    assert other.event_history.log is not old.event_history.log
+    assert list(other.event_history)[:-1] == list(old.event_history)
+    assert other.event_history[-1] == events[1].to_dict()
+    assert nxt.event_history[-1] == events[0].to_dict()
+    print("  [PASS]")
+    return True
+
+
+def test_02_trusted_replay_matches_strict() -> bool:
+    """Trusted replay yields the strict hash and strict errors."""
+    _header("Test 02 -- Trusted replay")
+    events = _build_stream()
+    strict = OrgEngine().replay(events)
+    for interval in (0, 1, 5):
+        trusted = OrgEngine().replay(
+            events, trusted=True, checkpoint_interval=interval,
+        )
+        assert canonical_hash(trusted) == canonical_hash(strict)
+        assert trusted.to_dict() == strict.to_dict()
+
+    # Corrupt the stream mid-way: r1 -> r0 closes a critical cycle
+    bad = _build_stream()
+    seq = bad[12].sequence
+    bad[12] = AddDependencyEvent(
+        timestamp="bad", sequence=seq,
+        payload={"from_role_id": "r1", "to_role_id": "r0", "critical": True},
+    )
+    errors = []
+    for trusted in (False, True):
+        engine = OrgEngine()
+        try:
+            engine.replay(bad, trusted=trusted)
+            raise AssertionError("expected InvariantViolationError")
+        except InvariantViolationError as exc:
+            errors.append((str(exc), engine._last_sequence))
+    assert errors[0] == errors[1], errors
+    assert errors[1][1] == seq - 1, errors
+    print(f"  fallback error: {errors[1][0]}")
+    print("  [PASS]")
+    return True
+
+
+def _outcome(engine: OrgEngine, *segments: list) -> list:
+    """Per segment: (error type, message) of its failure or "ok", plus hash."""
+    out = []
+    for events in segments:
+        try:
+            engine.apply_sequence(events)
+            out.append(("ok", canonical_hash(engine.state)))
+        except Exception as exc:
+            out.append((type(exc).__name__, str(exc), canonical_hash(engine.state)))
+    return out
+
+
+def test_03_incremental_invariants_match_full() -> bool:
+    """Probe events at every prefix, then the rest: identical outcomes."""
+    _header("Test 03 -- Incremental invariants")
+    stream = _build_stream()
+
+    def probes(seq: int) -> list:
+        def ev(cls, offset=0, **payload) -> BaseEvent:
+            return cls(timestamp="probe", sequence=seq + offset, payload=payload)
+        role = dict(name="X", purpose="p", responsibilities=["x"],
+                    required_inputs=[], produced_outputs=[])
+        return [
+            [ev(AddRoleEvent, **{**role, "id": "orph", "produced_outputs": ["nobody"]})],
+            [ev(AddRoleEvent, **{**role, "id": "idle", "responsibilities": []})],
+            [ev(AddDependencyEvent, from_role_id="r1", to_role_id="r0", critical=True)],
+            [ev(AddDependencyEvent, from_role_id="r6", to_role_id="r7"),
+             ev(DifferentiateRoleEvent, 1, role_id="r7", new_roles=[
+                 {"id": "r7x", "name": "X", "responsibilities": ["a7"]}])],
+            [ev(RemoveRoleEvent, role_id="r3")],
+            [ev(InjectShockEvent, target_role_id="r0", magnitude=10**6)],
+            [ev(CompressRolesEvent, source_role_id="r1", target_role_id="r0",
+                compressed_name="C")],
+        ]
+
+    rules = set()
+    for k in range(1, len(stream) + 1):
+        for probe in probes(k + 1):
+            results = []
+            for mode in ("full", "incremental", "cross_check"):
+                engine = OrgEngine(invariant_mode=mode)
+                engine.initialize_state()
+                # a rejected probe must leave the indexes usable for the rest
+                results.append(_outcome(engine, stream[:k], probe, stream[k:]))
+            assert results[0] == results[1] == results[2], (k, results)
+            message = results[0][1][1]
+            if message.startswith("[INVARIANT:"):
+                rules.add(message[len("[INVARIANT:"):message.index("]")])
+    assert {"dependency_refs", "orphaned_output", "no_active_roles",
+            "empty_responsibilities", "critical_cycle"} <= rules, rules
+    print(f"  outcomes seen: {sorted(rules)}")
+    print("  [PASS]")
+    return True
+
+
+def test_04_critical_index_matches_full_dfs() -> bool:
+    """Random dense critical edges, compressions and removals (seeded)."""
+    _header("Test 04 -- Incremental critical-cycle detection")
+    rng = random.Random(4)
+    engines = [OrgEngine(invariant_mode=m) for m in ("full", "incremental")]
+    for engine in engines:
+        engine.initialize_state()
+    events = _build_stream()[:10]  # constants, capacity, r0..r7
+    for engine in engines:
+        engine.apply_sequence(events)
+
+    rejected = 0
+    seq = len(events)
+    for step in range(400):
+        roles = sorted(engines[0].state.roles)
+        a, b = rng.sample(roles, 2)
+        if step % 50 == 49:
+            cls, payload = CompressRolesEvent, {
+                "source_role_id": a, "target_role_id": b, "compressed_name": "C"}
+        else:
+            cls, payload = AddDependencyEvent, {
+                "from_role_id": a, "to_role_id": b,
+                "critical": rng.random() < 0.6}
+        outcomes = []
+        for engine in engines:
+            event = cls(timestamp="rnd", sequence=seq + 1, payload=payload)
+            try:
+                engine.apply_event(event)
+                outcomes.append(("ok", canonical_hash(engine.state)))
+            except Exception as exc:
+                outcomes.append((type(exc).__name__, str(exc)))
+        assert outcomes[0] == outcomes[1], (step, outcomes)
+        if outcomes[0][0] == "ok":
+            seq += 1
+        else:
+            rejected += 1
+
+        state = engines[1].state
+        index = CriticalGraphIndex.from_dependencies(state.dependencies)
+        assert not detect_critical_cycles(state)
+        assert not any(
+            index.closes_cycle(d.from_role_id, d.to_role_id)
+            for d in state.dependencies if d.critical
+        )
+    print(f"  {seq - len(events)} accepted, {rejected} rejected")
+    print("  [PASS]")
+    return True
+
+
+def test_05_edge_store_matches_list() -> bool:
+    """Random appends, removals and rewires against a list reference."""
+    _header("Test 05 -- EdgeStore adjacency")
+    rng = random.Random(5)
+    ids = [f"n{i}" for i in range(10)]
+    ref: list = []
+    store = EdgeStore()
+    forks = []
+    for step in range(600):
+        op = rng.random()
+        if op < 0.6:
+            a, b = rng.sample(ids, 2)
+            edge = DependencyEdge(a, b, rng.choice(["operational", "governance"]),
+                                  rng.random() < 0.5)
+            ref.append(edge)
+            store.append(edge)
+        elif op < 0.8:
+            rid = rng.choice(ids)
+            ref = [d for d in ref if rid not in (d.from_role_id, d.to_role_id)]
+            store.remove_incident(rid)
+        else:
+            src, tgt = rng.sample(ids, 2)
+            rewired = []
+            for d in ref:
+                d = DependencyEdge(
+                    tgt if d.from_role_id == src else d.from_role_id,
+                    tgt if d.to_role_id == src else d.to_role_id,
+                    d.dependency_type, d.critical,
+                )
+                if d.from_role_id != d.to_role_id:
+                    rewired.append(d)
+            ref = rewired
+            store.rewire(src, tgt)
+
+        assert store == ref and list(store) == ref, step
+        for rid in ids:
+            assert store.in_degree(rid) == sum(d.to_role_id == rid for d in ref)
+            assert store.out_degree(rid) == sum(d.from_role_id == rid for d in ref)
+            assert store.incident(rid) == [
+                d for d in ref if rid in (d.from_role_id, d.to_role_id)]
+        if step % 100 == 0:
+            forks.append((store.fork(), list(ref)))
+
+    # forks taken along the way were never disturbed by later writes
+    for fork, snapshot in forks:
+        assert fork == snapshot
+        for rid in ids:
+            assert fork.degree(rid) == sum(
+                rid in (d.from_role_id, d.to_role_id) for d in snapshot)
+    child = store.fork()
+    for rid in ids[:3]:
+        child.remove_incident(rid)
+    assert store == ref
+    print(f"  {len(ref)} edges, {len(forks)} forks intact")
+    print("  [PASS]")
+    return True
+
+
+def test_06_log_history_matches_inline() -> bool:
+    """Shared append-only log: same observable state, O(1) history forks."""
+    _header("Test 06 -- Log-mode event history")
+    events = _build_stream()
+    inline = OrgEngine()
+    inline.initialize_state()
+    logged = OrgEngine(history_mode="log")
+    logged.initialize_state()
+
+    versions = []
+    for event in events:
+        inline.apply_event(event)
+        logged.apply_event(event)
+        versions.append((logged.state, inline.state.to_dict()))
+        assert logged.state.to_dict() == inline.state.to_dict()
+        assert encode_snapshot(logged.state) == encode_snapshot(inline.state)
+    assert logged.state.event_history == inline.state.event_history
+    assert len(logged.event_log) == len(events)
+
+    digest = GENESIS_DIGEST
+    for entry in inline.state.event_history:
+        digest = chain_digest(digest, entry)
+    assert logged.state.event_history.digest == digest
+
+    # every retained version still sees exactly its own prefix
+    for state, expected in versions:
+        assert state.to_dict() == expected
+
+    # re-applying the recorded next event reuses the shared log ...
+    k = 12
+    old_state = versions[k - 1][0]
+    again, _ = apply_event(old_state, events[k])
+    assert again.event_history.log is logged.event_log
+    assert len(logged.event_log) == len(events)
+    assert again.event_history == versions[k][0].event_history
+
+    # ... while a different event diverges onto a private copy
+    branch, _ = apply_event(old_state, AddRoleEvent(
+        timestamp="branch", sequence=events[k].sequence,
+        payload={"id": "zz", "name": "Z", "purpose": "p",
+                 "responsibilities": ["z"]}))
+    assert branch.event_history.log is not logged.event_log
+    assert list(branch.event_history)[:k] == list(old_state.event_history)
+    assert len(logged.event_log) == len(events)
+    assert logged.state.event_history.digest == digest
+    print(f"  {len(events)} events, shared log reused, branch diverged cleanly")
+    print("  [PASS]")
+    return True
+
+
+def test_07_apply_batch_atomic() -> bool:
+    """Batch == loop of apply_event; any failure leaves the engine as-is."""
+    _header("Test 07 -- Atomic batch apply")
+    events = _build_stream()
+    seq_engine = OrgEngine()
+    seq_engine.initialize_state()
+    expected = [seq_engine.apply_event(e)[1] for e in events]
+
+    for validate_each in (False, True):
+        engine = OrgEngine()
+        engine.initialize_state()
+        head, tail = events[:10], events[10:]
+        engine.apply_batch(head, validate_each=validate_each)
+        state, results = engine.apply_batch(tail, validate_each=validate_each)
+        assert results == expected[10:]
+        assert canonical_hash(state) == canonical_hash(seq_engine.state)
+        assert engine._last_sequence == len(events)
+
+    # Failing batches: invariant at event 2 of 3, and a sequence gap
+    base = OrgEngine()
+    base.initialize_state()
+    base.apply_sequence(events[:10])
+    before, before_hash = base.state, canonical_hash(base.state)
+    n = len(events[:10])
+
+    def ev(cls, offset, **payload):
+        return cls(timestamp="b", sequence=n + offset, payload=payload)
+    role = dict(name="X", purpose="p", responsibilities=["x"])
+    bad_batches = [
+        [ev(AddRoleEvent, 1, id="ok1", **role),
+         ev(AddRoleEvent, 2, id="orph", produced_outputs=["nobody"], **role),
+         ev(AddRoleEvent, 3, id="ok2", **role)],
+        [ev(AddRoleEvent, 1, id="ok1", **role),
+         ev(AddRoleEvent, 3, id="gap", **role)],
+    ]
+    for batch in bad_batches:
+        for validate_each in (False, True):
+            try:
+                base.apply_batch(batch, validate_each=validate_each)
+                raise AssertionError("expected batch failure")
+            except (InvariantViolationError, ValueError):
+                pass
+            assert base.state is before
+            assert canonical_hash(base.state) == before_hash
+            assert base._last_sequence == n
+
+    # validate_each localises the error exactly like sequential apply
+    strict = OrgEngine()
+    strict.initialize_state()
+    strict.apply_sequence(events[:10])
+    try:
+        strict.apply_sequence(bad_batches[0])
+    except InvariantViolationError as exc:
+        strict_error = str(exc)
+    try:
+        base.apply_batch(bad_batches[0], validate_each=True)
+    except InvariantViolationError as exc:
+        assert str(exc) == strict_error
+
+    # the engine is still usable after rollbacks
+    base.apply_batch(events[10:])
+    assert canonical_hash(base.state) == canonical_hash(seq_engine.state)
+    print("  [PASS]")
+    return True
+
+
+def test_08_cached_serialization_identical() -> bool:
+    """Fragment cache output == canonical_serialize after every event."""
+    _header("Test 08 -- Cached canonical serialization")
+    engine = OrgEngine()
+    engine.initialize_state()
+    cache = CanonicalHashCache()
+    versions = []
+    for event in _build_stream():
+        engine.apply_event(event)
+        versions.append(engine.state)
+        assert cache.serialize(engine.state) == canonical_serialize(engine.state)
+        assert engine.state_hash() == canonical_hash(engine.state)
+    # older versions interleaved with newer ones (shared entities)
+    for state in reversed(versions):
+        assert cache.serialize(state) == canonical_serialize(state)
+    print("  [PASS]")
+    return True
+
+
+def test_09_columnar_graph_matches_reference() -> bool:
+    """Columnar routines return the dict-based results, both backends."""
+    _header("Test 09 -- Columnar graph analytics")
+    rng = random.Random(10)
+    engine = OrgEngine()
+    engine.initialize_state()
+    engine.apply_sequence(_build_stream())
+    state = engine.state.fork()
+    ids = sorted(state.roles) + ["ghost"]
+    for _ in range(300):
+        a, b = rng.choice(ids), rng.choice(ids)   # incl. self-loops, dangling
+        state.dependencies.append(DependencyEdge(
+            a, b, rng.choice(["operational", "governance"]), rng.random() < 0.5,
+        ))
+    depts = [SimpleNamespace(id=f"d{i}") for i in range(4)]
+    role_to_dept = {rid: f"d{rng.randrange(5)}" for rid in ids if rng.random() < 0.9}
+
+    backends = [False, True] if _HAS_NUMPY else [False]
+    for s in (engine.state, state):
+        for use_numpy in backends:
+            g = ColumnarGraph.from_state(s, use_numpy=use_numpy)
+            assert g.structural_density() == compute_structural_density(s)
+            assert g.isolated_roles() == find_isolated_roles(s)
+            expected = {rid: compute_role_structural_density(rid, s) for rid in s.roles}
+            assert g.role_structural_densities() == expected
+            for rid in ids:
+                assert g.role_structural_density(rid) == \
+                    compute_role_structural_density(rid, s)
+            assert g.boundary_heat(depts, role_to_dept) == \
+                compute_boundary_heat(depts, role_to_dept, s.dependencies)
+            assert g.inter_department_edges(role_to_dept) == \
+                compute_inter_department_edges(role_to_dept, s.dependencies)
+            assert sum(g.edge_type_counts().values()) == len(s.dependencies)
+    print(f"  numpy backend: {'yes' if _HAS_NUMPY else 'not installed'}")
+    print("  [PASS]")
+    return True
+
+
+def test_10_incremental_diagnostics_match_full() -> bool:
+    """Engine-maintained diagnostics == compute_diagnostics, every path."""
+    _header("Test 10 -- Incremental diagnostics")
+    events = _build_stream()
+    engine = OrgEngine(diagnostics_mode="cross_check")
+    engine.initialize_state()
+    for event in events:
+        engine.apply_event(event)
+        assert engine.get_diagnostics() == compute_diagnostics(engine.state)
+
+    # rejected events leave the counters on the previous state
+    bad = AddRoleEvent(
+        timestamp="x", sequence=len(events) + 1,
+        payload={"id": "orphan_maker", "name": "B", "purpose": "p",
+                 "responsibilities": ["r"], "produced_outputs": ["unused"]},
+    )
+    try:
+        engine.apply_event(bad)
+        raise AssertionError("orphaned output accepted")
+    except InvariantViolationError:
+        pass
+    assert engine.get_diagnostics() == compute_diagnostics(engine.state)
+
+    # batch, trusted replay and direct mutation all resynchronise
+    batch = OrgEngine(diagnostics_mode="cross_check")
+    batch.initialize_state()
+    batch.apply_batch(events[:20])
+    batch.apply_batch(events[20:], validate_each=True)
+    batch.replay(events, trusted=True)
+    first, second = sorted(batch.state.roles)[:2]
+    batch.state.dependencies.append(
+        DependencyEdge(first, second, "governance", False),
+    )
+    assert batch.get_diagnostics() == compute_diagnostics(batch.state)
+    print("  [PASS]")
+    return True
+
+
+def test_11_checkpoint_state_at() -> bool:
+    """state_at(seq) == state after seq, across every apply path."""
+    _header("Test 11 -- Checkpoint ring / state_at")
+    events = _build_stream()
+    reference = OrgEngine()
+    reference.initialize_state()
+    hashes = [canonical_hash(reference.state)]
+    for event in events:
+        reference.apply_event(event)
+        hashes.append(canonical_hash(reference.state))
+
+    def check(engine: OrgEngine) -> None:
+        for seq in range(len(events) + 1):
+            assert canonical_hash(engine.state_at(seq)) == hashes[seq], seq
+        assert engine.state_hash() == hashes[-1]  # engine state untouched
+
+    engine = OrgEngine(checkpoint_every=4)
+    engine.initialize_state()
+    engine.apply_sequence(events)
+    assert engine.checkpoints.sequences == list(range(0, len(events) + 1, 4))
+    check(engine)
+
+    batch = OrgEngine(checkpoint_every=3, history_mode="log")
+    batch.initialize_state()
+    batch.apply_batch(events[:10])
+    try:
+        batch.apply_batch(events[10:] + [events[-1]])   # duplicate sequence
+        raise AssertionError("batch with duplicate sequence accepted")
+    except ValueError:
+        pass
+    assert batch.checkpoints.last_sequence == 10
+    batch.apply_batch(events[10:], validate_each=True)
+    check(batch)
+
+    trusted = OrgEngine(checkpoint_every=5)
+    trusted.replay(events, trusted=True)
+    check(trusted)
+
+    # a tiny budget thins the ring but every answer stays exact
+    tight = OrgEngine(checkpoint_every=1, checkpoint_budget_bytes=8_000)
+    tight.initialize_state()
+    tight.apply_sequence(events)
+    ring = tight.checkpoints
+    assert ring.evictions and ring.interval > 1
+    assert ring.memory_bytes <= 8_000 or len(ring.sequences) <= 2
+    check(tight)
+
+    try:
+        OrgEngine().state_at(0)
+        raise AssertionError("state_at without checkpoints")
+    except RuntimeError:
+        pass
+    print(f"  tight budget: interval={ring.interval} kept={ring.sequences}")
+    print("  [PASS]")
+    return True
+
+
+def test_12_step_back_restores_exact_states() -> bool:
+    """Inverse deltas undo every event type, edge order included."""
+    _header("Test 12 -- Reversible transitions")
+    rng = random.Random(12)
+    events = _build_stream()
+    for history_mode in ("inline", "log"):
+        engine = OrgEngine(
+            invariant_mode="cross_check", diagnostics_mode="cross_check",
+            history_mode=history_mode, undo_depth=1000, checkpoint_every=5,
+        )
+        engine.initialize_state()
+        states = [engine.state]
+        for event in events:
+            engine.apply_event(event)
+            states.append(engine.state)
+        # random edges, then removals / compressions that hit mid-table edges
+        for step in range(60):
+            roles = sorted(engine.state.roles)
+            a, b = rng.sample(roles, 2)
+            seq = engine.state.event_history[-1]["sequence"] + 1
+            if step % 15 == 14 and len(roles) > 4:
+                event = CompressRolesEvent(timestamp="u", sequence=seq, payload={
+                    "source_role_id": a, "target_role_id": b})
+            elif step % 15 == 7 and len(roles) > 4:
+                event = RemoveRoleEvent(timestamp="u", sequence=seq,
+                                        payload={"role_id": a})
+            else:
+                event = AddDependencyEvent(timestamp="u", sequence=seq, payload={
+                    "from_role_id": a, "to_role_id": b,
+                    "dependency_type": "governance", "critical": False})
+            try:
+                engine.apply_event(event)
+            except (InvariantViolationError, ValueError):
+                continue
+            states.append(engine.state)
+
+        # one step at a time, with a re-apply midway (indexes stay in sync)
+        for i in range(len(states) - 2, len(states) // 2, -1):
+            engine.step_back()
+            assert engine.state == states[i], i
+            assert engine.state_hash() == canonical_hash(states[i])
+            assert engine.get_diagnostics() == compute_diagnostics(states[i])
+        engine.rewind_to(12)
+        assert engine.state == states[12]
+        assert canonical_hash(engine.state_at(12)) == canonical_hash(states[12])
+        engine.apply_sequence(events[12:])
+        assert engine.state == states[len(events)]
+        engine.rewind_to(0)
+        assert engine.state == states[0]
+        engine.apply_sequence(events)
+        assert engine.state == states[len(events)]
+
+    # limits
+    shallow = OrgEngine(undo_depth=2)
+    shallow.initialize_state()
+    shallow.apply_sequence(events[:5])
+    for fn in (lambda: shallow.rewind_to(1), lambda: OrgEngine().step_back()):
+        try:
+            fn()
+            raise AssertionError("undo beyond retained depth")
+        except RuntimeError:
+            pass
+    shallow.rewind_to(3)
+    assert len(shallow.state.event_history) == 3
+
+    # a self-compress removes the role; its inverse restores it once
+    engine = OrgEngine(invariant_mode="cross_check", diagnostics_mode="cross_check",
+                       undo_depth=1)
+    engine.initialize_state()
+    engine.apply_sequence(events)
+    before = engine.state
+    _, result = engine.apply_event(CompressRolesEvent(
+        timestamp="u", sequence=len(events) + 1,
+        payload={"source_role_id": "r7a", "target_role_id": "r7a"}))
+    assert [rid for rid, _ in result.inverse.roles] == ["r7a"]
+    assert "r7a" not in engine.state.roles
+    engine.step_back()
+    assert engine.state == before
+    assert engine.get_diagnostics() == compute_diagnostics(before)
+    print("  [PASS]")
+    return True
+
+
+def test_13_state_delta_describes_change() -> bool:
+    """Result deltas match a full before/after diff, on every path."""
+    _header("Test 13 -- Structured state deltas")
+    rng = random.Random(13)
+    events = _build_stream()
+    engine = OrgEngine()
+    engine.initialize_state()
+    engine.apply_sequence(events[:10])
+    seq = 10
+    stream = list(events[10:])
+    for step in range(80):
+        roles = sorted(engine.state.roles)
+        a, b = rng.sample(roles, 2)
+        seq += 1
+        if stream:
+            event = stream.pop(0)
+        elif step % 20 == 19:
+            event = CompressRolesEvent(timestamp="d", sequence=seq, payload={
+                "source_role_id": a, "target_role_id": b})
+        else:
+            event = AddDependencyEvent(timestamp="d", sequence=seq, payload={
+                "from_role_id": a, "to_role_id": b,
+                "dependency_type": rng.choice(["operational", "governance"])})
+
+        prev = engine.state
+        try:
+            new, result = engine.apply_event(event)
+        except (InvariantViolationError, ValueError):
+            seq -= 1
+            continue
+        d = result.delta
+        assert set(d.roles_added) == set(new.roles) - set(prev.roles)
+        assert set(d.roles_removed) == set(prev.roles) - set(new.roles)
+        assert set(d.roles_modified) == {
+            rid for rid in set(prev.roles) & set(new.roles)
+            if prev.roles[rid] != new.roles[rid]
+        }
+        net_added = Counter(map(_key, new.dependencies)) - Counter(map(_key, prev.dependencies))
+        net_removed = Counter(map(_key, prev.dependencies)) - Counter(map(_key, new.dependencies))
+        ev = d.to_event_delta()
+        assert Counter(ev.edges_added) - Counter(ev.edges_removed) == net_added
+        assert Counter(ev.edges_removed) - Counter(ev.edges_added) == net_removed
+        assert d.structural_debt_delta == new.structural_debt - prev.structural_debt
+        assert dict(d.constraint_deltas) == {
+            k: v for k, v in (
+                (k, getattr(new.constraint_vector, k) - getattr(prev.constraint_vector, k))
+                for k in ("capital", "talent", "time", "political_cost")
+            ) if v
+        }
+        # in-place path yields the same (serializable) result
+        scratch = prev.fork()
+        same = apply_event_in_place(scratch, event)
+        assert same == result
+        assert json.dumps(same.to_dict(), sort_keys=True) == \
+            json.dumps(result.to_dict(), sort_keys=True)
+
+    # to_dict == asdict minus the inverse, with the delta's JSON form
+    engine = OrgEngine()
+    engine.initialize_state()
+    for event in events:
+        _, result = engine.apply_event(event)
+        data = result.to_dict()
+        assert json.loads(json.dumps(data)) == data
+        assert "inverse" not in data
+        assert data["delta"] == result.delta.to_dict()
+        expected = dataclasses.asdict(result)
+        del expected["inverse"], expected["delta"]
+        assert {k: v for k, v in data.items() if k != "delta"} == expected
+    assert TransitionResult().to_dict()["delta"] is None
+
+    # a self-compress lists its role once, so the incremental counts
+    # still see the last active role being deactivated
+    def ev(cls, seq, **payload) -> BaseEvent:
+        return cls(timestamp="s", sequence=seq, payload=payload)
+    role = dict(name="X", purpose="p", responsibilities=["x"],
+                required_inputs=[], produced_outputs=[])
+    for mode in ("full", "incremental", "cross_check"):
+        engine = OrgEngine(invariant_mode=mode)
+        engine.initialize_state()
+        engine.apply_sequence([
+            ev(InitializeConstantsEvent, 1, shock_deactivation_threshold=5),
+            ev(AddRoleEvent, 2, id="a", **role),
+            ev(AddRoleEvent, 3, id="b", **role),
+        ])
+        _, result = engine.apply_event(ev(
+            CompressRolesEvent, 4, source_role_id="b", target_role_id="b"))
+        assert result.delta.roles_removed == ("b",)
+        assert result.delta.to_event_delta().role_ids == ("b",)
+        try:
+            engine.apply_event(ev(InjectShockEvent, 5, target_role_id="a", magnitude=6))
+            raise AssertionError(f"{mode}: last active role deactivated")
+        except InvariantViolationError as exc:
+            assert exc.rule == "no_active_roles", (mode, exc)
+    print("  [PASS]")
+    return True
+
+
+def _key(edge: DependencyEdge) -> tuple:
+    return (edge.from_role_id, edge.to_role_id, edge.dependency_type, edge.critical)
+
+
+def test_14_scenario_tree_matches_sequential() -> bool:
+    """Every branch == a fresh engine running prefix + its suffixes."""
+    _header("Test 14 -- Engine forks and scenario trees")
+    events = _build_stream()
+    prefix, tail = events[:20], events[20:]
+
+    def ev(cls, **payload) -> BaseEvent:
+        return cls(timestamp="w", payload=payload)
+
+    suffixes = {
+        "tail": (None, tail),
+        "shock_r1": (None, [ev(InjectShockEvent, target_role_id="r1", magnitude=9)]),
+        "merge": (None, [ev(CompressRolesEvent, source_role_id="r6",
+                            target_role_id="r0", compressed_name="M")]),
+        "merge_shock": ("merge", [ev(InjectShockEvent, target_role_id="r0",
+                                     magnitude=3)]),
+        "bad": (None, [ev(AddDependencyEvent, from_role_id="r0",
+                          to_role_id="missing")]),
+        "after_bad": ("bad", tail),
+    }
+    for history_mode in ("inline", "log"):
+        tree = ScenarioTree.from_prefix(prefix, history_mode=history_mode)
+        root_hash = tree.root.state_hash()
+        for name, (parent, suffix) in suffixes.items():
+            tree.branch(name, suffix, parent=parent or "")
+        outcomes = tree.run()
+        assert tree.root.state_hash() == root_hash   # prefix untouched
+
+        for name, (parent, suffix) in suffixes.items():
+            chain = list(suffix)
+            while parent:
+                chain = suffixes[parent][1] + chain
+                parent = suffixes[parent][0]
+            reference = OrgEngine(history_mode=history_mode)
+            reference.initialize_state()
+            try:
+                reference.apply_sequence(prefix + [
+                    dataclasses_replace(e, sequence=len(prefix) + i + 1)
+                    for i, e in enumerate(chain)
+                ])
+            except Exception:
+                assert not outcomes[name].ok, name
+                continue
+            out = outcomes[name]
+            assert out.ok, (name, out.error)
+            assert out.state_hash == canonical_hash(reference.state), name
+            assert out.diagnostics == compute_diagnostics(reference.state)
+            assert out.structural_debt == reference.state.structural_debt
+            assert out.sequence == len(prefix) + len(chain)
+        assert "parent branch 'bad' failed" in outcomes["after_bad"].error
+
+    # forks share entities and diverge independently
+    base = OrgEngine(history_mode="log", undo_depth=4)
+    base.initialize_state()
+    base.apply_sequence(prefix)
+    a, b = base.fork(), base.fork()
+    assert all(a.state.roles[r] is base.state.roles[r] for r in base.state.roles)
+    a.apply_event(dataclasses_replace(tail[0], sequence=len(prefix) + 1))
+    b.apply_event(InjectShockEvent(timestamp="w", sequence=len(prefix) + 1,
+                                   payload={"target_role_id": "r1", "magnitude": 1}))
+    assert len(a.state.event_history) == len(b.state.event_history) == len(prefix) + 1
+    assert a.state.event_history[-1] != b.state.event_history[-1]
+    assert base.last_sequence == len(prefix)
+    a.step_back()
+    assert a.state_hash() == base.state_hash()
+    print("  [PASS]")
+    return True
+
+
+def _chain_org(n_roles: int) -> OrgEngine:
+    """Engine holding a chain of *n_roles* roles with 2 * n_roles edges."""
+    events = [InitializeConstantsEvent(timestamp="t", sequence=1, payload={})]
+
+    def add(cls, **payload) -> None:
+        events.append(cls(timestamp="t", sequence=len(events) + 1, payload=payload))
+
+    for i in range(n_roles):
+        add(AddRoleEvent, id=f"r{i}", name="R", purpose="p", responsibilities=["x"],
+            required_inputs=[f"o{i}"], produced_outputs=[f"o{i}"])
+        if i:
+            for critical in (False, i % 3 == 0):
+                add(AddDependencyEvent, from_role_id=f"r{i - 1}", to_role_id=f"r{i}",
+                    critical=critical)
+    engine = OrgEngine()
+    engine.initialize_state()
+    engine.apply_batch(events)
+    engine.apply_event(InjectShockEvent(timestamp="t", sequence=len(events) + 1,
+                                        payload={"target_role_id": "r0", "magnitude": 1}))
+    engine.get_diagnostics()
+    return engine
+
+
+def test_15_cow_forks_are_flat() -> bool:
+    """Random writes + forks: CowDict == dict; fork memory independent of N."""
+    _header("Test 15 -- Copy-on-write containers and O(1) forks")
+    rng = random.Random(15)
+    for _ in range(40):
+        pairs = [(CowDict(), {})]
+        for _ in range(300):
+            cow, ref = pairs[rng.randrange(len(pairs))]
+            key, op = rng.randrange(40), rng.random()
+            if op < 0.5:
+                cow[key] = ref[key] = rng.randrange(1000)
+            elif op < 0.8 and key in ref:
+                del cow[key], ref[key]
+            elif op < 0.9 and len(pairs) < 12:
+                pairs.append((cow.fork(), dict(ref)))
+        for cow, ref in pairs:
+            assert list(cow.items()) == list(ref.items())
+            assert list(reversed(cow)) == list(reversed(ref))
+            assert len(cow) == len(ref) and cow == ref
+    items = CowSet("abc")
+    forked = items.fork()
+    forked.add("d")
+    items.discard("a")
+    assert items == {"b", "c"} and forked == {"a", "b", "c", "d"}
+
+    per_fork = {}
+    for n_roles in (250, 2000):
+        engine = _chain_org(n_roles)
+        engine.fork()  # first fork freezes the containers for sharing
+        tracemalloc.start()
+        forks = [engine.fork() for _ in range(20)]
+        per_fork[n_roles] = tracemalloc.get_traced_memory()[0] / len(forks)
+        tracemalloc.stop()
+        forks[0].apply_event(InjectShockEvent(
+            timestamp="t", sequence=engine.last_sequence + 1,
+            payload={"target_role_id": "r1", "magnitude": 1}))
+        assert forks[0].state_hash() != engine.state_hash()
+        assert forks[1].state_hash() == engine.state_hash()
+    assert per_fork[2000] < 1.5 * per_fork[250] + 1024, per_fork
+    print("  bytes per engine fork: "
+          + ", ".join(f"{n} roles -> {b:.0f}" for n, b in per_fork.items()))
+    print("  [PASS]")
+    return True
+
+
+def test_16_shock_sweep_matches_kernel() -> bool:
+    """Sweep numbers == apply_event(inject_shock) per role; state untouched."""
+    _header("Test 16 -- Shock sensitivity sweep")
+    rng = random.Random(16)
+    engine = OrgEngine()
+    engine.initialize_state()
+    engine.apply_sequence(_build_stream())
+    state = engine.state.fork()
+    ids = sorted(state.roles) + ["ghost"]
+    for _ in range(200):
+        a, b = rng.choice(ids), rng.choice(ids)   # incl. self-loops, dangling
+        state.dependencies.append(DependencyEdge(
+            a, b, rng.choice(["operational", "governance"]), rng.random() < 0.3,
+        ))
+    before = canonical_hash(state)
+
+    backends = [False, True] if _HAS_NUMPY else [False]
+    for magnitude in (3, 12, -4, 10**14):        # 10**14: checked-int path
+        expected = {}
+        for rid in state.roles:
+            event = InjectShockEvent(timestamp="s", sequence=1, payload={
+                "target_role_id": rid, "magnitude": magnitude,
+            })
+            new_state, result = apply_event(state, event)
+            expected[rid] = (
+                result.primary_debt, result.secondary_debt,
+                result.target_density, result.deactivated,
+                new_state.structural_debt,
+            )
+        for use_numpy in backends:
+            impacts = sweep_inject_shock(
+                state, magnitude, role_ids=state.roles, use_numpy=use_numpy,
+            )
+            assert len(impacts) == len(state.roles)
+            for x in impacts:
+                assert (x.primary_debt, x.secondary_debt, x.target_density,
+                        x.deactivated, x.resulting_debt) == expected[x.role_id]
+            ranks = [(-x.total_debt, -x.deactivation_risk, x.role_id) for x in impacts]
+            assert ranks == sorted(ranks)
+    assert canonical_hash(state) == before
+
+    active = {rid for rid, r in engine.state.roles.items() if r.active}
+    assert {x.role_id for x in sweep_inject_shock(engine.state, 5)} == active
+
+    # process pool: identical results
+    saved = shock_sweep.PARALLEL_MIN_ROLES
+    shock_sweep.PARALLEL_MIN_ROLES = 1
+    try:
+        pooled = sweep_inject_shock(state, 12, role_ids=state.roles, workers=2)
+    finally:
+        shock_sweep.PARALLEL_MIN_ROLES = saved
+    assert pooled == sweep_inject_shock(state, 12, role_ids=state.roles)
+    print("  [PASS]")
+    return True
+
+
+# ══════════════════════════════════════════════════════════════
+# Runner
+# ══════════════════════════════════════════════════════════════
+
+def main() -> None:
+    tests = [
+        test_01_cow_transitions_never_mutate_original,
+        test_02_trusted_replay_matches_strict,
+        test_03_incremental_invariants_match_full,
+        test_04_critical_index_matches_full_dfs,
+        test_05_edge_store_matches_list,
+        test_06_log_history_matches_inline,
+        test_07_apply_batch_atomic,
+        test_08_cached_serialization_identical,
+        test_09_columnar_graph_matches_reference,
+        test_10_incremental_diagnostics_match_full,
+        test_11_checkpoint_state_at,
+        test_12_step_back_restores_exact_states,
+        test_13_state_delta_describes_change,
+        test_14_scenario_tree_matches_sequential,
+        test_15_cow_forks_are_flat,
+        test_16_shock_sweep_matches_kernel,
+    ]
+    results = []
+    for fn in tests:
+        try:
+            results.append(fn())
+        except Exception as e:
+            print(f"\n[ERROR] {fn.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append(False)
+
+    passed = sum(results)
+    total = len(results)
+    print(f"\n{'='*60}")
+    print(f"  RESULTS: {passed}/{total} tests passed")
+    print(f"{'='*60}")
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,12 @@
 """
 Organizational Kernel — Snapshot Encoder / Decoder Tests
 
-14 deterministic tests:
+19 deterministic tests:
   1-8:   Core encode/decode/validation
   9-14:  File I/O and hash integrity
+  15-17: Binary snapshot codec
+  18:    Streaming decoder == decode_snapshot (results and errors)
+  19:    History-free reference snapshots, lazy rehydration
 
 Run:  py -3 -m org_kernel.test_snapshot
 """
@@ -32,12 +35,29 @@ from org_kernel.snapshot import (
     SerializationError,
     SnapshotError,
     decode_snapshot,
+    decode_snapshot_stream,
     encode_snapshot,
     export_snapshot_to_file,
     import_snapshot_from_file,
     restore_snapshot,
     snapshot_hash,
 )
+from org_kernel import snapshot, snapshot_binary
+from org_kernel.engine import OrgEngine
+from org_kernel.events import AddRoleEvent, InitializeConstantsEvent
+from org_kernel.snapshot_binary import (
+    decode_snapshot_binary,
+    encode_snapshot_binary,
+    restore_snapshot_binary,
+    snapshot_binary_to_json,
+    snapshot_json_to_binary,
+)
+from org_kernel.snapshot_ref import (
+    decode_snapshot_ref,
+    encode_snapshot_ref,
+    history_ref,
+    restore_snapshot_ref,
+)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -382,6 +402,316 @@ def test_14_hash_stability() -> bool:
     return True
 
 
+# ══════════════════════════════════════════════════════════════
+# Binary Codec Tests (15 – 17)
+# ══════════════════════════════════════════════════════════════
+
+def _rich_state() -> OrgState:
+    """Valid state whose history holds every JSON value kind."""
+    state = _make_valid_state()
+    state.event_history = [
+        {"event_type": "add_role", "seq": 1},
+        {"event_type": "x", "seq": 2, "payload": {
+            "list": [1, -2, 2**63 - 1, -(2**63), "é ✓", None, True, False, []],
+            "nested": {"a": {"b": ["c"]}, "empty": {}},
+        }},
+        {"event_type": "add_role", "seq": 3},
+    ]
+    state.roles["beta"] = Role(
+        id="beta", name="Béta ✓", purpose="Execute",
+        responsibilities=["build", "alpha"], required_inputs=[],
+        produced_outputs=["report"], scale_stage="seed", active=False,
+    )
+    return state
+
+
+def test_15_binary_roundtrip_matches_json() -> bool:
+    """Binary decode == JSON decode (hash), converters are lossless."""
+    _header("Test 15 — Binary snapshot roundtrip")
+    state = _rich_state()
+    data = encode_snapshot_binary(state)
+    decoded = decode_snapshot_binary(data)
+    assert snapshot_hash(decoded) == snapshot_hash(state)
+    assert decoded.event_history == decode_snapshot(encode_snapshot(state)).event_history
+    assert encode_snapshot_binary(decoded) == data
+    assert snapshot_json_to_binary(encode_snapshot(state)) == data
+    assert snapshot_binary_to_json(data) == encode_snapshot(state)
+    restore_snapshot_binary(encode_snapshot_binary(_make_valid_state()))
+
+    # > 127 strings: multi-byte varints, NumPy and pure-Python decoders
+    for i in range(300):
+        state.event_history.append({"event_type": f"e{i}", "seq": 10**i % 2**62})
+    big = encode_snapshot_binary(state)
+    saved = snapshot_binary._HAS_NUMPY
+    try:
+        for use_numpy in {False, saved}:
+            snapshot_binary._HAS_NUMPY = use_numpy
+            assert snapshot_hash(decode_snapshot_binary(big)) == snapshot_hash(state)
+    finally:
+        snapshot_binary._HAS_NUMPY = saved
+    print(f"  {len(data)} bytes binary vs {len(encode_snapshot(state))} bytes JSON")
+    print("  [PASS]")
+    return True
+
+
+def test_16_binary_strict_validation() -> bool:
+    """Floats, overflow, corruption and invariant failures are rejected."""
+    _header("Test 16 — Binary snapshot strict validation")
+    state = _rich_state()
+    state.event_history[1]["payload"]["nested"]["a"]["x"] = 1.5
+    try:
+        encode_snapshot_binary(state)
+        raise AssertionError("float accepted")
+    except SerializationError as e:
+        assert "$.event_history[1].payload.nested.a.x" in str(e), e
+        print(f"  Caught: {e}")
+
+    state = _make_valid_state()
+    state.structural_debt = 2**63
+    try:
+        decode_snapshot_binary(encode_snapshot_binary(state))
+        raise AssertionError("int64 overflow accepted")
+    except DeserializationError as e:
+        assert "structural_debt" in str(e)
+
+    data = encode_snapshot_binary(_rich_state())
+    flipped = bytearray(data)
+    flipped[len(data) // 2] ^= 0x01
+    for bad in (b"", data[:3], b"XXXX" + data[4:], data[:4] + b"\x09" + data[5:],
+                data[:-1], bytes(flipped), data[:-4] + b"\x00" + data[-4:]):
+        try:
+            decode_snapshot_binary(bad)
+            raise AssertionError(f"corrupt snapshot accepted: {bad[:8]!r}")
+        except DeserializationError:
+            pass
+    print("  [PASS]")
+    return True
+
+
+def test_17_binary_restore_validates_invariants() -> bool:
+    """restore_snapshot_binary fails exactly where restore_snapshot does."""
+    _header("Test 17 — Binary restore validates invariants")
+    state = _make_valid_state()
+    state.dependencies.append(DependencyEdge(
+        from_role_id="alpha", to_role_id="nonexistent",
+        dependency_type="operational", critical=False,
+    ))
+    for restore, payload in ((restore_snapshot, encode_snapshot(state)),
+                             (restore_snapshot_binary, encode_snapshot_binary(state))):
+        try:
+            restore(payload)
+            raise AssertionError("invalid state restored")
+        except InvariantViolationSnapshotError as e:
+            assert isinstance(e, SnapshotError)
+    print("  [PASS]")
+    return True
+
+
+# ══════════════════════════════════════════════════════════════
+# Streaming Decoder Test (18)
+# ══════════════════════════════════════════════════════════════
+
+def _outcome(decode, payload):
+    try:
+        return "ok", snapshot_hash(decode(payload))
+    except Exception as e:
+        return type(e).__name__, str(e)
+
+
+def test_18_streaming_decoder_matches_reference() -> bool:
+    """Same state or same exception (type + message) for every input."""
+    _header("Test 18 — Streaming decoder matches decode_snapshot")
+    good = encode_snapshot(_rich_state())
+    raw = json.loads(good)
+
+    def variant(edit) -> str:
+        doc = json.loads(good)
+        edit(doc)
+        return json.dumps(doc, ensure_ascii=False, sort_keys=True)
+
+    role = raw["roles"]["alpha"]
+    cases = [
+        good,
+        json.dumps(raw, indent=2),                       # whitespace
+        json.dumps(dict(reversed(list(raw.items())))),   # key order
+        variant(lambda d: d["constraint_vector"].update(capital=1.5)),
+        variant(lambda d: d["event_history"][1]["payload"].update(f=[0.5])),
+        good.replace('"seq":1', '"seq":NaN'),
+        good.replace('"seq":1', '"seq":1e3'),
+        variant(lambda d: d.update(structural_debt=2**63)),
+        variant(lambda d: d["constants"].update(shock_debt_base_multiplier=-(2**63) - 1)),
+        variant(lambda d: d.pop("scale_stage")),
+        variant(lambda d: d.update(extra=1)),
+        variant(lambda d: d["roles"]["alpha"].update(id="other")),
+        variant(lambda d: d["roles"]["alpha"].pop("name")),
+        variant(lambda d: d["roles"].update(alpha=[1])),
+        variant(lambda d: d.update(roles=[])),
+        variant(lambda d: d.update(dependencies={})),
+        variant(lambda d: d["dependencies"][0].pop("critical")),
+        variant(lambda d: d["dependencies"].append(7)),
+        variant(lambda d: d.update(event_history={})),
+        variant(lambda d: d.update(scale_stage=3)),
+        # an invalid role shadowed by a later duplicate key is accepted
+        good.replace('"roles":{', '"roles":{"alpha":{"bad":1},', 1),
+        good + " x",
+        good[:-1],
+        "[]",
+        "",
+        json.dumps({**raw, "roles": {"alpha": role, "alpha ": role}}),
+    ]
+    saved = snapshot._CHUNK
+    try:
+        # tiny chunks put a window boundary inside every kind of token
+        for chunk in (saved, 7, 1):
+            snapshot._CHUNK = chunk
+            for payload in cases + [good.replace('"Alpha"', '"Al},{ph\u00e4 \u4e2d"')]:
+                expected = _outcome(decode_snapshot, payload)
+                for source in (payload, payload.encode("utf-8")):
+                    assert _outcome(decode_snapshot_stream, source) == expected, \
+                        (chunk, payload[:80], expected)
+        assert _outcome(decode_snapshot_stream, b'{"roles":\xff}')[1].startswith(
+            "Invalid UTF-8 in snapshot")
+    finally:
+        snapshot._CHUNK = saved
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "snap.json"
+        for payload in (good, cases[3], ""):
+            path.write_text(payload, encoding="utf-8")
+            expected = _outcome(decode_snapshot, payload)
+            if expected[0] == "ok":
+                expected = _outcome(restore_snapshot, payload)
+            assert _outcome(import_snapshot_from_file, path) == expected
+        path.write_bytes(encode_snapshot_binary(_make_valid_state()))
+        assert snapshot_hash(import_snapshot_from_file(path)) == \
+            snapshot_hash(_make_valid_state())
+    print(f"  {len(cases)} inputs agree")
+    print("  [PASS]")
+    return True
+
+
+# ══════════════════════════════════════════════════════════════
+# Reference Snapshot Test (19)
+# ══════════════════════════════════════════════════════════════
+
+def _role_event(seq: int) -> AddRoleEvent:
+    return AddRoleEvent(timestamp=f"t{seq}", sequence=seq, payload={
+        "id": f"r{seq}", "name": f"Role {seq}", "purpose": "p",
+        "responsibilities": [f"duty {seq}"],
+    })
+
+
+def test_19_reference_snapshot_rehydrates_lazily() -> bool:
+    """event_history_ref: O(org) size, exact lazy rehydration, strict checks."""
+    _header("Test 19 — History-free reference snapshots")
+    engines = [OrgEngine(), OrgEngine(history_mode="log")]
+    for engine in engines:
+        engine.initialize_state()
+        engine.apply_event(InitializeConstantsEvent(timestamp="t1", sequence=1))
+        for seq in range(2, 40):
+            engine.apply_event(_role_event(seq))
+    state = engines[0].state
+    text = encode_snapshot_ref(state)
+    assert encode_snapshot_ref(engines[1].state) == text
+    assert "event_history\"" not in text
+    assert history_ref(state.event_history).last_sequence == 39
+    print(f"  {len(text)} bytes vs {len(encode_snapshot(state))} embedded")
+
+    calls = []
+
+    def loader(first: int, last: int) -> list:
+        calls.append((first, last))
+        return [e for e in state.event_history if first <= e["sequence"] <= last]
+
+    decoded = restore_snapshot_ref(text, loader)
+    assert len(decoded.event_history) == 39 and decoded.to_dict() == state.to_dict()
+    assert not calls, "history fetched before it was read"
+
+    # appends (engine transitions) and forks need no history
+    following = engines[0].fork()
+    following.apply_event(_role_event(40))
+    history = decoded.fork().event_history
+    history.append(following.state.event_history[-1])
+    assert history.digest == history_ref(following.state.event_history).digest
+    assert not calls
+
+    assert snapshot_hash(decoded) == snapshot_hash(state)
+    assert list(decoded.event_history) == list(state.event_history)
+    assert calls == [(1, 39)], calls
+
+    def short(first: int, last: int) -> list:
+        return loader(first, last)[:-1]
+
+    for bad_loader in (short, None):
+        lazy = decode_snapshot_ref(text, bad_loader)
+        try:
+            list(lazy.event_history)
+            raise AssertionError("unverifiable history accepted")
+        except DeserializationError as e:
+            print(f"  Caught: {e}")
+
+    ref = json.loads(text)["event_history_ref"]
+    for bad in (
+        encode_snapshot(state),
+        text.replace(ref["digest"], ref["digest"].upper()),
+        text.replace('"count":39', '"count":-1'),
+        text.replace('"count":39', '"count":3.9'),
+    ):
+        try:
+            decode_snapshot_ref(bad, loader)
+            raise AssertionError("bad reference snapshot accepted")
+        except DeserializationError:
+            pass
+    print("  [PASS]")
+    return True
+
+
+def test_20_engine_resumes_from_restored_state() -> bool:
+    """restore_state(): continue after a reference snapshot, no replay."""
+    _header("Test 20 — Engine resumes from a restored snapshot")
+    full = OrgEngine()
+    full.initialize_state()
+    full.apply_event(InitializeConstantsEvent(timestamp="t1", sequence=1))
+    for seq in range(2, 30):
+        full.apply_event(_role_event(seq))
+    text = encode_snapshot_ref(full.state)
+    entries = list(full.state.event_history)
+
+    def loader(first: int, last: int) -> list:
+        return [e for e in entries if first <= e["sequence"] <= last]
+
+    for seq in range(30, 35):
+        full.apply_event(_role_event(seq))
+    for mode in ("inline", "log"):
+        engine = OrgEngine(history_mode=mode, undo_depth=4)
+        engine.restore_state(restore_snapshot_ref(text, loader), 29)
+        assert engine.last_sequence == 29
+        try:
+            engine.step_back()
+            raise AssertionError("undo crossed the restore point")
+        except RuntimeError:
+            pass
+        engine.apply_batch([_role_event(seq) for seq in range(30, 33)])
+        for seq in range(33, 35):
+            engine.apply_event(_role_event(seq))
+        assert engine.state_hash() == full.state_hash()
+        assert engine.get_diagnostics() == full.get_diagnostics()
+        assert engine.state.to_dict() == full.state.to_dict()
+        try:
+            engine.apply_event(_role_event(34))
+            raise AssertionError("stale sequence accepted")
+        except Exception as e:
+            assert "sequence" in str(e).lower(), e
+
+    try:
+        OrgEngine(checkpoint_every=4).restore_state(full.state, 34)
+        raise AssertionError("checkpointed engine restored")
+    except RuntimeError as e:
+        print(f"  Caught: {e}")
+    print("  [PASS]")
+    return True
+
+
 # ══════════════════════════════════════════════════════════════
 # Runner
 # ══════════════════════════════════════════════════════════════
@@ -402,6 +732,12 @@ def main() -> None:
         test_12_missing_required_field,
         test_13_hash_of_export_equals_memory,
         test_14_hash_stability,
+        test_15_binary_roundtrip_matches_json,
+        test_16_binary_strict_validation,
+        test_17_binary_restore_validates_invariants,
+        test_18_streaming_decoder_matches_reference,
+        test_19_reference_snapshot_rehydrates_lazily,
+        test_20_engine_resumes_from_restored_state,
     ]
     results = []
     for fn in tests:
@@ -4,16 +4,24 @@ Organizational Kernel — Centralized Transition Logic v1.1
 ALL state-mutation logic lives here.
 All math is pure integer. No float. No implicit casting.
 Constants read from state.constants (DomainConstants).
+
+Every handler also records an InverseDelta on its TransitionResult —
+what it overwrote — and revert_in_place() applies one, so a
+transition can be undone in O(delta).  The dispatcher derives the
+result's StateDelta (what changed) from it.
 """
 
 from __future__ import annotations
 
-from typing import Tuple
+import dataclasses
+from typing import Dict, Iterable, Optional, Tuple
 
+from .delta import InverseDelta, state_delta
 from .domain_types import (
     DependencyEdge, DomainConstants, OrgState, Role, TransitionResult,
     SCALE, checked_add, checked_mul, validate_role_id,
 )
+from .event_log import LoggedHistory, SharedHistory
 from .events import BaseEvent
 from .graph import compute_role_structural_density
 
@@ -27,35 +35,114 @@ def apply_event(
 ) -> Tuple[OrgState, TransitionResult]:
     """
     Apply *event* to *state* and return ``(new_state, result)``.
-    The original state is never mutated — a deep copy is made first.
+    The original state is never mutated — transitions work on a
+    structural-sharing fork and replace every entity they change.
+    """
+    new_state = state.fork()
+    result = apply_event_in_place(new_state, event)
+    return new_state, result
+
+
+def apply_event_in_place(state: OrgState, event: BaseEvent) -> TransitionResult:
     """
-    new_state = state.copy()
+    Apply *event* directly to *state*, which the caller must own.
 
+    Used by trusted replay paths that keep a single working state.
+    On failure the state may be partially updated and must be discarded.
+    """
     etype = event.event_type
+    history = state.event_history
+    history_count = len(history)
 
     if etype == "initialize_constants":
-        result = _apply_initialize_constants(new_state, event)
+        result = _apply_initialize_constants(state, event)
     elif etype == "add_role":
-        result = _apply_add_role(new_state, event)
+        result = _apply_add_role(state, event)
     elif etype == "remove_role":
-        result = _apply_remove_role(new_state, event)
+        result = _apply_remove_role(state, event)
     elif etype == "differentiate_role":
-        result = _apply_differentiate_role(new_state, event)
+        result = _apply_differentiate_role(state, event)
     elif etype == "compress_roles":
-        result = _apply_compress_roles(new_state, event)
+        result = _apply_compress_roles(state, event)
     elif etype == "apply_constraint_change":
-        result = _apply_constraint_change(new_state, event)
+        result = _apply_constraint_change(state, event)
     elif etype == "inject_shock":
-        result = _apply_inject_shock(new_state, event, state)
+        # Densities are read before any mutation, so the state itself
+        # serves as the pre-transition view.
+        result = _apply_inject_shock(state, event, state)
     elif etype == "add_dependency":
-        result = _apply_add_dependency(new_state, event)
+        result = _apply_add_dependency(state, event)
     else:
         raise ValueError(f"Unknown event type: {etype}")
 
+    inverse = dataclasses.replace(
+        result.inverse or InverseDelta(),
+        history_count=history_count,
+        history_digest=history.digest if isinstance(history, LoggedHistory) else None,
+    )
+
     # Record event in history
-    new_state.event_history.append(event.to_dict())
+    history.append(event.to_dict())
 
-    return new_state, result
+    return dataclasses.replace(
+        result, delta=state_delta(inverse, state), inverse=inverse,
+    )
+
+
+def revert_in_place(state: OrgState, inverse: InverseDelta) -> None:
+    """
+    Undo one transition on *state* (the state it produced, owned by
+    the caller) using the InverseDelta it recorded.
+    """
+    for rid, role in inverse.roles:
+        if role is None:
+            state.roles.pop(rid, None)
+        else:
+            state.roles[rid] = role
+    if inverse.edges_dropped:
+        state.dependencies.discard_ids(inverse.edges_dropped)
+    if inverse.edges_restored:
+        state.dependencies.restore(inverse.edges_restored)
+    if inverse.structural_debt is not None:
+        state.structural_debt = inverse.structural_debt
+    if inverse.constraint_vector is not None:
+        # copy: the inverse must stay pristine for later undos
+        state.constraint_vector = dataclasses.replace(inverse.constraint_vector)
+    if inverse.constants is not None:
+        state.constants = inverse.constants
+
+    history = state.event_history
+    if isinstance(history, LoggedHistory):
+        history.truncate(inverse.history_count, inverse.history_digest)
+    elif isinstance(history, SharedHistory):
+        history.truncate(inverse.history_count)
+    else:
+        del history[inverse.history_count:]
+
+
+# ---------------------------------------------------------------------------
+# Copy-on-write helpers
+# ---------------------------------------------------------------------------
+
+def _replace_role(state: OrgState, role_id: str, **changes) -> Role:
+    """
+    Replace a role with a modified copy. Role objects may be shared
+    with other state versions, so they are never mutated in place.
+    """
+    role = dataclasses.replace(state.roles[role_id], **changes)
+    state.roles[role_id] = role
+    return role
+
+
+def _prior_roles(
+    state: OrgState, role_ids: Iterable[str],
+) -> Tuple[Tuple[str, Optional[Role]], ...]:
+    """Current value of each role id (None if absent), ids deduplicated."""
+    prior: Dict[str, Optional[Role]] = {}
+    for rid in role_ids:
+        if rid not in prior:
+            prior[rid] = state.roles.get(rid)
+    return tuple(prior.items())
 
 
 # ---------------------------------------------------------------------------
@@ -66,6 +153,7 @@ def _apply_initialize_constants(
     state: OrgState, event: BaseEvent,
 ) -> TransitionResult:
     p = event.payload
+    inverse = InverseDelta(constants=state.constants)
     state.constants = DomainConstants(
         differentiation_threshold=p.get(
             "differentiation_threshold",
@@ -92,7 +180,9 @@ def _apply_initialize_constants(
             state.constants.suppressed_differentiation_debt_increment,
         ),
     )
-    return TransitionResult(event_type="initialize_constants", success=True)
+    return TransitionResult(
+        event_type="initialize_constants", success=True, inverse=inverse,
+    )
 
 
 def _apply_add_role(state: OrgState, event: BaseEvent) -> TransitionResult:
@@ -114,20 +204,23 @@ def _apply_add_role(state: OrgState, event: BaseEvent) -> TransitionResult:
         active=True,
     )
     state.roles[role.id] = role
-    return TransitionResult(event_type="add_role", success=True)
+    return TransitionResult(
+        event_type="add_role", success=True,
+        inverse=InverseDelta(roles=((role_id, None),)),
+    )
 
 
 def _apply_remove_role(state: OrgState, event: BaseEvent) -> TransitionResult:
     role_id = event.payload["role_id"]
     if role_id not in state.roles:
         raise KeyError(f"Role {role_id!r} does not exist")
+    inverse = InverseDelta(
+        roles=((role_id, state.roles[role_id]),),
+        edges_restored=tuple(state.dependencies.incident_items(role_id)),
+    )
     del state.roles[role_id]
-    state.dependencies = [
-        d
-        for d in state.dependencies
-        if d.from_role_id != role_id and d.to_role_id != role_id
-    ]
-    return TransitionResult(event_type="remove_role", success=True)
+    state.dependencies.remove_incident(role_id)
+    return TransitionResult(event_type="remove_role", success=True, inverse=inverse)
 
 
 def _apply_differentiate_role(
@@ -156,6 +249,9 @@ def _apply_differentiate_role(
                     "differentiate_role event must provide 'new_roles' in payload"
                 )
 
+            inverse = InverseDelta(roles=_prior_roles(
+                state, [role_id] + [nr["id"] for nr in new_roles_data],
+            ))
             del state.roles[role_id]
             for nr in new_roles_data:
                 sub_id = nr["id"]
@@ -176,8 +272,10 @@ def _apply_differentiate_role(
                 event_type="differentiate_role",
                 success=True,
                 differentiation_executed=True,
+                inverse=inverse,
             )
         else:
+            inverse = InverseDelta(structural_debt=state.structural_debt)
             state.structural_debt = checked_add(
                 state.structural_debt,
                 c.suppressed_differentiation_debt_increment,
@@ -186,6 +284,7 @@ def _apply_differentiate_role(
                 event_type="differentiate_role",
                 success=True,
                 suppressed_differentiation=True,
+                inverse=inverse,
                 reason=(
                     f"capacity={capacity} "
                     f"< differentiation_min_capacity={c.differentiation_min_capacity}"
@@ -228,27 +327,28 @@ def _apply_compress_roles(
             f"{c.compression_max_combined_responsibilities}"
         )
 
-    tgt.name = p.get("compressed_name", tgt.name)
-    tgt.purpose = p.get("compressed_purpose", tgt.purpose)
-    tgt.responsibilities = combined
-    tgt.required_inputs = sorted(set(tgt.required_inputs + src.required_inputs))
-    tgt.produced_outputs = sorted(set(tgt.produced_outputs + src.produced_outputs))
+    inverse = InverseDelta(
+        roles=_prior_roles(state, (tgt_id, src_id)),  # src may be tgt
+        edges_restored=tuple(state.dependencies.incident_items(src_id)),
+    )
+    _replace_role(
+        state, tgt_id,
+        name=p.get("compressed_name", tgt.name),
+        purpose=p.get("compressed_purpose", tgt.purpose),
+        responsibilities=combined,
+        required_inputs=sorted(set(tgt.required_inputs + src.required_inputs)),
+        produced_outputs=sorted(set(tgt.produced_outputs + src.produced_outputs)),
+    )
 
     del state.roles[src_id]
-    for dep in state.dependencies:
-        if dep.from_role_id == src_id:
-            dep.from_role_id = tgt_id
-        if dep.to_role_id == src_id:
-            dep.to_role_id = tgt_id
-    # Remove self-loops
-    state.dependencies = [
-        d for d in state.dependencies if d.from_role_id != d.to_role_id
-    ]
+    # Rewire edges (new edge objects, same positions), then drop self-loops
+    state.dependencies.rewire(src_id, tgt_id)
 
     return TransitionResult(
         event_type="compress_roles",
         success=True,
         compression_executed=True,
+        inverse=inverse,
     )
 
 
@@ -257,6 +357,7 @@ def _apply_constraint_change(
 ) -> TransitionResult:
     p = event.payload
     cv = state.constraint_vector
+    inverse = InverseDelta(constraint_vector=dataclasses.replace(cv))
     cv.capital = checked_add(cv.capital, p.get("capital_delta", 0))
     cv.talent = checked_add(cv.talent, p.get("talent_delta", 0))
     cv.time = checked_add(cv.time, p.get("time_delta", 0))
@@ -266,7 +367,9 @@ def _apply_constraint_change(
     if cv.capital < 0 or cv.talent < 0 or cv.time < 0 or cv.political_cost < 0:
         raise OverflowError("Negative constraint overflow detected")
 
-    return TransitionResult(event_type="apply_constraint_change", success=True)
+    return TransitionResult(
+        event_type="apply_constraint_change", success=True, inverse=inverse,
+    )
 
 
 def _apply_inject_shock(
@@ -285,6 +388,8 @@ def _apply_inject_shock(
         raise KeyError(f"Role {target_id!r} does not exist")
 
     c = state.constants
+    prior_debt = state.structural_debt
+    prior_target = state.roles[target_id]
 
     # Compute structural density of target (int64 fixed-point)
     target_density = compute_role_structural_density(target_id, original_state)
@@ -300,12 +405,12 @@ def _apply_inject_shock(
     # Deactivate if magnitude exceeds threshold
     deactivated = False
     if magnitude > c.shock_deactivation_threshold:
-        state.roles[target_id].active = False
+        _replace_role(state, target_id, active=False)
         deactivated = True
 
     # Propagate to connected roles
     connected_ids = set()
-    for dep in original_state.dependencies:
+    for dep in original_state.dependencies.incident(target_id):
         if dep.from_role_id == target_id:
             connected_ids.add(dep.to_role_id)
         elif dep.to_role_id == target_id:
@@ -329,6 +434,10 @@ def _apply_inject_shock(
         primary_debt=primary_debt,
         secondary_debt=secondary_debt,
         target_density=target_density,
+        inverse=InverseDelta(
+            roles=((target_id, prior_target),) if deactivated else (),
+            structural_debt=prior_debt,
+        ),
     )
 
 
@@ -353,6 +462,9 @@ def _apply_add_dependency(
         dependency_type=p.get("dependency_type", "operational"),
         critical=p.get("critical", False),
     )
-    state.dependencies.append(dep)
+    eid = state.dependencies.append(dep)
 
-    return TransitionResult(event_type="add_dependency", success=True)
+    return TransitionResult(
+        event_type="add_dependency", success=True,
+        inverse=InverseDelta(edges_dropped=(eid,)),
+    )
@@ -9,7 +9,12 @@ v2: Concurrency control, idempotency, hash validation, observability.
 
 from .event_repository import EventRepository, reconstruct_event
 from .snapshot_repository import SnapshotRepository
-from .session import SimulationSession, SnapshotInconsistencyError, DeterminismError
+from .session import (
+    ChainIntegrityError,
+    DeterminismError,
+    SimulationSession,
+    SnapshotInconsistencyError,
+)
 from .drift import compare_states
 from .observability import SessionMetrics, collect_metrics
 
@@ -19,6 +24,7 @@ __all__ = [
     "SimulationSession",
     "SnapshotInconsistencyError",
     "DeterminismError",
+    "ChainIntegrityError",
     "compare_states",
     "reconstruct_event",
     "SessionMetrics",
@@ -5,6 +5,10 @@ Event Repository — sqlite3-backed event store.
 v2: Concurrency control (retry on IntegrityError),
     Idempotency (event_uuid dedup),
     Stream metadata (last_state_hash tracking).
+v3: Hash chain — each row stores chain_digest = event_log.chain_digest(
+    previous row's digest, canonical event bytes), and optionally the
+    post-event state_hash, so tamper detection and "has this stream
+    changed since digest X" need no replay.
 
 Stores events as JSON. Reconstructs proper event class instances
 on load (strict type dispatch, never generic BaseEvent).
@@ -25,6 +29,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from org_kernel.event_log import GENESIS_DIGEST, chain_digest
 from org_kernel.events import (
     AddDependencyEvent,
     AddRoleEvent,
@@ -42,6 +47,15 @@ _SCHEMA_PATH = Path(__file__).parent / "schema.sql"
 # Max retries for concurrent sequence conflicts
 _MAX_RETRIES: int = 3
 
+# Open upper bound for load_events ranges (sequences are int64)
+_MAX_SEQUENCE: int = 2**63 - 1
+
+# Columns added after schema v2; migrated in place on older DB files.
+_EVENT_COLUMNS = (
+    ("chain_digest", "TEXT"),
+    ("state_hash", "TEXT"),
+)
+
 # Strict event-type → class mapping.
 # Never fall back to generic BaseEvent — preserve polymorphism.
 _EVENT_CLASS_MAP = {
@@ -88,6 +102,10 @@ class EventRepository:
       - Idempotency via event_uuid (duplicate → return existing sequence)
       - Stream metadata CRUD (last_state_hash tracking)
 
+    v3 additions:
+      - Per-event hash chain (chain_digest) and optional state_hash
+      - chain_head / verify_chain / find_chain_digest
+
     Thread-safety: single-writer assumed, but retry provides resilience.
     All writes are transaction-wrapped for atomicity.
     """
@@ -101,6 +119,19 @@ class EventRepository:
     def _ensure_schema(self) -> None:
         schema_sql = _SCHEMA_PATH.read_text(encoding="utf-8")
         self._conn.executescript(schema_sql)
+        present = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(events)")
+        }
+        with self._conn:
+            for name, decl in _EVENT_COLUMNS:
+                if name not in present:
+                    self._conn.execute(
+                        f"ALTER TABLE events ADD COLUMN {name} {decl}"
+                    )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_event_chain "
+                "ON events(project_id, chain_digest)"
+            )
 
     # ------------------------------------------------------------------
     # Write (with concurrency + idempotency)
@@ -111,11 +142,15 @@ class EventRepository:
         project_id: str,
         event: BaseEvent,
         event_uuid: str = "",
+        state_hash: str = "",
     ) -> int:
         """
         Append a single event. Assigns next sequence atomically.
         Returns the assigned sequence number.
 
+        The row is chained to its predecessor (chain_digest);
+        *state_hash*, if given, records the post-event state hash.
+
         Idempotency: if event_uuid is provided and already exists,
         returns the existing sequence without inserting a duplicate.
 
@@ -131,23 +166,13 @@ class EventRepository:
         for attempt in range(_MAX_RETRIES):
             try:
                 with self._conn:
-                    seq = self._next_sequence(project_id)
+                    last, digest = self._chain_head(project_id)
+                    seq = last + 1
                     event_dict = event.to_dict()
-                    self._conn.execute(
-                        """
-                        INSERT INTO events
-                            (project_id, sequence, event_type, timestamp,
-                             event_uuid, payload_json)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            project_id,
-                            seq,
-                            event_dict["event_type"],
-                            event_dict["timestamp"],
-                            event_uuid or None,
-                            json.dumps(event_dict["payload"], ensure_ascii=False),
-                        ),
+                    self._insert(
+                        project_id, seq, event_dict, event_uuid or None,
+                        chain_digest(digest, dict(event_dict, sequence=seq)),
+                        state_hash or None,
                     )
                 return seq
             except sqlite3.IntegrityError:
@@ -159,51 +184,79 @@ class EventRepository:
         # Unreachable, but satisfies type checker
         raise RuntimeError("append_event: exhausted retries")  # pragma: no cover
 
-    def append_batch(self, project_id: str, events: List[BaseEvent]) -> List[int]:
+    def append_batch(
+        self,
+        project_id: str,
+        events: List[BaseEvent],
+        state_hash: str = "",
+    ) -> List[int]:
         """
         Append multiple events atomically inside a single transaction.
         Returns list of assigned sequence numbers.
 
         If any insert fails, the entire batch is rolled back —
-        sequence integrity is preserved.
+        sequence integrity is preserved.  *state_hash*, if given, is
+        recorded on the last event (the post-batch state).
         """
         sequences: List[int] = []
         with self._conn:
-            base_seq = self._next_sequence(project_id)
+            last, digest = self._chain_head(project_id)
             for i, event in enumerate(events):
-                seq = base_seq + i
+                seq = last + 1 + i
                 event_dict = event.to_dict()
-                self._conn.execute(
-                    """
-                    INSERT INTO events
-                        (project_id, sequence, event_type, timestamp,
-                         event_uuid, payload_json)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        project_id,
-                        seq,
-                        event_dict["event_type"],
-                        event_dict["timestamp"],
-                        event_dict.get("event_uuid") or None,
-                        json.dumps(event_dict["payload"], ensure_ascii=False),
-                    ),
+                digest = chain_digest(digest, dict(event_dict, sequence=seq))
+                self._insert(
+                    project_id, seq, event_dict,
+                    event_dict.get("event_uuid") or None, digest,
+                    (state_hash or None) if i == len(events) - 1 else None,
                 )
                 sequences.append(seq)
         return sequences
 
+    def _insert(
+        self,
+        project_id: str,
+        seq: int,
+        event_dict: dict,
+        event_uuid: Optional[str],
+        digest: str,
+        state_hash: Optional[str],
+    ) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO events
+                (project_id, sequence, event_type, timestamp,
+                 event_uuid, payload_json, chain_digest, state_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                project_id,
+                seq,
+                event_dict["event_type"],
+                event_dict["timestamp"],
+                event_uuid,
+                json.dumps(event_dict["payload"], ensure_ascii=False),
+                digest,
+                state_hash,
+            ),
+        )
+
     # ------------------------------------------------------------------
     # Read
     # ------------------------------------------------------------------
 
     def load_events(
-        self, project_id: str, after_sequence: int = 0,
+        self,
+        project_id: str,
+        after_sequence: int = 0,
+        up_to_sequence: Optional[int] = None,
     ) -> List[BaseEvent]:
         """
         Load events ordered by sequence.
 
         If after_sequence > 0, only events with sequence > after_sequence
-        are returned (useful for partial replay after snapshot).
+        are returned (useful for partial replay after snapshot); if
+        up_to_sequence is given, only those with sequence <= it.
 
         Returns fully-typed event instances — never raw dicts.
         """
@@ -211,10 +264,13 @@ class EventRepository:
             """
             SELECT event_type, timestamp, payload_json, sequence, event_uuid
             FROM events
-            WHERE project_id = ? AND sequence > ?
+            WHERE project_id = ? AND sequence > ? AND sequence <= ?
             ORDER BY sequence
             """,
-            (project_id, after_sequence),
+            (
+                project_id, after_sequence,
+                _MAX_SEQUENCE if up_to_sequence is None else up_to_sequence,
+            ),
         )
         result: List[BaseEvent] = []
         for row in cursor:
@@ -228,6 +284,34 @@ class EventRepository:
             result.append(reconstruct_event(event_dict))
         return result
 
+    def load_history(
+        self, project_id: str, first_sequence: int, last_sequence: int,
+    ) -> List[dict]:
+        """
+        Events first_sequence..last_sequence (inclusive) as history
+        entries (BaseEvent.to_dict()), for rehydrating reference
+        snapshots: functools.partial(repo.load_history, project_id).
+        """
+        cursor = self._conn.execute(
+            """
+            SELECT event_type, timestamp, payload_json, sequence, event_uuid
+            FROM events
+            WHERE project_id = ? AND sequence BETWEEN ? AND ?
+            ORDER BY sequence
+            """,
+            (project_id, first_sequence, last_sequence),
+        )
+        return [
+            reconstruct_event({
+                "event_type": row[0],
+                "timestamp": row[1],
+                "payload": json.loads(row[2]),
+                "sequence": row[3],
+                "event_uuid": row[4] or "",
+            }).to_dict()
+            for row in cursor
+        ]
+
     def get_last_sequence(self, project_id: str) -> int:
         """Return the highest sequence number for a project, or 0 if none."""
         cursor = self._conn.execute(
@@ -236,6 +320,102 @@ class EventRepository:
         )
         return cursor.fetchone()[0]
 
+    # ------------------------------------------------------------------
+    # Hash chain
+    # ------------------------------------------------------------------
+
+    def chain_head(self, project_id: str) -> Tuple[int, str]:
+        """
+        (last sequence, its chain_digest); (0, GENESIS_DIGEST) for an
+        empty stream.  A stream is unchanged since digest X exactly when
+        its head is still X — or, with appends allowed, when
+        find_chain_digest(X) is not None.
+        """
+        with self._conn:
+            return self._chain_head(project_id)
+
+    def find_chain_digest(self, project_id: str, digest: str) -> Optional[int]:
+        """Sequence whose chain_digest is *digest* (0 = genesis), or None."""
+        if digest == GENESIS_DIGEST:
+            return 0
+        with self._conn:
+            self._chain_head(project_id)  # chain rows written before v3
+        row = self._conn.execute(
+            "SELECT sequence FROM events "
+            "WHERE project_id = ? AND chain_digest = ?",
+            (project_id, digest),
+        ).fetchone()
+        return row[0] if row else None
+
+    def verify_chain(self, project_id: str) -> Optional[int]:
+        """
+        Recompute the hash chain from the stored events (no replay).
+        Returns None if every row matches, else the first sequence
+        whose stored digest differs or that breaks 1..N numbering.
+        Rows written before v3 are chained (and trusted) first.
+        """
+        with self._conn:
+            self._chain_head(project_id)
+        digest = GENESIS_DIGEST
+        for expected, (seq, stored, entry) in enumerate(
+            self._chain_rows(project_id), 1,
+        ):
+            digest = chain_digest(digest, entry)
+            if seq != expected or stored != digest:
+                return seq
+        return None
+
+    def load_state_hash(self, project_id: str, sequence: int) -> Optional[str]:
+        """Post-event state hash recorded with *sequence*, if any."""
+        row = self._conn.execute(
+            "SELECT state_hash FROM events WHERE project_id = ? AND sequence = ?",
+            (project_id, sequence),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _chain_head(self, project_id: str) -> Tuple[int, str]:
+        """Head of the chain, backfilling pre-v3 rows.  In a transaction."""
+        row = self._conn.execute(
+            "SELECT sequence, chain_digest FROM events "
+            "WHERE project_id = ? ORDER BY sequence DESC LIMIT 1",
+            (project_id,),
+        ).fetchone()
+        if row is None:
+            return 0, GENESIS_DIGEST
+        if row[1] is not None:
+            return row[0], row[1]
+        digest = GENESIS_DIGEST
+        updates = []
+        for seq, stored, entry in self._chain_rows(project_id):
+            digest = stored if stored is not None else chain_digest(digest, entry)
+            if stored is None:
+                updates.append((digest, project_id, seq))
+        self._conn.executemany(
+            "UPDATE events SET chain_digest = ? "
+            "WHERE project_id = ? AND sequence = ?",
+            updates,
+        )
+        return row[0], digest
+
+    def _chain_rows(self, project_id: str):
+        """(sequence, stored chain_digest, history entry) in order."""
+        cursor = self._conn.execute(
+            """
+            SELECT sequence, chain_digest, event_type, timestamp, payload_json
+            FROM events
+            WHERE project_id = ?
+            ORDER BY sequence
+            """,
+            (project_id,),
+        )
+        for seq, stored, etype, ts, payload in cursor:
+            yield seq, stored, {
+                "event_type": etype,
+                "payload": json.loads(payload),
+                "sequence": seq,
+                "timestamp": ts,
+            }
+
     # ------------------------------------------------------------------
     # Idempotency lookup
     # ------------------------------------------------------------------
@@ -316,16 +496,5 @@ class EventRepository:
     # Internal
     # ------------------------------------------------------------------
 
-    def _next_sequence(self, project_id: str) -> int:
-        """
-        Compute next sequence. MUST be called inside a transaction
-        (the caller's `with self._conn:` block ensures this).
-        """
-        cursor = self._conn.execute(
-            "SELECT COALESCE(MAX(sequence), 0) FROM events WHERE project_id = ?",
-            (project_id,),
-        )
-        return cursor.fetchone()[0] + 1
-
     def close(self) -> None:
         self._conn.close()
@@ -35,15 +35,13 @@ def collect_metrics(session: "SimulationSession") -> SessionMetrics:
 
     Performs a full replay to measure latency and verify determinism.
     """
-    from org_kernel.hashing import canonical_hash
-
     # Measure replay latency
     start = time.perf_counter()
     session.replay_full()
     elapsed_ms = (time.perf_counter() - start) * 1000.0
 
     diagnostics = session.get_diagnostics()
-    state_hash = canonical_hash(session._engine.state)
+    state_hash = session._engine.state_hash()
 
     return SessionMetrics(
         replay_latency_ms=round(elapsed_ms, 2),
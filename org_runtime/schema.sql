@@ -8,14 +8,31 @@ CREATE TABLE IF NOT EXISTS events (
     event_type    TEXT    NOT NULL,
     timestamp     TEXT,
     event_uuid    TEXT,
-    payload_json  TEXT    NOT NULL
+    payload_json  TEXT    NOT NULL,
+    chain_digest  TEXT,                     -- SHA-256(prev digest || event bytes)
+    state_hash    TEXT                      -- optional post-event state hash
 );
 
 CREATE TABLE IF NOT EXISTS snapshots (
     id            INTEGER PRIMARY KEY AUTOINCREMENT,
     project_id    TEXT    NOT NULL,
     sequence      INTEGER NOT NULL,
-    state_json    TEXT    NOT NULL,
+    state_json    TEXT    NOT NULL,         -- '' for delta rows
+    created_at    TEXT    NOT NULL,
+    kind          TEXT    NOT NULL DEFAULT 'full',  -- 'full' | 'delta'
+    base_sequence INTEGER,                  -- delta: previous snapshot
+    chain_depth   INTEGER NOT NULL DEFAULT 0,       -- deltas since full
+    delta_blob    BLOB                      -- delta: zlib(JSON diff)
+);
+
+-- Restore points: restorable snapshots (org_kernel.snapshot_ref) that
+-- session startup and replay_to_sequence resume from; only the newest
+-- restore_points_kept per project are retained (see snapshot_repository)
+CREATE TABLE IF NOT EXISTS restore_points (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id    TEXT    NOT NULL,
+    sequence      INTEGER NOT NULL,
+    snapshot_blob BLOB    NOT NULL,         -- zlib(encode_snapshot_ref)
     created_at    TEXT    NOT NULL
 );
 
@@ -37,9 +54,15 @@ CREATE UNIQUE INDEX IF NOT EXISTS idx_event_sequence
 CREATE UNIQUE INDEX IF NOT EXISTS idx_event_uuid
     ON events(project_id, event_uuid);
 
+-- idx_event_chain (project_id, chain_digest) is created by
+-- EventRepository after migrating older files.
+
 CREATE UNIQUE INDEX IF NOT EXISTS idx_snapshot_sequence
     ON snapshots(project_id, sequence);
 
+CREATE UNIQUE INDEX IF NOT EXISTS idx_restore_point_sequence
+    ON restore_points(project_id, sequence);
+
 -- Secondary indexes for analytics / future queries
 CREATE INDEX IF NOT EXISTS idx_event_type
     ON events(project_id, event_type);
@@ -12,10 +12,17 @@ Apply-before-persist order:
   4. snapshot if interval reached   — only if step 2 succeeded
 
 This guarantees that persisted events are always valid and replayable.
+
+Startup: each snapshot also saves a restore point (a reference
+snapshot, org_kernel.snapshot_ref).  initialize() / replay_full()
+resume from the newest restore point whose event_history_ref digest
+is the stored chain digest at its sequence and replay only the events
+after it; strict=True additionally replays from scratch and compares.
 """
 
 from __future__ import annotations
 
+from functools import partial
 from typing import List, Optional, Tuple
 
 import sys
@@ -27,21 +34,42 @@ from org_kernel.engine import OrgEngine
 from org_kernel.events import BaseEvent
 from org_kernel.domain_types import TransitionResult
 from org_kernel.hashing import canonical_hash
+from org_kernel.snapshot import SerializationError, SnapshotError
+from org_kernel.snapshot_ref import (
+    HistoryRef,
+    encode_snapshot_ref,
+    restore_snapshot_ref,
+)
 
 from .event_repository import EventRepository
 from .snapshot_repository import SnapshotRepository
 
 
 class SnapshotInconsistencyError(Exception):
-    """Raised when a stored snapshot doesn't match replayed state."""
+    """
+    Raised when stored snapshots don't match replayed state.
 
-    def __init__(self, project_id: str, sequence: int, diff_keys: list):
+    sequence / diff_keys describe the first divergent snapshot;
+    divergences lists (sequence, diff_keys) for every one; a stored
+    event that failed to replay appears as (sequence, [error]).
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        sequence: int,
+        diff_keys: list,
+        divergences: Optional[List[Tuple[int, list]]] = None,
+    ):
         self.project_id = project_id
         self.sequence = sequence
         self.diff_keys = diff_keys
+        self.divergences = divergences or [(sequence, diff_keys)]
+        count = len(self.divergences)
         super().__init__(
             f"Snapshot inconsistency at seq {sequence} for project "
             f"{project_id!r}: divergent keys {diff_keys}"
+            + (f" ({count} divergent snapshots)" if count > 1 else "")
         )
 
 
@@ -58,6 +86,17 @@ class DeterminismError(Exception):
         )
 
 
+class ChainIntegrityError(Exception):
+    """Raised when a stored event no longer matches the hash chain."""
+
+    def __init__(self, project_id: str, sequence: int):
+        self.project_id = project_id
+        self.sequence = sequence
+        super().__init__(
+            f"Event chain broken for project {project_id!r} at seq {sequence}"
+        )
+
+
 class SimulationSession:
     """
     Orchestrates the OrgEngine with persistent event/snapshot stores.
@@ -88,22 +127,21 @@ class SimulationSession:
     # Initialization
     # ------------------------------------------------------------------
 
-    def initialize(self) -> None:
+    def initialize(self, strict: bool = False) -> None:
         """
         Reconstruct state from persisted events.
 
-        Always replays from scratch (deterministic guarantee).
-        If a snapshot exists, verifies replay result against it.
-        """
-        events = self._event_repo.load_events(self._project_id)
-        self._current_sequence = self._event_repo.get_last_sequence(
-            self._project_id
-        )
+        Resumes from the newest usable restore point and replays only
+        the events after it; without one (or when the engine keeps
+        checkpoints, which need the whole timeline) every event is
+        replayed.  Persisted events were validated on append, so the
+        trusted replay mode is used (invariants checked at the end,
+        strict fallback on failure).
 
-        if events:
-            self._engine.replay(events)
-        else:
-            self._engine.initialize_state()
+        strict=True always replays from scratch and raises
+        DeterminismError if the restore point path disagrees.
+        """
+        self._reconstruct(strict)
 
     # ------------------------------------------------------------------
     # Event application (apply-before-persist)
@@ -136,62 +174,166 @@ class SimulationSession:
 
         # Step 2: Apply to engine (may raise)
         state, result = self._engine.apply_event(event)
+        state_hash = self._engine.state_hash()  # cached fragments
 
         # Step 3: Persist (only reached if step 2 succeeded)
         self._event_repo.append_event(
             self._project_id, event, event_uuid=event_uuid,
+            state_hash=state_hash,
         )
         self._current_sequence = seq
 
         # Step 4: Update stream metadata with hash
-        state_hash = canonical_hash(state)
         self._event_repo.update_metadata(
             self._project_id, seq, state_hash,
         )
 
         # Step 5: Auto-snapshot at interval
         if self._snapshot_interval > 0 and seq % self._snapshot_interval == 0:
-            self._snapshot_repo.save_snapshot(
-                self._project_id, seq, state.to_dict(),
-            )
+            self._save_snapshot(seq, state)
 
         return state.to_dict(), result
 
+    def apply_batch(
+        self,
+        events: List[BaseEvent],
+    ) -> Tuple["dict", List[TransitionResult]]:
+        """
+        Apply several events atomically, then persist them together.
+
+        Sequences are assigned consecutively. The engine validates every
+        event (same semantics as apply_event in a loop) but rolls back
+        the whole batch on failure, and the repository inserts the batch
+        in one transaction. Stream metadata is updated once; a snapshot
+        is saved at the end of the batch if it crossed an interval
+        boundary.
+        """
+        if not events:
+            return self._engine.state.to_dict(), []
+
+        first = self._current_sequence + 1
+        for i, event in enumerate(events):
+            event.sequence = first + i
+
+        state, results = self._engine.apply_batch(events, validate_each=True)
+
+        state_hash = self._engine.state_hash()
+        self._event_repo.append_batch(
+            self._project_id, events, state_hash=state_hash,
+        )
+        last = first + len(events) - 1
+        self._current_sequence = last
+
+        self._event_repo.update_metadata(self._project_id, last, state_hash)
+
+        interval = self._snapshot_interval
+        if interval > 0 and last // interval > (first - 1) // interval:
+            self._save_snapshot(last, state)
+
+        return state.to_dict(), results
+
     # ------------------------------------------------------------------
     # Replay
     # ------------------------------------------------------------------
 
-    def replay_full(self) -> dict:
+    def replay_full(self, strict: bool = False) -> dict:
         """
-        Full event-sourced reconstruction: reset engine, replay all
-        persisted events from scratch.
+        Event-sourced reconstruction of the engine, as initialize():
+        newest usable restore point + tail, or every event; strict=True
+        replays from scratch and checks the restore point path.
 
         Returns the final state dict.
         """
-        events = self._event_repo.load_events(self._project_id)
+        self._reconstruct(strict)
+        return self._engine.state.to_dict()
+
+    def _reconstruct(self, strict: bool) -> None:
         self._current_sequence = self._event_repo.get_last_sequence(
             self._project_id
         )
+        restored_hash = None
+        if self._engine.checkpoints is None:
+            if self._resume(self._engine, self._current_sequence) is not None:
+                restored_hash = self._engine.state_hash()
+                if not strict:
+                    return
+
+        events = self._event_repo.load_events(self._project_id)
         if events:
-            self._engine.replay(events)
+            self._engine.replay(events, trusted=True)
         else:
             self._engine.initialize_state()
-        return self._engine.state.to_dict()
+
+        if restored_hash is not None:
+            replayed_hash = self._engine.state_hash()
+            if replayed_hash != restored_hash:
+                raise DeterminismError(
+                    self._project_id, restored_hash, replayed_hash,
+                )
+
+    def _resume(self, engine: OrgEngine, last: int) -> Optional[int]:
+        """
+        Bring *engine* to sequence *last* from the newest restore point
+        at or before it that matches the stored chain, applying only the
+        events in between.  Returns the restore point's sequence, or
+        None if none could be used (the engine must then be replayed).
+        """
+        pid = self._project_id
+        loader = partial(self._event_repo.load_history, pid)
+        for seq, text in self._snapshot_repo.iter_restore_points(pid, last):
+            try:
+                state = restore_snapshot_ref(text, loader)
+            except SnapshotError:
+                continue
+            history = state.event_history
+            if (
+                len(history) != seq
+                or self._event_repo.find_chain_digest(pid, history.digest) != seq
+            ):
+                continue
+            tail = self._event_repo.load_events(
+                pid, after_sequence=seq, up_to_sequence=last,
+            )
+            engine.restore_state(state, seq)
+            if tail:
+                try:
+                    engine.apply_batch(tail)
+                except Exception:
+                    continue
+            return seq
+        return None
 
     def replay_to_sequence(self, target_sequence: int) -> dict:
         """
         Replay events up to (and including) a specific sequence number.
         Returns state dict at that point.
 
-        Uses a fresh engine internally to avoid disturbing current state.
+        If the session engine keeps checkpoints (checkpoint_every > 0)
+        and is in sync with the store, the state is rebuilt from the
+        nearest in-memory checkpoint.  Otherwise a fresh engine (so the
+        current state is undisturbed) resumes from the nearest restore
+        point at or before the target and applies only the events
+        after it — loaded by sequence range — replaying from the start
+        only when no restore point is usable.
         """
-        events = self._event_repo.load_events(self._project_id)
-        # Take only events up to target_sequence
-        events_subset = events[:target_sequence]
-
-        temp_engine = OrgEngine()
-        if events_subset:
-            temp_engine.replay(events_subset)
+        checkpoints = self._engine.checkpoints
+        if (
+            checkpoints is not None
+            and checkpoints.last_sequence == self._current_sequence
+        ):
+            target = max(0, min(target_sequence, self._current_sequence))
+            return self._engine.state_at(target).to_dict()
+
+        target = max(0, target_sequence)
+        temp_engine = OrgEngine(history_mode="log")
+        if self._resume(temp_engine, target) is not None:
+            return temp_engine.state.to_dict()
+
+        events = self._event_repo.load_events(
+            self._project_id, up_to_sequence=target,
+        )
+        if events:
+            temp_engine.replay(events, trusted=True)
         else:
             temp_engine.initialize_state()
         return temp_engine.state.to_dict()
@@ -206,6 +348,7 @@ class SimulationSession:
 
         Raises DeterminismError if mismatch.
         Returns True if consistent (or no metadata exists yet).
+        O(stream) replay — see verify_integrity() for the cheap check.
         """
         metadata = self._event_repo.load_metadata(self._project_id)
         if metadata is None:
@@ -215,7 +358,7 @@ class SimulationSession:
 
         # Full replay
         events = self._event_repo.load_events(self._project_id)
-        temp_engine = OrgEngine()
+        temp_engine = OrgEngine(history_mode="log")
         if events:
             temp_engine.replay(events)
         else:
@@ -230,6 +373,29 @@ class SimulationSession:
 
         return True
 
+    def verify_integrity(self) -> bool:
+        """
+        Cheap stream check without replay: recompute the event hash
+        chain, and compare the stream_metadata hash with the state_hash
+        recorded alongside that event.
+
+        Raises ChainIntegrityError if a stored event was altered,
+        removed or reordered, DeterminismError if the hashes differ.
+        Returns True otherwise.
+        """
+        broken = self._event_repo.verify_chain(self._project_id)
+        if broken is not None:
+            raise ChainIntegrityError(self._project_id, broken)
+
+        metadata = self._event_repo.load_metadata(self._project_id)
+        if metadata is None:
+            return True
+        stored_seq, stored_hash = metadata
+        recorded = self._event_repo.load_state_hash(self._project_id, stored_seq)
+        if recorded is not None and recorded != stored_hash:
+            raise DeterminismError(self._project_id, stored_hash, recorded)
+        return True
+
     # ------------------------------------------------------------------
     # Snapshot consistency verification
     # ------------------------------------------------------------------
@@ -238,43 +404,72 @@ class SimulationSession:
         """
         Verify all stored snapshots match replay results.
 
-        For each snapshot at sequence N:
-          1. Replay events 1..N
-          2. Compare replayed state.to_dict() with stored snapshot
-          3. Raise SnapshotInconsistencyError on mismatch
+        Single pass: the events are replayed once, in order, through
+        one engine (invariants checked after every event), and each
+        stored snapshot at sequence N is compared with the replayed
+        state.to_dict() as the replay passes N.  If a stored event fails
+        to apply, its sequence and the error are recorded as the final
+        divergence and the pass stops there: later snapshots cannot be
+        checked against a replay that did not get past it.
 
+        Raises SnapshotInconsistencyError listing every divergence.
         Returns True if all snapshots are consistent.
         """
-        all_events = self._event_repo.load_events(self._project_id)
         last_seq = self._event_repo.get_last_sequence(self._project_id)
-
-        # Check every snapshot that exists
-        for seq in range(1, last_seq + 1):
-            stored = self._snapshot_repo.load_snapshot_at(
-                self._project_id, seq,
-            )
-            if stored is None:
+        events = self._event_repo.load_events(
+            self._project_id, up_to_sequence=last_seq,
+        )
+        temp_engine = OrgEngine(history_mode="log")
+        temp_engine.initialize_state()
+
+        divergences: List[Tuple[int, list]] = []
+        applied = 0
+        for seq, stored in self._snapshot_repo.iter_snapshots(
+            self._project_id, last_seq,
+        ):
+            if seq < 1:
                 continue
-
-            # Replay up to this sequence
-            events_subset = all_events[:seq]
-            temp_engine = OrgEngine()
-            if events_subset:
-                temp_engine.replay(events_subset)
-            else:
-                temp_engine.initialize_state()
-
-            replayed = temp_engine.state.to_dict()
-
-            # Compare
-            diff_keys = _dict_diff_keys(stored, replayed)
+            chunk = []
+            while applied < len(events) and events[applied].sequence <= seq:
+                chunk.append(events[applied])
+                applied += 1
+            if chunk:
+                try:
+                    temp_engine.apply_batch(chunk, validate_each=True)
+                except Exception as exc:
+                    divergences.append(_replay_failure(temp_engine, chunk, exc))
+                    break
+
+            diff_keys = _dict_diff_keys(stored, temp_engine.state.to_dict())
             if diff_keys:
-                raise SnapshotInconsistencyError(
-                    self._project_id, seq, diff_keys,
-                )
+                divergences.append((seq, diff_keys))
 
+        if divergences:
+            seq, diff_keys = divergences[0]
+            raise SnapshotInconsistencyError(
+                self._project_id, seq, diff_keys, divergences,
+            )
         return True
 
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def _save_snapshot(self, seq: int, state) -> None:
+        """Snapshot *state* (after *seq*) and save it as a restore point."""
+        self._snapshot_repo.save_snapshot(self._project_id, seq, state.to_dict())
+        head_seq, digest = self._event_repo.chain_head(self._project_id)
+        if head_seq != seq:
+            return
+        ref = HistoryRef(
+            count=seq, first_sequence=1, last_sequence=seq, digest=digest,
+        )
+        try:
+            text = encode_snapshot_ref(state, ref)
+        except SerializationError:
+            return  # float-valued state: not restorable, replay instead
+        self._snapshot_repo.save_restore_point(self._project_id, seq, text)
+
     # ------------------------------------------------------------------
     # Observability
     # ------------------------------------------------------------------
@@ -305,3 +500,17 @@ def _dict_diff_keys(a: dict, b: dict) -> list:
     """Return list of top-level keys where dicts differ."""
     all_keys = set(a.keys()) | set(b.keys())
     return [k for k in sorted(all_keys) if a.get(k) != b.get(k)]
+
+
+def _replay_failure(engine: OrgEngine, chunk: list, exc: Exception) -> Tuple[int, list]:
+    """
+    (sequence, [error]) for the event of *chunk* that made apply_batch
+    raise *exc*.  apply_batch left *engine* untouched, so the chunk is
+    re-applied one event at a time to find it.
+    """
+    for event in chunk:
+        try:
+            engine.apply_event(event)
+        except Exception as event_exc:
+            return event.sequence, [f"{type(event_exc).__name__}: {event_exc}"]
+    return chunk[-1].sequence, [f"{type(exc).__name__}: {exc}"]
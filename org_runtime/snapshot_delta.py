@@ -0,0 +1,117 @@
+"""
+Snapshot Delta — structural diffs between consecutive state snapshots.
+
+A delta turns the previous snapshot's dict into the next one exactly
+(same keys, same key order, same list order):
+
+    {"keys":   [top-level keys of the new dict],
+     "values": {key: new value},              # scalars / replaced entries
+     "dicts":  {key: {"keys": ops, "set": {k: v}}},
+     "lists":  {key: ops}}
+
+Dict-valued entries (roles, constraint_vector) record only the entries
+that were added or changed, plus edit operations on their key order.
+List-valued entries (dependencies) record edit operations on the list.
+An edit operation is [i1, i2, items]: replace base[i1:i2] with items,
+with indexes into the base sequence (from difflib opcodes).
+
+    delta = diff_state(previous, current)
+    assert apply_delta(previous, delta) == current
+"""
+
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from typing import Any, List, Sequence
+
+
+def diff_state(base: dict, new: dict) -> dict:
+    """Delta that turns *base* into *new*."""
+    values: dict = {}
+    dicts: dict = {}
+    lists: dict = {}
+    for key, value in new.items():
+        old = base.get(key, _MISSING)
+        if _same(old, value):
+            continue
+        if isinstance(value, dict) and isinstance(old, dict):
+            dicts[key] = {
+                "keys": _ops(list(old), list(value)),
+                "set": {
+                    k: v for k, v in value.items()
+                    if not _same(old.get(k, _MISSING), v)
+                },
+            }
+        elif isinstance(value, list) and isinstance(old, list):
+            lists[key] = _ops(old, value)
+        else:
+            values[key] = value
+    return {"keys": list(new), "values": values, "dicts": dicts, "lists": lists}
+
+
+def apply_delta(base: dict, delta: dict) -> dict:
+    """The dict *delta* was diffed to; *base* is not modified."""
+    values, dicts, lists = delta["values"], delta["dicts"], delta["lists"]
+    out = {}
+    for key in delta["keys"]:
+        if key in values:
+            out[key] = values[key]
+        elif key in dicts:
+            old = base[key]
+            changed = dicts[key]["set"]
+            out[key] = {
+                k: changed[k] if k in changed else old[k]
+                for k in _patch(list(old), dicts[key]["keys"])
+            }
+        elif key in lists:
+            out[key] = _patch(base[key], lists[key])
+        else:
+            out[key] = base[key]
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Internal
+# ---------------------------------------------------------------------------
+
+_MISSING = object()
+
+
+def _same(a: Any, b: Any) -> bool:
+    # type check keeps True / 1 / 1.0 distinct so the JSON stays identical
+    return type(a) is type(b) and a == b
+
+
+def _ops(a: Sequence, b: Sequence) -> List[list]:
+    """Edit operations turning *a* into *b*."""
+    # trim the common prefix / suffix first: snapshots usually differ in
+    # a few places, and SequenceMatcher is superlinear on long inputs
+    n, m = len(a), len(b)
+    lo = 0
+    while lo < n and lo < m and _same(a[lo], b[lo]):
+        lo += 1
+    hi = 0
+    while hi < n - lo and hi < m - lo and _same(a[n - 1 - hi], b[m - 1 - hi]):
+        hi += 1
+    if lo == n - hi and lo == m - hi:
+        return []
+    # repr is hashable and type-exact (True / 1 / 1.0 / "1" all differ)
+    ka = [repr(x) for x in a[lo:n - hi]]
+    kb = [repr(x) for x in b[lo:m - hi]]
+    matcher = SequenceMatcher(None, ka, kb, autojunk=False)
+    return [
+        [lo + i1, lo + i2, list(b[lo + j1:lo + j2])]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _patch(a: Sequence, ops: List[list]) -> list:
+    out: list = []
+    pos = 0
+    for i1, i2, items in ops:
+        out.extend(a[pos:i1])
+        out.extend(items)
+        pos = i2
+    out.extend(a[pos:])
+    return out
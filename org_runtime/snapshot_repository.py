@@ -6,38 +6,92 @@ Snapshots capture OrgState.to_dict() AFTER a given event sequence.
 They exist for:
   1. Drift comparison between time points
   2. Consistency verification (compare replay result vs stored snapshot)
-  3. Future optimization (fast state reconstruction)
 
-Snapshots are NEVER used for direct state injection —
-state reconstruction always goes through engine.replay().
+Snapshots are NEVER used for direct state injection.  Fast startup
+uses restore points instead: reference snapshots
+(org_kernel.snapshot_ref, decoded with full validation) kept apart in
+restore_points.  Each is a full (compressed) state, so only a
+project's newest restore_points_kept (DEFAULT_RESTORE_POINTS_KEPT) are
+retained, pruned in the same transaction that saves a new one; time
+travel to a sequence before the oldest kept point replays from the
+first event.
+
+Storage: a snapshot is either "full" (state_json) or a "delta" — a
+zlib-compressed snapshot_delta.diff_state() against the previous
+snapshot of the project (base_sequence).  Every rebase_every-th
+snapshot of a chain is full again, so loading applies at most
+rebase_every - 1 deltas.  Loading any snapshot returns exactly the dict
+that was saved.
 """
 
 from __future__ import annotations
 
 import json
 import sqlite3
+import zlib
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .snapshot_delta import apply_delta, diff_state
 
 _SCHEMA_PATH = Path(__file__).parent / "schema.sql"
 
+# Columns added after schema v2; migrated in place on older DB files.
+_SNAPSHOT_COLUMNS = (
+    ("kind", "TEXT NOT NULL DEFAULT 'full'"),
+    ("base_sequence", "INTEGER"),
+    ("chain_depth", "INTEGER NOT NULL DEFAULT 0"),
+    ("delta_blob", "BLOB"),
+)
+
+DEFAULT_REBASE_EVERY = 10
+DEFAULT_RESTORE_POINTS_KEPT = 8
+
 
 class SnapshotRepository:
     """
     Snapshot store backed by sqlite3.
     Shares the same DB file as EventRepository.
+
+    rebase_every=N stores a full snapshot at least every N snapshots of
+    a project and deltas in between; N <= 1 stores every snapshot full.
+    restore_points_kept=N retains only a project's newest N restore
+    points; None keeps every one (storage then grows with the number of
+    snapshots).
     """
 
-    def __init__(self, db_path: str | Path) -> None:
+    def __init__(
+        self,
+        db_path: str | Path,
+        rebase_every: int = DEFAULT_REBASE_EVERY,
+        restore_points_kept: Optional[int] = DEFAULT_RESTORE_POINTS_KEPT,
+    ) -> None:
         self._db_path = str(db_path)
         self._conn = sqlite3.connect(self._db_path)
         self._conn.execute("PRAGMA journal_mode=WAL")
+        self._rebase_every = rebase_every
+        self._restore_points_kept = (
+            None if restore_points_kept is None else max(1, restore_points_kept)
+        )
+        # project_id -> (sequence, row id, JSON) of the last snapshot
+        # saved or loaded, so consecutive deltas need not walk the chain
+        self._last: Dict[str, Tuple[int, int, str]] = {}
         self._ensure_schema()
 
     def _ensure_schema(self) -> None:
         schema_sql = _SCHEMA_PATH.read_text(encoding="utf-8")
         self._conn.executescript(schema_sql)
+        present = {
+            row[1]
+            for row in self._conn.execute("PRAGMA table_info(snapshots)")
+        }
+        with self._conn:
+            for name, decl in _SNAPSHOT_COLUMNS:
+                if name not in present:
+                    self._conn.execute(
+                        f"ALTER TABLE snapshots ADD COLUMN {name} {decl}"
+                    )
 
     # ------------------------------------------------------------------
     # Write
@@ -53,28 +107,137 @@ class SnapshotRepository:
         Persist a state snapshot at the given sequence.
 
         Uses INSERT OR REPLACE to allow overwriting if re-snapshotting
-        the same sequence (e.g. during replay verification).
+        the same sequence (e.g. during replay verification).  A snapshot
+        past the project's latest one is stored as a delta against it
+        unless its chain is due a rebase; any other is stored full.
         """
         now = datetime.now(timezone.utc).isoformat()
+        text = json.dumps(state_dict, ensure_ascii=False)
         with self._conn:
-            self._conn.execute(
+            self._detach_dependents(project_id, sequence)
+            row = self._conn.execute(
+                """
+                SELECT sequence, chain_depth FROM snapshots
+                WHERE project_id = ?
+                ORDER BY sequence DESC
+                LIMIT 1
+                """,
+                (project_id,),
+            ).fetchone()
+            if (
+                row is not None
+                and row[0] < sequence
+                and row[1] + 1 < self._rebase_every
+            ):
+                base = self._load(project_id, row[0])
+                delta = json.dumps(
+                    diff_state(base, state_dict), ensure_ascii=False,
+                )
+                values = (
+                    "delta", row[0], row[1] + 1,
+                    zlib.compress(delta.encode("utf-8")), "",
+                )
+            else:
+                values = ("full", None, 0, None, text)
+            cursor = self._conn.execute(
                 """
                 INSERT OR REPLACE INTO snapshots
-                    (project_id, sequence, state_json, created_at)
+                    (project_id, sequence, kind, base_sequence,
+                     chain_depth, delta_blob, state_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (project_id, sequence, *values, now),
+            )
+        self._last[project_id] = (sequence, cursor.lastrowid, text)
+
+    def _detach_dependents(self, project_id: str, sequence: int) -> None:
+        """Store deltas based on *sequence* full before it is replaced."""
+        rows = self._conn.execute(
+            "SELECT sequence FROM snapshots "
+            "WHERE project_id = ? AND base_sequence = ?",
+            (project_id, sequence),
+        ).fetchall()
+        for (dependent,) in rows:
+            state = self._load(project_id, dependent)
+            self._conn.execute(
+                """
+                UPDATE snapshots
+                SET kind = 'full', base_sequence = NULL, chain_depth = 0,
+                    delta_blob = NULL, state_json = ?
+                WHERE project_id = ? AND sequence = ?
+                """,
+                (json.dumps(state, ensure_ascii=False), project_id, dependent),
+            )
+
+    def save_restore_point(
+        self,
+        project_id: str,
+        sequence: int,
+        snapshot_text: str,
+    ) -> None:
+        """
+        Persist an encode_snapshot_ref() text taken after *sequence*,
+        replacing one at the same sequence, and drop all but the
+        project's newest restore_points_kept in the same transaction.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        with self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO restore_points
+                    (project_id, sequence, snapshot_blob, created_at)
                 VALUES (?, ?, ?, ?)
                 """,
                 (
-                    project_id,
-                    sequence,
-                    json.dumps(state_dict, ensure_ascii=False),
-                    now,
+                    project_id, sequence,
+                    zlib.compress(snapshot_text.encode("utf-8")), now,
                 ),
             )
+            if self._restore_points_kept is None:
+                return
+            self._conn.execute(
+                """
+                DELETE FROM restore_points
+                WHERE project_id = ? AND sequence NOT IN (
+                    SELECT sequence FROM restore_points
+                    WHERE project_id = ?
+                    ORDER BY sequence DESC
+                    LIMIT ?
+                )
+                """,
+                (project_id, project_id, self._restore_points_kept),
+            )
 
     # ------------------------------------------------------------------
     # Read
     # ------------------------------------------------------------------
 
+    def iter_restore_points(
+        self, project_id: str, max_sequence: Optional[int] = None,
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        (sequence, snapshot_text) of the project's restore points,
+        newest first, optionally only those at or before *max_sequence*.
+        Each text is decompressed only when reached.
+        """
+        sql = "SELECT sequence FROM restore_points WHERE project_id = ?"
+        params: tuple = (project_id,)
+        if max_sequence is not None:
+            sql += " AND sequence <= ?"
+            params += (max_sequence,)
+        sequences = [
+            row[0]
+            for row in self._conn.execute(sql + " ORDER BY sequence DESC", params)
+        ]
+        for sequence in sequences:
+            row = self._conn.execute(
+                "SELECT snapshot_blob FROM restore_points "
+                "WHERE project_id = ? AND sequence = ?",
+                (project_id, sequence),
+            ).fetchone()
+            if row is not None:
+                yield sequence, zlib.decompress(row[0]).decode("utf-8")
+
     def load_latest_snapshot(
         self, project_id: str,
     ) -> Optional[Tuple[int, dict]]:
@@ -85,7 +248,7 @@ class SnapshotRepository:
         """
         cursor = self._conn.execute(
             """
-            SELECT sequence, state_json
+            SELECT sequence
             FROM snapshots
             WHERE project_id = ?
             ORDER BY sequence DESC
@@ -96,7 +259,37 @@ class SnapshotRepository:
         row = cursor.fetchone()
         if row is None:
             return None
-        return (row[0], json.loads(row[1]))
+        return (row[0], self._load(project_id, row[0]))
+
+    def iter_snapshots(
+        self, project_id: str, max_sequence: Optional[int] = None,
+    ) -> Iterator[Tuple[int, dict]]:
+        """
+        (sequence, state_dict) of every snapshot of the project in
+        sequence order, optionally only up to *max_sequence*.  One
+        query; each delta is applied to the snapshot before it.
+        """
+        sql = (
+            "SELECT sequence, kind, base_sequence, state_json, delta_blob "
+            "FROM snapshots WHERE project_id = ?"
+        )
+        params: tuple = (project_id,)
+        if max_sequence is not None:
+            sql += " AND sequence <= ?"
+            params += (max_sequence,)
+        rows = self._conn.execute(sql + " ORDER BY sequence", params).fetchall()
+        previous: Optional[Tuple[int, dict]] = None
+        for sequence, kind, base_sequence, state_json, blob in rows:
+            if kind == "full":
+                state = json.loads(state_json)
+            else:
+                if previous is not None and previous[0] == base_sequence:
+                    base = previous[1]
+                else:
+                    base = self._load(project_id, base_sequence)
+                state = apply_delta(base, json.loads(zlib.decompress(blob)))
+            previous = (sequence, state)
+            yield sequence, state
 
     def load_snapshot_at(
         self, project_id: str, sequence: int,
@@ -105,14 +298,49 @@ class SnapshotRepository:
         Load a snapshot at an exact sequence number.
         Returns state_dict or None.
         """
-        cursor = self._conn.execute(
-            "SELECT state_json FROM snapshots WHERE project_id = ? AND sequence = ?",
-            (project_id, sequence),
+        return self._load(project_id, sequence)
+
+    def _load(self, project_id: str, sequence: int) -> Optional[dict]:
+        """Reconstruct a snapshot: nearest full (or cached) base + deltas."""
+        deltas: List[bytes] = []
+        current = sequence
+        target_id = None
+        while True:
+            row = self._conn.execute(
+                """
+                SELECT id, kind, base_sequence, state_json, delta_blob
+                FROM snapshots WHERE project_id = ? AND sequence = ?
+                """,
+                (project_id, current),
+            ).fetchone()
+            if row is None:
+                if deltas:
+                    raise RuntimeError(
+                        f"Snapshot chain broken: project {project_id!r} "
+                        f"has no base snapshot at sequence {current}"
+                    )
+                return None
+            row_id, kind, base_sequence, state_json, blob = row
+            if target_id is None:
+                target_id = row_id
+            last = self._last.get(project_id)
+            if last is not None and last[:2] == (current, row_id):
+                state = json.loads(last[2])
+                break
+            if kind == "full":
+                state = json.loads(state_json)
+                break
+            deltas.append(blob)
+            current = base_sequence
+
+        if not deltas:
+            return state
+        for blob in reversed(deltas):
+            state = apply_delta(state, json.loads(zlib.decompress(blob)))
+        self._last[project_id] = (
+            sequence, target_id, json.dumps(state, ensure_ascii=False),
         )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return json.loads(row[0])
+        return state
 
     def close(self) -> None:
         self._conn.close()
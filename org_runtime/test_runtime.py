@@ -8,11 +8,18 @@ Scenario:
   Phase 3: Restart session (new engine instance), replay from DB
   Phase 4: Compare state equality
   Phase 5: Verify snapshot consistency
-  Phase 6: Drift analysis (seq 6 vs seq 16)
+  Phase 6: Drift analysis (seq 6 vs seq 16), checkpointed time travel
   Phase 7: Idempotency (duplicate event_uuid → single insert)
   Phase 8: Hash validation (stream_metadata matches replay hash)
   Phase 9: Observability (get_metrics returns valid data)
   Phase 10: Determinism verification
+  Phase 11: Atomic batch apply (all-or-nothing persistence)
+  Phase 12: Delta snapshots (exact reload, rebase, overwrite, migration)
+  Phase 13: Reference snapshots rehydrated from the event store
+  Phase 14: Event hash chain (cheap integrity, tamper detection, backfill)
+  Phase 15: Startup from restore points (tail replay, strict mode, fallback)
+  Phase 16: replay_to_sequence from the nearest restore point (range loads)
+  Phase 17: Single-pass snapshot consistency reporting every divergence
 
 Exit 0 on success, 1 on failure.
 """
@@ -21,9 +28,11 @@ from __future__ import annotations
 
 import json
 import os
+import sqlite3
 import sys
 import tempfile
 import uuid
+from functools import partial
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -35,12 +44,24 @@ from org_kernel.events import (
     InjectShockEvent,
     RemoveRoleEvent,
 )
+from org_kernel.invariants import InvariantViolationError
 from org_kernel.domain_types import DependencyEdge
 from org_kernel.hashing import canonical_hash
+from org_kernel.snapshot import snapshot_hash
+from org_kernel.snapshot_ref import (
+    encode_snapshot_ref,
+    history_ref,
+    restore_snapshot_ref,
+)
 
 from org_runtime.event_repository import EventRepository
 from org_runtime.snapshot_repository import SnapshotRepository
-from org_runtime.session import SimulationSession, DeterminismError
+from org_runtime.session import (
+    ChainIntegrityError,
+    DeterminismError,
+    SimulationSession,
+    SnapshotInconsistencyError,
+)
 from org_runtime.drift import compare_states
 
 
@@ -273,6 +294,19 @@ def _run_test(db_path: str) -> None:
     # Verify drift makes sense
     assert drift["role_count_delta"] == len(drift["added_roles"]) - len(drift["removed_roles"]), \
         "role_count_delta should match added - removed"
+
+    # Checkpointed engine answers from memory with the same result
+    session_cp = SimulationSession(
+        project_id="demo",
+        engine=OrgEngine(checkpoint_every=4),
+        event_repo=event_repo,
+        snapshot_repo=snapshot_repo,
+        snapshot_interval=5,
+    )
+    session_cp.initialize()
+    for seq in (0, 6, 16):
+        assert session_cp.replay_to_sequence(seq) == session2.replay_to_sequence(seq)
+    print("  Checkpointed replay_to_sequence matches full replay")
     print("\n  [PASS] Drift analysis verified")
 
     # ================================================================
@@ -400,11 +434,393 @@ def _run_test(db_path: str) -> None:
 
     print("\n  [PASS] Determinism verification passed")
 
+    # ================================================================
+    # PHASE 11: Atomic batch apply
+    # ================================================================
+    _header("Phase 11 -- Atomic Batch Apply")
+
+    batch_project = "batch_test"
+    session_batch = SimulationSession(
+        project_id=batch_project,
+        engine=OrgEngine(),
+        event_repo=event_repo,
+        snapshot_repo=snapshot_repo,
+        snapshot_interval=5,
+    )
+    session_batch.initialize()
+
+    batch_state, batch_results = session_batch.apply_batch(build_events())
+    assert len(batch_results) == len(build_events())
+    assert batch_state == state_after_16, "batch state differs from per-event apply"
+    assert event_repo.get_last_sequence(batch_project) == 16
+    assert session_batch.verify_determinism() is True
+    print(f"  16 events applied + persisted in one batch, state matches Phase 1")
+
+    # A failing batch leaves engine and DB untouched
+    bad_batch = [
+        AddRoleEvent(timestamp="b1", payload={
+            "id": "batch_ok", "name": "Ok", "purpose": "p",
+            "responsibilities": ["x"],
+        }),
+        AddRoleEvent(timestamp="b2", payload={
+            "id": "batch_orphan", "name": "Orphan", "purpose": "p",
+            "responsibilities": ["x"], "produced_outputs": ["nobody_reads"],
+        }),
+    ]
+    try:
+        session_batch.apply_batch(bad_batch)
+        print("  [FAIL] expected InvariantViolationError")
+        sys.exit(1)
+    except InvariantViolationError as exc:
+        print(f"  Rejected batch: {exc}")
+    assert event_repo.get_last_sequence(batch_project) == 16
+    assert session_batch.current_sequence == 16
+    assert session_batch.get_state() == state_after_16
+
+    print("\n  [PASS] Batch apply is atomic")
+
+    # ================================================================
+    # PHASE 12: Delta snapshots
+    # ================================================================
+    _header("Phase 12 -- Delta Snapshots")
+
+    conn = sqlite3.connect(db_path)
+    kinds = dict(conn.execute(
+        "SELECT sequence, kind FROM snapshots WHERE project_id = 'demo'"
+    ).fetchall())
+    conn.close()
+    assert kinds == {5: "full", 10: "delta", 15: "delta"}, kinds
+    print(f"  demo snapshots: {kinds}")
+
+    delta_fd, delta_db = tempfile.mkstemp(suffix=".db", prefix="org_delta_")
+    os.close(delta_fd)
+    try:
+        # A DB written before delta snapshots: legacy columns only
+        legacy = sqlite3.connect(delta_db)
+        legacy.execute(
+            "CREATE TABLE snapshots (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "project_id TEXT NOT NULL, sequence INTEGER NOT NULL, "
+            "state_json TEXT NOT NULL, created_at TEXT NOT NULL)"
+        )
+        engine = OrgEngine()
+        engine.initialize_state()
+        dicts = {}
+        for evt in loaded_events:
+            engine.apply_event(evt)
+            dicts[evt.sequence] = engine.state.to_dict()
+        legacy.execute(
+            "INSERT INTO snapshots (project_id, sequence, state_json, "
+            "created_at) VALUES ('p', 1, ?, 'then')",
+            (json.dumps(dicts[1]),),
+        )
+        legacy.commit()
+        legacy.close()
+
+        repo = SnapshotRepository(delta_db, rebase_every=4)
+        for seq in range(2, 17):
+            repo.save_snapshot("p", seq, dicts[seq])
+        repo.close()
+
+        repo = SnapshotRepository(delta_db, rebase_every=4)
+        rows = repo._conn.execute(
+            "SELECT sequence, kind, chain_depth FROM snapshots "
+            "WHERE project_id = 'p' ORDER BY sequence"
+        ).fetchall()
+        assert [k for _, k, _ in rows] == (
+            ["full", "delta", "delta", "delta"] * 4
+        ), rows
+        for seq in (16, 3, 9, 1, 10, 2):
+            assert json.dumps(repo.load_snapshot_at("p", seq)) == \
+                json.dumps(dicts[seq]), f"delta snapshot {seq} differs"
+        assert repo.load_latest_snapshot("p") == (16, dicts[16])
+        print(f"  16 snapshots (4 full + 12 delta) reload exactly")
+
+        # Overwriting a delta base keeps its dependents intact
+        repo.save_snapshot("p", 6, dicts[1])
+        assert repo.load_snapshot_at("p", 6) == dicts[1]
+        for seq in (7, 8):
+            assert repo.load_snapshot_at("p", seq) == dicts[seq]
+        print("  Overwritten base: dependents still reload exactly")
+        repo.close()
+    finally:
+        for path in (delta_db, delta_db + "-wal", delta_db + "-shm"):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    print("\n  [PASS] Delta snapshots verified")
+
+    # ================================================================
+    # PHASE 13: Reference snapshots
+    # ================================================================
+    _header("Phase 13 -- Reference Snapshots")
+
+    # canonical snapshots reject floats, so skip the constraint changes
+    ref_engine = OrgEngine()
+    ref_session = SimulationSession(
+        project_id="ref_demo",
+        engine=ref_engine,
+        event_repo=event_repo,
+        snapshot_repo=snapshot_repo,
+        snapshot_interval=0,
+    )
+    ref_session.initialize()
+    for evt in build_events():
+        if not isinstance(evt, ApplyConstraintChangeEvent):
+            ref_session.apply_event(evt)
+
+    ref_text = encode_snapshot_ref(ref_engine.state)
+    restored = restore_snapshot_ref(
+        ref_text, partial(event_repo.load_history, "ref_demo"),
+    )
+    assert restored.to_dict() == ref_engine.state.to_dict()
+    assert snapshot_hash(restored) == snapshot_hash(ref_engine.state)
+    print(f"  {len(ref_text)}-byte reference snapshot rehydrated "
+          f"{len(restored.event_history)} events from the event store")
+
+    print("\n  [PASS] Reference snapshots verified")
+
+    # ================================================================
+    # PHASE 14: Event hash chain
+    # ================================================================
+    _header("Phase 14 -- Event Hash Chain")
+
+    head_seq, head = event_repo.chain_head("demo")
+    assert head_seq == 16
+    assert head == history_ref(engine_verify.state.event_history).digest
+    assert event_repo.find_chain_digest("demo", head) == 16
+    assert event_repo.verify_chain("demo") is None
+    assert session2.verify_integrity() is True
+    assert event_repo.load_state_hash("batch_test", 16) == \
+        event_repo.load_metadata("batch_test")[1]
+    print(f"  chain head seq={head_seq} digest={head[:16]}... == engine history")
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute(
+            "UPDATE events SET payload_json = '{\"magnitude\": 6, "
+            "\"target_role_id\": \"role_1\"}' "
+            "WHERE project_id = 'demo' AND sequence = 11"
+        )
+    assert event_repo.verify_chain("demo") == 11
+    try:
+        session2.verify_integrity()
+        print("  [FAIL] expected ChainIntegrityError")
+        sys.exit(1)
+    except ChainIntegrityError as exc:
+        print(f"  Tampering detected: {exc}")
+
+    # rows written before the chain existed are chained on first use
+    with conn:
+        conn.execute(
+            "UPDATE events SET chain_digest = NULL WHERE project_id = 'ref_demo'"
+        )
+    conn.close()
+    ref_head = history_ref(ref_engine.state.event_history).digest
+    assert event_repo.chain_head("ref_demo") == (12, ref_head)
+    assert event_repo.verify_chain("ref_demo") is None
+
+    print("\n  [PASS] Event hash chain verified")
+
+    # ================================================================
+    # PHASE 15: Startup from restore points
+    # ================================================================
+    _header("Phase 15 -- Startup from Restore Points")
+
+    rp_engine = OrgEngine()
+    rp_session = SimulationSession(
+        project_id="restore_demo",
+        engine=rp_engine,
+        event_repo=event_repo,
+        snapshot_repo=snapshot_repo,
+        snapshot_interval=5,
+    )
+    rp_session.initialize()
+    for evt in build_events():
+        if not isinstance(evt, ApplyConstraintChangeEvent):
+            rp_session.apply_event(evt)
+    expected_hash = rp_engine.state_hash()
+    points = list(snapshot_repo.iter_restore_points("restore_demo"))
+    assert [seq for seq, _ in points] == [10, 5]
+
+    loads = []
+    load_events = event_repo.load_events
+
+    def _counting_load_events(project_id, after_sequence=0, up_to_sequence=None):
+        loads.append(after_sequence)
+        return load_events(project_id, after_sequence, up_to_sequence)
+
+    event_repo.load_events = _counting_load_events
+
+    def _start(strict=False, **engine_kwargs):
+        del loads[:]
+        engine = OrgEngine(**engine_kwargs)
+        session = SimulationSession(
+            project_id="restore_demo",
+            engine=engine,
+            event_repo=event_repo,
+            snapshot_repo=snapshot_repo,
+            snapshot_interval=5,
+        )
+        session.initialize(strict=strict)
+        return engine, session
+
+    fast_engine, fast_session = _start(history_mode="log")
+    assert loads == [10], loads
+    assert fast_engine.state_hash() == expected_hash
+    assert fast_session.get_state() == rp_engine.state.to_dict()
+    print(f"  restored seq 10, replayed {12 - 10} tail events, hash matches")
+
+    _start(strict=True)
+    assert loads == [10, 0], loads
+    _start(checkpoint_every=4)
+    assert loads == [0], loads
+    print("  strict mode and checkpointed engines replay from scratch")
+
+    # a restore point that disagrees with its events fails strict startup
+    text10 = points[0][1]
+    forged = text10.replace('"name":"Role 4"', '"name":"Role 4b"')
+    assert forged != text10
+    snapshot_repo.save_restore_point("restore_demo", 10, forged)
+    assert _start()[0].state_hash() != expected_hash
+    try:
+        _start(strict=True)
+        print("  [FAIL] expected DeterminismError")
+        sys.exit(1)
+    except DeterminismError as exc:
+        print(f"  Strict startup caught forged restore point: {exc}")
+
+    # one whose history digest is not in the chain is skipped
+    unchained = text10.replace(
+        json.loads(text10)["event_history_ref"]["digest"], "0" * 64,
+    )
+    snapshot_repo.save_restore_point("restore_demo", 10, unchained)
+    fallback_engine, fallback_session = _start()
+    assert loads == [5], loads
+    assert fallback_engine.state_hash() == expected_hash
+    fallback_session.apply_event(InjectShockEvent(
+        timestamp="2026-01-01T00:16:00Z",
+        payload={"target_role_id": "role_4", "magnitude": 1},
+    ))
+    assert fallback_session.current_sequence == 13
+    print("  unchained restore point skipped, resumed from seq 5")
+
+    # retention is bounded: saving prunes all but the newest N points
+    pruning_repo = SnapshotRepository(db_path, restore_points_kept=1)
+    pruning_repo.save_restore_point("pruning_demo", 5, points[1][1])
+    assert [seq for seq, _ in pruning_repo.iter_restore_points("pruning_demo")] == [5]
+    pruning_repo.save_restore_point("pruning_demo", 10, text10)
+    assert [seq for seq, _ in pruning_repo.iter_restore_points("pruning_demo")] == [10]
+    pruning_repo.close()
+    print("  restore_points_kept=1 keeps only the newest restore point")
+
+    print("\n  [PASS] Restore point startup verified")
+
+    # ================================================================
+    # PHASE 16: Time travel from the nearest restore point
+    # ================================================================
+    _header("Phase 16 -- replay_to_sequence from Restore Points")
+
+    snapshot_repo.save_restore_point("restore_demo", 10, text10)
+    all_rp_events = load_events("restore_demo")
+    for target in range(0, 15):
+        reference = OrgEngine(history_mode="log")
+        if target:
+            reference.replay(all_rp_events[:target])
+        else:
+            reference.initialize_state()
+        del loads[:]
+        assert fallback_session.replay_to_sequence(target) == \
+            reference.state.to_dict(), target
+        assert loads == [0 if target < 5 else 5 if target < 10 else 10], \
+            (target, loads)
+    assert fallback_session.current_sequence == 13
+    assert fallback_engine.last_sequence == 13
+    print("  targets 0..14 match full replay; events loaded only after "
+          "the nearest restore point")
+
+    # outside the retained window time travel replays from scratch
+    pruning_repo = SnapshotRepository(db_path, restore_points_kept=1)
+    pruning_repo.save_restore_point("restore_demo", 10, text10)
+    assert [seq for seq, _ in snapshot_repo.iter_restore_points("restore_demo")] == [10]
+    for target, after in ((7, 0), (12, 10)):
+        del loads[:]
+        reference = OrgEngine(history_mode="log")
+        reference.replay(all_rp_events[:target])
+        assert fallback_session.replay_to_sequence(target) == \
+            reference.state.to_dict(), target
+        assert loads == [after], (target, loads)
+    pruning_repo.close()
+    del event_repo.load_events
+    assert len(event_repo.load_events("restore_demo", 5, 8)) == 3
+    print("  restore_points_kept=1 pruned seq 5; older targets replay from scratch")
+
+    print("\n  [PASS] Range-bounded time travel verified")
+
+    # ================================================================
+    # PHASE 17: Single-pass snapshot consistency
+    # ================================================================
+    _header("Phase 17 -- Single-Pass Snapshot Consistency")
+
+    for pid in ("demo", "batch_test", "restore_demo"):
+        stored = list(snapshot_repo.iter_snapshots(pid))
+        assert stored and stored == [
+            (seq, snapshot_repo.load_snapshot_at(pid, seq)) for seq, _ in stored
+        ]
+    assert fallback_session.verify_snapshot_consistency() is True
+
+    for seq in (5, 10):
+        bad = snapshot_repo.load_snapshot_at("restore_demo", seq)
+        bad["structural_debt"] += 7
+        snapshot_repo.save_snapshot("restore_demo", seq, bad)
+    try:
+        fallback_session.verify_snapshot_consistency()
+        print("  [FAIL] expected SnapshotInconsistencyError")
+        sys.exit(1)
+    except SnapshotInconsistencyError as exc:
+        assert exc.divergences == [
+            (5, ["structural_debt"]), (10, ["structural_debt"]),
+        ], exc.divergences
+        assert (exc.sequence, exc.diff_keys) == exc.divergences[0]
+        print(f"  Every divergence reported: {exc}")
+
+    # A stored event that no longer applies ends the pass as a divergence
+    conn = sqlite3.connect(db_path)
+    (payload10,) = conn.execute(
+        "SELECT payload_json FROM events WHERE project_id = ? AND sequence = 10",
+        ("restore_demo",),
+    ).fetchone()
+    corrupt = dict(json.loads(payload10), responsibilities=[])
+    with conn:
+        conn.execute(
+            "UPDATE events SET payload_json = ? WHERE project_id = ? AND sequence = 10",
+            (json.dumps(corrupt), "restore_demo"),
+        )
+    try:
+        fallback_session.verify_snapshot_consistency()
+        print("  [FAIL] expected SnapshotInconsistencyError")
+        sys.exit(1)
+    except SnapshotInconsistencyError as exc:
+        assert exc.divergences[0] == (5, ["structural_debt"]), exc.divergences
+        assert len(exc.divergences) == 2, exc.divergences
+        failed_seq, (error,) = exc.divergences[1]
+        assert failed_seq == 10 and "empty_responsibilities" in error, exc.divergences[1]
+        print(f"  Corrupted event reported, pass stopped: {error}")
+    with conn:
+        conn.execute(
+            "UPDATE events SET payload_json = ? WHERE project_id = ? AND sequence = 10",
+            (payload10, "restore_demo"),
+        )
+    conn.close()
+
+    print("\n  [PASS] Single-pass snapshot consistency verified")
+
     # ================================================================
     # FINAL
     # ================================================================
     print(f"\n{'='*60}")
-    print(f"  ALL 10 PHASES PASSED")
+    print(f"  ALL 17 PHASES PASSED")
     print(f"{'='*60}")
 
     # Cleanup
@@ -13,6 +13,7 @@ Covers:
   - Shock injection
   - Replay hash stability (two independent replays)
   - JSON export round-trip
+  - Monte Carlo runner (pool == serial, JSONL / sqlite sinks, aggregates)
 
 Run:  py -3 test_generator.py
 """
@@ -325,6 +326,69 @@ def test_rng_determinism():
         assert rng1.rand_int(0, 1000) == rng2.rand_int(0, 1000)
 
 
+# ---------------------------------------------------------------------------
+# Monte Carlo Runner
+# ---------------------------------------------------------------------------
+
+def test_monte_carlo_runner():
+    import sqlite3
+    from generator.compiler import compile_from_template
+    from generator.industry_templates import get_template
+    from generator.monte_carlo import (
+        JsonlSink, ResultSink, SqliteSink, iter_results, run_grid, run_monte_carlo,
+    )
+    from generator.template_spec import spec_for_success_level
+
+    runs = list(run_grid(["tech_saas", "manufacturing"], ["seed", "growth"],
+                         [10, 90], seeds=range(3),
+                         variations={"": {}, "fragile": {"fragility_mode": True}}))
+    assert len(runs) == 2 * 2 * 2 * 2 * 3
+    serial = list(iter_results(runs, workers=1))
+    assert list(iter_results(runs, workers=2, chunksize=4)) == serial
+    assert all(r["ok"] for r in serial)
+
+    # the compiler's validation engine is reused: same state as a replay
+    run = runs[-1]
+    template = get_template(run.industry, run.stage)
+    spec = spec_for_success_level(
+        template, run.industry, run.stage, run.success_level, run.overrides)
+    events, _ = compile_from_template(template, spec, seed=run.seed)
+    replayed = OrgEngine()
+    replayed.replay(events, trusted=True)
+    assert serial[-1]["state_hash"] == replayed.state_hash()
+
+    class NoWrite(ResultSink):
+        pass
+    try:
+        NoWrite()
+        assert False, "a sink without write() must not be constructible"
+    except TypeError:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = os.path.join(tmp, "runs.jsonl")
+        summary = run_monte_carlo(runs, workers=1, sink=JsonlSink(jsonl))
+        with open(jsonl, "r", encoding="utf-8") as f:
+            assert [json.loads(line) for line in f] == serial
+
+        db = os.path.join(tmp, "runs.db")
+        run_monte_carlo(runs, workers=1, sink=SqliteSink(db, commit_every=7))
+        conn = sqlite3.connect(db)
+        rows = conn.execute(
+            "SELECT seed, state_hash, structural_debt FROM runs").fetchall()
+        conn.close()
+        assert rows == [(r["seed"], r["state_hash"], r["structural_debt"])
+                        for r in serial]
+
+    cell = summary[("tech_saas", "growth", 10, "fragile")]
+    assert cell["runs"] == 3 and cell["failed"] == 0
+    debts = sorted(r["structural_debt"] for r in serial
+                   if (r["industry"], r["stage"], r["success_level"],
+                       r["variant"]) == ("tech_saas", "growth", 10, "fragile"))
+    assert (cell["structural_debt"]["min"], cell["structural_debt"]["p50"],
+            cell["structural_debt"]["max"]) == (debts[0], debts[1], debts[2])
+
+
 # ---------------------------------------------------------------------------
 # Runner
 # ---------------------------------------------------------------------------
@@ -348,6 +412,7 @@ def main():
         ("JSON export", test_json_export),
         ("Edge: single role", test_single_role),
         ("RNG determinism", test_rng_determinism),
+        ("Monte Carlo runner", test_monte_carlo_runner),
     ]
 
     print(f"\nRunning {len(tests)} tests...\n")